@@ -0,0 +1,2181 @@
+###############################################################################
+# (c) 2005-2020 Copyright, Real-Time Innovations.  All rights reserved.       #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""A pure-Python stand-in for the native Connector library
+
+When the environment variable ``RTI_CONNECTOR_BACKEND`` is set to
+``loopback``, the binding loads a :class:`LoopbackLibrary` instead of the
+*RTI Connext DDS* native libraries. It implements the ``RTI_Connector_*``
+functions used by the binding and the ``DDS_DynamicData_*`` and
+``DDS_TypeCode_*`` functions used by the array accessors and
+:attr:`Output.type_info` on top of the types and entities defined in the XML
+configuration.
+
+Samples are delivered synchronously, within :meth:`Output.write`, to the
+enabled Inputs of any ``Connector`` in the same process whose topic has the same
+name and domain id. The loopback library doesn't communicate with other
+processes and only interprets a subset of the configuration: the types, the
+domains, the participants and their publishers and subscribers, and the
+*history*, *resource_limits* (``max_instances``) and *entity_factory* QoS
+policies. In particular, there is no durability: an Input only receives the
+samples written after it matches the Output. It's intended for running the
+tests and for measuring the overhead of the Python layer independently of the
+middleware.
+"""
+
+import array
+import ctypes
+import itertools
+import json
+import math
+import os
+import re
+import struct
+import threading
+import time
+import weakref
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict
+
+# pylint: disable=invalid-name, too-many-lines, too-many-return-statements
+# pylint: disable=too-many-branches, too-few-public-methods
+
+try:
+    _string_types = (str, unicode) # pylint: disable=undefined-variable
+    _integer_types = (int, long) # pylint: disable=undefined-variable
+except NameError:
+    _string_types = (str,)
+    _integer_types = (int,)
+
+# Python 2's array module doesn't have the 'q' and 'Q' typecodes; 'l' and 'L'
+# are 64-bit on the LP64 platforms where it's used
+try:
+    array.array('q')
+    _INT64_TYPECODE, _UINT64_TYPECODE = 'q', 'Q'
+except ValueError:
+    _INT64_TYPECODE, _UINT64_TYPECODE = 'l', 'L'
+
+def _array_to_bytes(values):
+    return values.tobytes() if hasattr(values, "tobytes") else values.tostring()
+
+def _array_from_bytes(values, data):
+    if hasattr(values, "frombytes"):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+
+_OK = 0
+_ERROR = 1
+_BAD_PARAMETER = 3
+_OUT_OF_RESOURCES = 5
+_TIMEOUT = 10
+_NO_DATA = 11
+
+# DDS_ExceptionCode_t
+_NO_EXCEPTION = 0
+_BADKIND_EXCEPTION = 13
+_BOUNDS_EXCEPTION = 14
+
+# DDS_TCKind values
+_TK_SHORT = 1
+_TK_LONG = 2
+_TK_USHORT = 3
+_TK_ULONG = 4
+_TK_FLOAT = 5
+_TK_DOUBLE = 6
+_TK_BOOLEAN = 7
+_TK_CHAR = 8
+_TK_OCTET = 9
+_TK_STRUCT = 10
+_TK_UNION = 11
+_TK_ENUM = 12
+_TK_STRING = 13
+_TK_SEQUENCE = 14
+_TK_ARRAY = 15
+_TK_LONGLONG = 17
+_TK_ULONGLONG = 18
+_TK_LONGDOUBLE = 19
+_TK_WCHAR = 20
+_TK_WSTRING = 21
+
+# RTI_Connector_AnyValueKind values
+_ANY_NUMBER = 1
+_ANY_BOOLEAN = 2
+_ANY_STRING = 3
+
+_XML_PRIMITIVE_KINDS = {
+    "boolean": _TK_BOOLEAN,
+    "char": _TK_CHAR, "char8": _TK_CHAR,
+    "wchar": _TK_WCHAR, "char16": _TK_WCHAR,
+    "octet": _TK_OCTET, "byte": _TK_OCTET, "uint8": _TK_OCTET, "int8": _TK_OCTET,
+    "short": _TK_SHORT, "int16": _TK_SHORT,
+    "unsignedShort": _TK_USHORT, "uint16": _TK_USHORT,
+    "long": _TK_LONG, "int32": _TK_LONG,
+    "unsignedLong": _TK_ULONG, "uint32": _TK_ULONG,
+    "longLong": _TK_LONGLONG, "int64": _TK_LONGLONG,
+    "unsignedLongLong": _TK_ULONGLONG, "uint64": _TK_ULONGLONG,
+    "float": _TK_FLOAT, "float32": _TK_FLOAT,
+    "double": _TK_DOUBLE, "float64": _TK_DOUBLE,
+    "longDouble": _TK_LONGDOUBLE, "float128": _TK_LONGDOUBLE,
+}
+
+_INTEGER_RANGES = {
+    _TK_OCTET: (0, 2**8 - 1),
+    _TK_SHORT: (-2**15, 2**15 - 1),
+    _TK_USHORT: (0, 2**16 - 1),
+    _TK_LONG: (-2**31, 2**31 - 1),
+    _TK_ULONG: (0, 2**32 - 1),
+    _TK_LONGLONG: (-2**63, 2**63 - 1),
+    _TK_ULONGLONG: (0, 2**64 - 1),
+}
+
+_FLOAT_KINDS = frozenset([_TK_FLOAT, _TK_DOUBLE, _TK_LONGDOUBLE])
+_NUMBER_KINDS = frozenset(_INTEGER_RANGES) | _FLOAT_KINDS
+_STRING_KINDS = frozenset([_TK_STRING, _TK_WSTRING])
+_CHAR_KINDS = frozenset([_TK_CHAR, _TK_WCHAR])
+_COMPLEX_KINDS = frozenset([_TK_STRUCT, _TK_UNION, _TK_SEQUENCE, _TK_ARRAY])
+_LARGE_INTEGER_KINDS = frozenset([_TK_LONGLONG, _TK_ULONGLONG])
+
+# Sequences and arrays of these kinds are stored in an array.array
+_ARRAY_TYPECODES = {
+    _TK_OCTET: 'B', _TK_SHORT: 'h', _TK_USHORT: 'H', _TK_LONG: 'i',
+    _TK_ULONG: 'I', _TK_LONGLONG: _INT64_TYPECODE, _TK_ULONGLONG: _UINT64_TYPECODE, _TK_FLOAT: 'f',
+    _TK_DOUBLE: 'd'
+}
+
+# The element kinds of the DDS_DynamicData_get/set_<name>_array functions
+_ARRAY_FUNCTION_KINDS = {
+    "octet": _TK_OCTET, "boolean": _TK_BOOLEAN, "short": _TK_SHORT,
+    "ushort": _TK_USHORT, "long": _TK_LONG, "ulong": _TK_ULONG,
+    "longlong": _TK_LONGLONG, "ulonglong": _TK_ULONGLONG, "float": _TK_FLOAT,
+    "double": _TK_DOUBLE
+}
+
+# get_number and set_number fail for 64-bit integers that can't be represented
+# exactly as a double
+_MAX_INTEGER_AS_DOUBLE = 2**53
+
+# DDS_TIME_MAX in nanoseconds
+_TIME_MAX = 2147483647999999999
+
+_DEFAULT_STRING_BOUND = 255
+
+_COMPLEX_KIND_ERROR = "TypeCodeKind must be one of the following: " \
+    "DDS_TK_STRUCT, DDS_TK_VALUE, DDS_TK_UNION, DDS_TK_SEQUENCE, DDS_TK_ARRAY"
+
+class _LoopbackError(Exception):
+    """An error reported through the return code and the last error message"""
+    def __init__(self, message, retcode=_ERROR):
+        Exception.__init__(self, message)
+        self.retcode = retcode
+
+class _NoData(Exception):
+    """Raised when a member doesn't have a value (DDS_RETCODE_NO_DATA)"""
+
+#
+# Types
+#
+
+class _Type:
+    """A type defined in XML; its kind is one of the DDS_TCKind values"""
+
+    def __init__(self, kind, name=None):
+        self.kind = kind
+        self.name = name
+        self.bound = None # strings and sequences; None if unbounded
+        self.element = None # sequences and arrays
+        self.length = None # arrays
+        self.members = [] # structs and unions
+        self.member_map = {}
+        self.enumerators = None # enums, name -> value
+        self.enumerator_names = None # enums, value -> name
+        self.has_keys = False # structs
+        self.discriminator = None # unions
+
+    def add_member(self, member):
+        if member.name in self.member_map:
+            raise _LoopbackError("duplicate member {0} in type {1}".format(
+                member.name, self.name))
+        self.members.append(member)
+        self.member_map[member.name] = member
+
+class _Member:
+    """A member of a struct or union"""
+
+    def __init__(self, name, type_, key=False, optional=False, default=None, labels=None):
+        self.name = name
+        self.type = type_
+        self.key = key
+        self.optional = optional
+        self.default = default
+        self.labels = labels # union cases; None for the default case
+
+class _UnionValue:
+    """The value of a union: the selected member and its value"""
+
+    __slots__ = ("member", "value")
+
+    def __init__(self, member, value):
+        self.member = member
+        self.value = value
+
+    def __getitem__(self, _):
+        return self.value
+
+    def __setitem__(self, _, value):
+        self.value = value
+
+_PRIMITIVE_TYPES = dict(
+    (name, _Type(kind, name)) for name, kind in _XML_PRIMITIVE_KINDS.items())
+_STRING_TYPE = _Type(_TK_STRING, "string")
+
+def _strip(text):
+    return "" if text is None else text.strip()
+
+def _parse_int(text, what):
+    try:
+        return int(_strip(text), 0)
+    except ValueError:
+        raise _LoopbackError("invalid {0}: {1}".format(what, text))
+
+def _to_float32(value, name):
+    try:
+        return struct.unpack('f', struct.pack('f', value))[0]
+    except (OverflowError, struct.error):
+        raise _LoopbackError("value of {0} is out of range".format(name))
+
+def _default_value(type_, member=None, use_defaults=True):
+    """Returns the initial value of a type, or of a member if specified"""
+
+    if member is not None:
+        if member.optional and use_defaults:
+            return None
+        if member.default is not None and use_defaults:
+            return member.default
+    kind = type_.kind
+    if kind in _NUMBER_KINDS:
+        return 0.0 if kind in _FLOAT_KINDS else 0
+    if kind == _TK_BOOLEAN:
+        return False
+    if kind in _STRING_KINDS or kind in _CHAR_KINDS:
+        return ""
+    if kind == _TK_ENUM:
+        return next(iter(type_.enumerator_names))
+    if kind == _TK_STRUCT:
+        value = {}
+        for item in type_.members:
+            value[item.name] = _default_value(item.type, item, use_defaults)
+        return value
+    if kind == _TK_UNION:
+        first = type_.members[0]
+        return _UnionValue(first, _default_value(first.type, None, use_defaults))
+    if kind == _TK_SEQUENCE:
+        return _new_sequence(type_.element, 0)
+    if kind == _TK_ARRAY:
+        return _new_sequence(type_.element, type_.length, use_defaults)
+    raise _LoopbackError("unsupported type kind {0}".format(kind))
+
+def _new_sequence(element, length, use_defaults=True):
+    typecode = _ARRAY_TYPECODES.get(element.kind)
+    if typecode is not None:
+        return array.array(typecode, [0]) * length
+    return [_default_value(element, None, use_defaults) for _ in range(length)]
+
+def _copy(value):
+    """Deep-copies a value"""
+
+    if isinstance(value, dict):
+        return dict((name, _copy(item)) for name, item in value.items())
+    if isinstance(value, array.array):
+        return array.array(value.typecode, value)
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, _UnionValue):
+        return _UnionValue(value.member, _copy(value.value))
+    return value
+
+def _to_json(type_, value):
+    """Converts a value into the objects that represent it in JSON"""
+
+    kind = type_.kind
+    if kind == _TK_STRUCT:
+        # In declaration order, like the native library, also on Python 2
+        result = OrderedDict()
+        for member in type_.members:
+            item = value[member.name]
+            if item is not None:
+                result[member.name] = _to_json(member.type, item)
+        return result
+    if kind == _TK_UNION:
+        return {value.member.name: _to_json(value.member.type, value.value)}
+    if kind in (_TK_SEQUENCE, _TK_ARRAY):
+        if isinstance(value, array.array):
+            return value.tolist()
+        element = type_.element
+        if element.kind in _COMPLEX_KINDS:
+            return [_to_json(element, item) for item in value]
+        return list(value)
+    return value
+
+def _dumps(json_object):
+    return json.dumps(json_object, separators=(",", ":")).encode("utf-8")
+
+def _number_to_string(value):
+    if isinstance(value, float):
+        if value == int(value) and abs(value) < _MAX_INTEGER_AS_DOUBLE:
+            return str(int(value))
+        return "%.17g" % value
+    return str(int(value))
+
+def _convert_number(type_, value, name):
+    """Converts a Python number into the value of a numeric or enum type"""
+
+    kind = type_.kind
+    if kind in _INTEGER_RANGES:
+        if isinstance(value, float):
+            if math.isnan(value) or math.isinf(value):
+                raise _LoopbackError("value of {0} is out of range".format(name))
+            value = int(value)
+        low, high = _INTEGER_RANGES[kind]
+        if not low <= value <= high:
+            raise _LoopbackError("value of {0} is out of range".format(name))
+        return int(value)
+    if kind == _TK_FLOAT:
+        return _to_float32(float(value), name)
+    if kind in _FLOAT_KINDS:
+        return float(value)
+    if kind == _TK_ENUM:
+        value = int(value)
+        if value not in type_.enumerator_names:
+            raise _LoopbackError(
+                "{0} is not a valid value for enum {1}".format(value, name))
+        return value
+    if kind == _TK_BOOLEAN:
+        return bool(value)
+    raise _LoopbackError("{0} is not a numeric field".format(name))
+
+def _convert_string(type_, value, name):
+    """Converts a string into the value of a primitive or enum type"""
+
+    kind = type_.kind
+    if kind in _STRING_KINDS:
+        if type_.bound is not None and len(value) > type_.bound:
+            raise _LoopbackError("the length of {0} exceeds its maximum length ({1})"\
+                .format(name, type_.bound))
+        return value
+    if kind in _CHAR_KINDS:
+        if len(value) > 1:
+            raise _LoopbackError("{0} is a char and its value must have one character"\
+                .format(name))
+        return value
+    if kind == _TK_ENUM:
+        if value in type_.enumerators:
+            return type_.enumerators[value]
+        try:
+            return _convert_number(type_, int(value), name)
+        except ValueError:
+            raise _LoopbackError(
+                "cannot convert enum string to numerical representation for {0}: {1}"\
+                .format(name, value))
+    if kind in _NUMBER_KINDS:
+        try:
+            number = int(value) if kind in _INTEGER_RANGES else float(value)
+        except ValueError:
+            raise _LoopbackError("cannot convert field to string: {0}".format(name))
+        return _convert_number(type_, number, name)
+    if kind == _TK_BOOLEAN:
+        if value in ("true", "1"):
+            return True
+        if value in ("false", "0"):
+            return False
+    raise _LoopbackError("cannot convert field to string: {0}".format(name))
+
+def _convert_json_primitive(type_, value, name):
+    kind = type_.kind
+    if isinstance(value, _string_types):
+        return _convert_string(type_, value, name)
+    if isinstance(value, bool):
+        if kind == _TK_BOOLEAN:
+            return value
+        return _convert_number(type_, int(value), name)
+    if isinstance(value, _integer_types + (float,)):
+        if kind in _STRING_KINDS or kind in _CHAR_KINDS:
+            raise _LoopbackError("{0} is a string field".format(name))
+        return _convert_number(type_, value, name)
+    raise _LoopbackError("invalid value for field {0}".format(name))
+
+#
+# Member names
+#
+
+_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_INDEX = re.compile(r"\[([0-9]+)\]")
+
+_field_name_cache = {}
+_FIELD_NAME_CACHE_SIZE = 4096
+
+def _parse_field_name(field_name):
+    """Splits a field name such as "a.b[2].c" into ["a", "b", 2, "c"]
+
+    It returns the tokens and whether the name ends in "#"
+    """
+
+    parsed = _field_name_cache.get(field_name)
+    if parsed is not None:
+        return parsed
+
+    text = field_name
+    length_suffix = text.endswith("#")
+    if length_suffix:
+        text = text[:-1]
+    match = _NAME.match(text)
+    if match is None:
+        raise _LoopbackError("invalid member name syntax: {0}".format(field_name))
+    tokens = [match.group()]
+    position = match.end()
+    while position < len(text):
+        if text[position] == ".":
+            match = _NAME.match(text, position + 1)
+            if match is None:
+                raise _LoopbackError("invalid member name syntax: {0}".format(field_name))
+            tokens.append(match.group())
+        else:
+            match = _INDEX.match(text, position)
+            if match is None:
+                raise _LoopbackError("invalid member name syntax: {0}".format(field_name))
+            tokens.append(int(match.group(1)))
+        position = match.end()
+
+    parsed = (tokens, length_suffix)
+    if len(_field_name_cache) >= _FIELD_NAME_CACHE_SIZE:
+        _field_name_cache.clear()
+    _field_name_cache[field_name] = parsed
+    return parsed
+
+def _find_member(type_, name, field_name):
+    if type_.kind not in (_TK_STRUCT, _TK_UNION):
+        raise _LoopbackError("Cannot find a member named {0} in {1}: {1} is not a struct or union"\
+            .format(name, field_name))
+    member = type_.member_map.get(name)
+    if member is None:
+        raise _LoopbackError("Cannot find a member named {0} in {1}".format(name, field_name))
+    return member
+
+def _member_type(type_, tokens, field_name):
+    """Returns the type of a member and the member (None for elements)"""
+
+    member = None
+    for token in tokens:
+        if isinstance(token, int):
+            if type_.kind not in (_TK_SEQUENCE, _TK_ARRAY):
+                raise _LoopbackError("{0} is not a sequence or array".format(field_name))
+            type_, member = type_.element, None
+        else:
+            member = _find_member(type_, token, field_name)
+            type_ = member.type
+    return type_, member
+
+def _lookup(type_, value, tokens, field_name):
+    """Returns the type and value of a member; raises _NoData if the member
+    is not set (an unset optional member or an unselected union member)"""
+
+    for token in tokens:
+        if value is None:
+            raise _NoData
+        if isinstance(token, int):
+            if type_.kind not in (_TK_SEQUENCE, _TK_ARRAY):
+                raise _LoopbackError("{0} is not a sequence or array".format(field_name))
+            if token >= len(value):
+                raise _NoData
+            type_ = type_.element
+            value = value[token]
+        elif type_.kind == _TK_UNION:
+            member = _find_member(type_, token, field_name)
+            if value.member is not member:
+                raise _NoData
+            type_ = member.type
+            value = value.value
+        else:
+            member = _find_member(type_, token, field_name)
+            type_ = member.type
+            value = value[token]
+    if value is None:
+        raise _NoData
+    return type_, value
+
+def _lookup_for_set(type_, holder, key, tokens, field_name):
+    """Finds where the value of a member is stored to modify it
+
+    Sequences are extended, optional members are created and union members
+    are selected as needed. It returns the member type, the container and the
+    key of the value in the container, and the member (None for elements).
+    """
+
+    member = None
+    for token in tokens:
+        value = holder[key]
+        if value is None:
+            value = _default_value(type_)
+            holder[key] = value
+        kind = type_.kind
+        if isinstance(token, int):
+            if kind == _TK_SEQUENCE:
+                if token >= len(value):
+                    if type_.bound is not None and token >= type_.bound:
+                        raise _LoopbackError(
+                            "index {0} in {1} exceeds the maximum length of the sequence ({2})"\
+                            .format(token, field_name, type_.bound))
+                    value.extend(_new_sequence(type_.element, token + 1 - len(value)))
+            elif kind == _TK_ARRAY:
+                if token >= len(value):
+                    raise _LoopbackError("index {0} in {1} exceeds the array dimension ({2})"\
+                        .format(token, field_name, type_.length))
+            else:
+                raise _LoopbackError("{0} is not a sequence or array".format(field_name))
+            type_ = type_.element
+            holder, key, member = value, token, None
+        elif kind == _TK_UNION:
+            member = _find_member(type_, token, field_name)
+            if value.member is not member:
+                value.member = member
+                value.value = _default_value(member.type)
+            type_ = member.type
+            holder, key = value, None
+        else:
+            member = _find_member(type_, token, field_name)
+            type_ = member.type
+            holder, key = value, token
+    return type_, holder, key, member
+
+def _apply_json(type_, holder, key, json_value, name, member=None):
+    """Sets a value from its JSON representation; structs and arrays are
+    merged with their current value, sequences are replaced"""
+
+    if json_value is None:
+        holder[key] = _default_value(type_, member)
+        return
+    kind = type_.kind
+    if kind == _TK_STRUCT:
+        if not isinstance(json_value, dict):
+            raise _LoopbackError("{0} must be an object".format(name))
+        value = holder[key]
+        if value is None:
+            value = _default_value(type_)
+            holder[key] = value
+        box = [value]
+        for field_name, item in json_value.items():
+            _apply_json_field(type_, box, field_name, item, name)
+    elif kind == _TK_UNION:
+        if not isinstance(json_value, dict) or len(json_value) != 1:
+            raise _LoopbackError("{0} must be an object with one member".format(name))
+        ((member_name, item),) = json_value.items()
+        selected = _find_member(type_, member_name, name)
+        value = holder[key]
+        if value is None:
+            value = _default_value(type_)
+            holder[key] = value
+        if value.member is not selected:
+            value.member = selected
+            value.value = _default_value(selected.type)
+        _apply_json(selected.type, value, None, item, member_name)
+    elif kind in (_TK_SEQUENCE, _TK_ARRAY):
+        if not isinstance(json_value, list):
+            raise _LoopbackError("{0} must be an array".format(name))
+        element = type_.element
+        if kind == _TK_SEQUENCE:
+            if type_.bound is not None and len(json_value) > type_.bound:
+                raise _LoopbackError("the length of {0} exceeds its maximum length ({1})"\
+                    .format(name, type_.bound))
+            value = _new_sequence(element, len(json_value))
+        else:
+            if len(json_value) > type_.length:
+                raise _LoopbackError("the length of {0} exceeds the array dimension ({1})"\
+                    .format(name, type_.length))
+            value = holder[key]
+        for index, item in enumerate(json_value):
+            _apply_json(element, value, index, item, name)
+        holder[key] = value
+    else:
+        holder[key] = _convert_json_primitive(type_, json_value, name)
+
+def _apply_json_field(type_, box, field_name, json_value, name):
+    """Sets a member of the struct in box[0] from its JSON representation;
+    field_name can be a simple member name or a path"""
+
+    member = type_.member_map.get(field_name)
+    if member is not None:
+        _apply_json(member.type, box[0], field_name, json_value, field_name, member)
+        return
+    tokens, length_suffix = _parse_field_name(field_name)
+    if length_suffix or len(tokens) == 1:
+        raise _LoopbackError("Cannot find a member named {0} in {1}".format(field_name, name))
+    member_type, holder, key, member = _lookup_for_set(type_, box, 0, tokens, field_name)
+    _apply_json(member_type, holder, key, json_value, field_name, member)
+
+#
+# Keys
+#
+
+def _key_of(type_, value):
+    """Returns a hashable representation of the key of a struct value"""
+
+    if not type_.has_keys:
+        return ()
+    key = []
+    for member in type_.members:
+        if member.key:
+            item = value[member.name]
+            if member.type.kind == _TK_STRUCT and member.type.has_keys:
+                key.append(_key_of(member.type, item))
+            else:
+                key.append(_dumps(_to_json(member.type, item)) if item is not None else None)
+    return tuple(key)
+
+def _copy_key(type_, source, target):
+    """Copies the key members from one struct value into another"""
+
+    for member in type_.members:
+        if member.key:
+            if member.type.kind == _TK_STRUCT and member.type.has_keys:
+                _copy_key(member.type, source[member.name], target[member.name])
+            else:
+                target[member.name] = _copy(source[member.name])
+
+#
+# XML configuration
+#
+
+def _split_url(url):
+    """Splits the url of the configuration into its file names and XML strings"""
+
+    documents = []
+    position = 0
+    while position < len(url):
+        if url.startswith('str://"', position):
+            end = url.find('</dds>"', position)
+            if end < 0:
+                raise _LoopbackError("unterminated XML string in url")
+            documents.append(("string", url[position + 7:end + 6]))
+            position = end + 7
+        else:
+            end = url.find(";", position)
+            if end < 0:
+                end = len(url)
+            name = url[position:end].strip()
+            if name.startswith("file://"):
+                name = name[len("file://"):]
+            if name:
+                documents.append(("file", name))
+            position = end
+        while position < len(url) and url[position] in "; \t\r\n":
+            position += 1
+    return documents
+
+def _entity_name(element):
+    return element.get("name", "")
+
+class _Configuration:
+    """The types, domains, participants and QoS profiles defined in XML"""
+
+    def __init__(self, url):
+        self.type_elements = {}
+        self.types = {}
+        self.domains = {}
+        self.participants = {}
+        self.qos_profiles = {}
+        self.default_qos_profile = None
+        for source, document in _split_url(url):
+            self._load(source, document)
+
+    def _load(self, source, document):
+        try:
+            if source == "file":
+                root = ElementTree.parse(document).getroot()
+            else:
+                root = ElementTree.fromstring(document)
+        except (IOError, OSError):
+            raise _LoopbackError("cannot open the configuration file {0}".format(document))
+        except ElementTree.ParseError as error:
+            raise _LoopbackError("error parsing the XML configuration: {0}".format(error))
+        if root.tag != "dds":
+            raise _LoopbackError("the root element of the XML configuration must be <dds>")
+
+        for child in root:
+            if child.tag == "types":
+                self._load_types(child, "")
+            elif child.tag == "qos_library":
+                for profile in child.iter("qos_profile"):
+                    name = child.get("name") + "::" + profile.get("name")
+                    self.qos_profiles[name] = profile
+                    if profile.get("is_default_qos", "").lower() in ("true", "1"):
+                        self.default_qos_profile = name
+            elif child.tag == "domain_library":
+                for domain in child.findall("domain"):
+                    self.domains[child.get("name") + "::" + domain.get("name")] = domain
+            elif child.tag == "domain_participant_library":
+                for participant in child.findall("domain_participant"):
+                    name = child.get("name") + "::" + participant.get("name")
+                    self.participants[name] = participant
+
+    def _load_types(self, element, scope):
+        for child in element:
+            if child.tag == "module":
+                self._load_types(child, scope + child.get("name") + "::")
+            elif child.tag in ("struct", "valuetype", "union", "enum", "typedef"):
+                self.type_elements[scope + child.get("name")] = (child, scope)
+
+    def find_type(self, name, scope=""):
+        """Finds a type by its name, from the innermost to the outermost module"""
+
+        name = name.strip()
+        if name.startswith("::"):
+            candidates = [name[2:]]
+        else:
+            parts = scope.split("::")[:-1]
+            candidates = ["::".join(parts[:i] + [name]) for i in range(len(parts), -1, -1)]
+        for candidate in candidates:
+            type_ = self.types.get(candidate)
+            if type_ is not None:
+                return type_
+            if candidate in self.type_elements:
+                return self._create_type(candidate)
+        raise _LoopbackError("cannot find type {0}".format(name))
+
+    def _create_type(self, name):
+        element, scope = self.type_elements[name]
+        tag = element.tag
+        if tag == "typedef":
+            type_ = self._member_type(element, scope)
+            self.types[name] = type_
+            return type_
+        if tag == "enum":
+            type_ = _Type(_TK_ENUM, name)
+            type_.enumerators = OrderedDict()
+            type_.enumerator_names = OrderedDict()
+            next_value = 0
+            for enumerator in element.findall("enumerator"):
+                if enumerator.get("value") is not None:
+                    next_value = _parse_int(enumerator.get("value"), "enumerator value")
+                type_.enumerators[enumerator.get("name")] = next_value
+                type_.enumerator_names.setdefault(next_value, enumerator.get("name"))
+                next_value += 1
+            self.types[name] = type_
+            return type_
+
+        if tag == "union":
+            type_ = _Type(_TK_UNION, name)
+            self.types[name] = type_
+            type_.discriminator = self._member_type(element.find("discriminator"), scope)
+            for case in element.findall("case"):
+                labels = []
+                for discriminator in case.findall("caseDiscriminator"):
+                    labels.append(self._parse_label(type_.discriminator, discriminator.get("value")))
+                member_element = case.find("member")
+                member = _Member(
+                    member_element.get("name"),
+                    self._member_type(member_element, scope),
+                    labels=None if "default" in labels else labels)
+                type_.add_member(member)
+            return type_
+
+        type_ = _Type(_TK_STRUCT, name)
+        self.types[name] = type_
+        base_name = element.get("baseType") or element.get("baseClass")
+        if base_name:
+            base = self.find_type(base_name, scope)
+            for member in base.members:
+                type_.add_member(member)
+        for member_element in element.findall("member"):
+            member_type = self._member_type(member_element, scope)
+            member = _Member(
+                member_element.get("name"),
+                member_type,
+                key=member_element.get("key", "").lower() in ("true", "1"),
+                optional=member_element.get("optional", "").lower() in ("true", "1"))
+            if member_element.get("default") is not None:
+                member.default = _convert_string(
+                    member_type, member_element.get("default"), member.name)
+            type_.add_member(member)
+        type_.has_keys = any(member.key for member in type_.members)
+        return type_
+
+    def _parse_label(self, discriminator_type, text):
+        text = _strip(text)
+        if text == "default":
+            return text
+        if text.startswith("(") and text.endswith(")"):
+            text = text[1:-1].strip()
+        if discriminator_type.kind == _TK_ENUM:
+            if text in discriminator_type.enumerators:
+                return discriminator_type.enumerators[text]
+            enumerator_name = text.split("::")[-1]
+            if enumerator_name in discriminator_type.enumerators:
+                return discriminator_type.enumerators[enumerator_name]
+        if discriminator_type.kind == _TK_BOOLEAN:
+            return text.lower() in ("true", "1")
+        return _parse_int(text, "case discriminator")
+
+    def _member_type(self, element, scope):
+        xml_type = element.get("type")
+        if xml_type in ("nonBasic", None):
+            type_ = self.find_type(element.get("nonBasicTypeName", ""), scope)
+        elif xml_type in ("string", "wstring"):
+            type_ = _Type(_TK_STRING if xml_type == "string" else _TK_WSTRING, xml_type)
+            bound = _parse_int(element.get("stringMaxLength", str(_DEFAULT_STRING_BOUND)),
+                               "stringMaxLength")
+            type_.bound = None if bound < 0 else bound
+        elif xml_type in _PRIMITIVE_TYPES:
+            type_ = _PRIMITIVE_TYPES[xml_type]
+        else:
+            raise _LoopbackError("unknown type {0}".format(xml_type))
+
+        if element.get("arrayDimensions"):
+            dimensions = [_parse_int(dimension, "arrayDimensions")
+                          for dimension in element.get("arrayDimensions").split(",")]
+            for dimension in reversed(dimensions):
+                array_type = _Type(_TK_ARRAY, "array")
+                array_type.element = type_
+                array_type.length = dimension
+                type_ = array_type
+        if element.get("sequenceMaxLength"):
+            bound = _parse_int(element.get("sequenceMaxLength"), "sequenceMaxLength")
+            sequence_type = _Type(_TK_SEQUENCE, "sequence")
+            sequence_type.element = type_
+            sequence_type.bound = None if bound < 0 else bound
+            type_ = sequence_type
+        return type_
+
+    def find_qos(self, qos_element, qos_tag, path):
+        """Returns the text of a QoS setting from an entity's QoS, its base
+        profiles or the default profile; None if it's not specified"""
+
+        value = self._find_qos_in(qos_element, qos_tag, path, 0)
+        if value is None and self.default_qos_profile is not None:
+            value = self._find_qos_in_profile(self.default_qos_profile, qos_tag, path, 0)
+        return value
+
+    def _find_qos_in(self, qos_element, qos_tag, path, depth):
+        if qos_element is None or depth > 16:
+            return None
+        setting = qos_element.find(path)
+        if setting is not None and setting.text is not None:
+            return setting.text.strip()
+        base_name = qos_element.get("base_name")
+        if base_name:
+            return self._find_qos_in_profile(base_name, qos_tag, path, depth + 1)
+        return None
+
+    def _find_qos_in_profile(self, profile_name, qos_tag, path, depth):
+        profile = self.qos_profiles.get(profile_name)
+        if profile is None:
+            for name in self.qos_profiles:
+                if name.endswith("::" + profile_name):
+                    profile = self.qos_profiles[name]
+                    break
+        if profile is None or depth > 16:
+            return None
+        value = self._find_qos_in(profile.find(qos_tag), qos_tag, path, depth + 1)
+        if value is None and profile.get("base_name"):
+            value = self._find_qos_in_profile(profile.get("base_name"), qos_tag, path, depth + 1)
+        return value
+
+#
+# Entities
+#
+
+_lock = threading.RLock()
+_condition = threading.Condition(_lock)
+
+# The enabled readers and writers, by (domain id, topic name)
+_readers_by_topic = {}
+_writers_by_topic = {}
+
+_handles = weakref.WeakValueDictionary()
+_errors = threading.local()
+_guid_counter = itertools.count(1)
+_GUID_PREFIX = list(bytearray(struct.pack(">HI", 0x0101, os.getpid() & 0xffffffff))) + [0] * 6
+
+def _new_handle(entity):
+    handle = id(entity)
+    _handles[handle] = entity
+    return handle
+
+def _resolve_handle(handle, entity_type):
+    if isinstance(handle, ctypes.c_void_p):
+        handle = handle.value
+    entity = _handles.get(handle) if handle else None
+    if not isinstance(entity, entity_type):
+        raise _LoopbackError("invalid {0} handle".format(entity_type.__name__),
+                             _BAD_PARAMETER)
+    return entity
+
+def _set_last_error(message):
+    _errors.message = message
+
+def _now():
+    return int(time.time() * 1e9)
+
+def _new_guid():
+    counter = next(_guid_counter)
+    return _GUID_PREFIX + list(bytearray(struct.pack(">I", counter << 8 | 0x02)))
+
+class _DynamicData:
+    """A data sample: an Output's instance or a received sample"""
+
+    __slots__ = ("type", "value", "__weakref__")
+
+    def __init__(self, type_, value):
+        self.type = type_
+        self.value = value
+
+    def __getitem__(self, _):
+        return self.value
+
+    def __setitem__(self, _, value):
+        self.value = value
+
+class _TopicDescription:
+    __slots__ = ("name", "name_bytes", "type_name_bytes", "__weakref__")
+
+    def __init__(self, name, type_name):
+        self.name = name
+        self.name_bytes = name.encode("utf-8")
+        self.type_name_bytes = type_name.encode("utf-8")
+
+class _Endpoint:
+    """The common part of a writer and a reader"""
+
+    def __init__(self, participant, name, element, topic_name, type_, qos_tag):
+        self.participant = participant
+        self.name = name
+        self.entity_name = _entity_name(element) if element is not None else None
+        self.topic_name = topic_name
+        self.topic = _TopicDescription(
+            topic_name, participant.topic_type_names.get(topic_name, type_.name))
+        self.type = type_
+        self.enabled = False
+        self.autoenable = True
+        self.matched = []
+        self.match_change = 0
+        qos_element = element.find(qos_tag) if element is not None else None
+        configuration = participant.configuration
+        history = configuration.find_qos(qos_element, qos_tag, "history/kind") or ""
+        self.keep_all = "KEEP_ALL" in history
+        depth = configuration.find_qos(qos_element, qos_tag, "history/depth")
+        self.depth = _parse_int(depth, "history depth") if depth else 1
+        max_instances = configuration.find_qos(
+            qos_element, qos_tag, "resource_limits/max_instances")
+        if max_instances and "UNLIMITED" not in max_instances:
+            self.max_instances = _parse_int(max_instances, "max_instances")
+        else:
+            self.max_instances = -1
+
+    @property
+    def topic_key(self):
+        return (self.participant.domain_id, self.topic_name)
+
+    def matched_json(self):
+        return _dumps([{"name": endpoint.entity_name} for endpoint in self.matched])
+
+class _Writer(_Endpoint):
+
+    def __init__(self, participant, name, element, topic_name, type_):
+        _Endpoint.__init__(self, participant, name, element, topic_name, type_, "datawriter_qos")
+        self.instance = _DynamicData(type_, _default_value(type_))
+        self.guid = _new_guid()
+        self.sequence_number = 0
+        # The last sequence number of each writer GUID in the sample identities
+        self.sequence_numbers = {}
+        self.instances = set()
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        _writers_by_topic.setdefault(self.topic_key, []).append(self)
+        for reader in list(_readers_by_topic.get(self.topic_key, [])):
+            _match(self, reader)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        _writers_by_topic[self.topic_key].remove(self)
+        for reader in list(self.matched):
+            _unmatch(self, reader)
+
+    def write(self, params):
+        for name in params:
+            if name not in _WRITE_PARAMS:
+                raise _LoopbackError("unknown write parameter {0}: {1}".format(
+                    name, params[name]))
+        action = params.get("action", "write")
+        if action not in ("write", "dispose", "unregister"):
+            raise _LoopbackError("error parsing action field: {0}".format(action))
+        now = _now()
+        source_timestamp = params.get("source_timestamp", now)
+        if not isinstance(source_timestamp, _integer_types) or isinstance(source_timestamp, bool):
+            raise _LoopbackError("error parsing source_timestamp field")
+        if source_timestamp > _TIME_MAX:
+            raise _LoopbackError("timestamp is larger than DDS_TIME_MAX")
+        if source_timestamp < 0:
+            raise _LoopbackError("timestamp cannot be negative")
+        identity = _parse_identity(params, "identity", None)
+        if identity is None:
+            identity = {"writer_guid": self.guid,
+                        "sequence_number": self.sequence_number + 1}
+        related_identity = _parse_identity(
+            params, "related_sample_identity",
+            {"writer_guid": [0] * 16, "sequence_number": 0})
+        guid = tuple(identity["writer_guid"])
+        if identity["sequence_number"] <= self.sequence_numbers.get(guid, 0):
+            raise _LoopbackError("the sequence number of the sample identity must increase")
+
+        value = _copy(self.instance.value)
+        key = _key_of(self.type, value)
+        if action == "unregister":
+            self.instances.discard(key)
+        elif key not in self.instances:
+            if 0 <= self.max_instances <= len(self.instances):
+                raise _LoopbackError("cannot register a new instance: max_instances ({0}) reached"\
+                    .format(self.max_instances), _OUT_OF_RESOURCES)
+            self.instances.add(key)
+        if action != "write":
+            key_value = _default_value(self.type, use_defaults=False)
+            _copy_key(self.type, value, key_value)
+            value = key_value
+        self.sequence_numbers[guid] = identity["sequence_number"]
+        if guid == tuple(self.guid):
+            self.sequence_number = identity["sequence_number"]
+        sample = _WrittenSample(
+            _DynamicData(self.type, value), key, action, source_timestamp,
+            identity, related_identity)
+        for reader in self.matched:
+            reader.receive(sample, self, now)
+        _condition.notify_all()
+
+_WRITE_PARAMS = frozenset(
+    ["action", "source_timestamp", "identity", "related_sample_identity"])
+
+class _WrittenSample:
+    """A sample as it was written"""
+
+    __slots__ = ("data", "key", "action", "source_timestamp", "identity",
+                 "related_identity", "identity_json", "related_identity_json")
+
+    def __init__(self, data, key, action, source_timestamp, identity, related_identity): # pylint: disable=too-many-arguments
+        self.data = data
+        self.key = key
+        self.action = action
+        self.source_timestamp = source_timestamp
+        self.identity = identity
+        self.related_identity = related_identity
+        self.identity_json = _dumps(identity)
+        self.related_identity_json = _dumps(related_identity)
+
+def _parse_identity(params, name, default):
+    identity = params.get(name)
+    if identity is None:
+        return default
+    if not isinstance(identity, dict):
+        raise _LoopbackError("error parsing {0}".format(name))
+    guid = identity.get("writer_guid", [])
+    if isinstance(guid, dict):
+        guid = guid.get("value", [])
+    if not isinstance(guid, list):
+        raise _LoopbackError("error parsing GUID")
+    if len(guid) > 16:
+        raise _LoopbackError("error parsing GUID: octet array exceeds maximum length of 16")
+    for index, octet in enumerate(guid):
+        if not isinstance(octet, _integer_types) or isinstance(octet, bool):
+            raise _LoopbackError(
+                "error parsing GUID: invalid type in octet array, index: {0}".format(index))
+        if not 0 <= octet <= 255:
+            raise _LoopbackError(
+                "error parsing GUID: invalid octet value; expected 0-255, got: {0}".format(octet))
+    sequence_number = identity.get("sequence_number", 0)
+    if isinstance(sequence_number, dict):
+        sequence_number = sequence_number.get("high", 0) * 2**32 + sequence_number.get("low", 0)
+    if not isinstance(sequence_number, _integer_types) or isinstance(sequence_number, bool):
+        raise _LoopbackError("error parsing sequence_number")
+    return {"writer_guid": guid + [0] * (16 - len(guid)), "sequence_number": sequence_number}
+
+class _ReceivedSample:
+    """A sample in a reader's queue"""
+
+    __slots__ = ("written", "instance", "reception_timestamp", "read")
+
+    def __init__(self, written, instance, reception_timestamp):
+        self.written = written
+        self.instance = instance
+        self.reception_timestamp = reception_timestamp
+        self.read = False
+
+class _ReaderInstance:
+    __slots__ = ("state", "new", "writers")
+
+    def __init__(self):
+        self.state = "ALIVE"
+        self.new = True
+        self.writers = set()
+
+_INSTANCE_STATES = {
+    "write": "ALIVE",
+    "dispose": "NOT_ALIVE_DISPOSED",
+    "unregister": "NOT_ALIVE_NO_WRITERS"
+}
+
+class _LoanedSample:
+    """A sample returned by read or take and the state it had at that moment"""
+
+    __slots__ = ("written", "reception_timestamp", "sample_state", "view_state",
+                 "instance_state")
+
+    def __init__(self, sample):
+        self.written = sample.written
+        self.reception_timestamp = sample.reception_timestamp
+        self.sample_state = "READ" if sample.read else "NOT_READ"
+        self.view_state = "NEW" if sample.instance.new else "NOT_NEW"
+        self.instance_state = sample.instance.state
+
+    @property
+    def valid_data(self):
+        return self.written.action == "write"
+
+class _Reader(_Endpoint):
+
+    def __init__(self, participant, name, element, topic_name, type_):
+        _Endpoint.__init__(self, participant, name, element, topic_name, type_, "datareader_qos")
+        self.queue = []
+        self.instances = {}
+        self.loan = []
+        self.data_available = False
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        _readers_by_topic.setdefault(self.topic_key, []).append(self)
+        for writer in list(_writers_by_topic.get(self.topic_key, [])):
+            _match(writer, self)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        _readers_by_topic[self.topic_key].remove(self)
+        for writer in list(self.matched):
+            _unmatch(writer, self)
+
+    def receive(self, written, writer, reception_timestamp):
+        instance = self.instances.get(written.key)
+        if instance is None:
+            instance = _ReaderInstance()
+            self.instances[written.key] = instance
+        elif instance.state != "ALIVE" and written.action == "write":
+            instance.new = True
+        if written.action == "unregister":
+            instance.writers.discard(id(writer))
+            if instance.writers:
+                return
+        else:
+            instance.writers.add(id(writer))
+        instance.state = _INSTANCE_STATES[written.action]
+
+        self.queue.append(_ReceivedSample(written, instance, reception_timestamp))
+        if not self.keep_all:
+            samples = [s for s in self.queue if s.instance is instance]
+            if len(samples) > self.depth:
+                self.queue.remove(samples[0])
+        self.data_available = True
+
+    def read(self, take):
+        self.loan = [_LoanedSample(sample) for sample in self.queue]
+        for sample in self.queue:
+            sample.read = True
+            sample.instance.new = False
+        if take:
+            self.queue = []
+        self.data_available = False
+
+    def loaned_sample(self, index):
+        if not 1 <= index <= len(self.loan):
+            raise _LoopbackError("index {0} out of bounds (the number of samples is {1})"\
+                .format(index, len(self.loan)))
+        return self.loan[index - 1]
+
+def _match(writer, reader):
+    if reader.type.name != writer.type.name and \
+            [m.name for m in reader.type.members] != [m.name for m in writer.type.members]:
+        return
+    writer.matched.append(reader)
+    reader.matched.append(writer)
+    writer.match_change += 1
+    reader.match_change += 1
+    _condition.notify_all()
+
+def _unmatch(writer, reader):
+    writer.matched.remove(reader)
+    reader.matched.remove(writer)
+    writer.match_change -= 1
+    reader.match_change -= 1
+    _condition.notify_all()
+
+class _Participant:
+    """The participant created by a Connector and its entities"""
+
+    def __init__(self, config_name, url):
+        self.configuration = _Configuration(url)
+        element = self.configuration.participants.get(config_name)
+        if element is None:
+            raise _LoopbackError("cannot find the domain participant {0}".format(config_name))
+        self.writers = {}
+        self.readers = {}
+        self.domain_id = 0
+        self.registered_types = {}
+        self.topics = {}
+        # The registered type name of each topic
+        self.topic_type_names = {}
+        self._load_participant(element, 0)
+        if element.get("domain_id") is not None:
+            self.domain_id = _parse_int(element.get("domain_id"), "domain_id")
+        for writer in self.writers.values():
+            if writer.autoenable:
+                writer.enable()
+        for reader in self.readers.values():
+            if reader.autoenable:
+                reader.enable()
+
+    def _load_participant(self, element, depth):
+        base_name = element.get("base_name")
+        if base_name and depth < 16:
+            base = self.configuration.participants.get(base_name)
+            if base is None:
+                raise _LoopbackError("cannot find the base participant {0}".format(base_name))
+            self._load_participant(base, depth + 1)
+        domain_ref = element.get("domain_ref")
+        if domain_ref:
+            domain = self.configuration.domains.get(domain_ref)
+            if domain is None:
+                raise _LoopbackError("cannot find the domain {0}".format(domain_ref))
+            self._load_domain(domain, 0)
+        self._load_topics(element)
+        for publisher in element.findall("publisher"):
+            autoenable = self._autoenable(publisher, "publisher_qos")
+            for writer_element in publisher.findall("data_writer"):
+                name = _entity_name(publisher) + "::" + _entity_name(writer_element)
+                writer = _Writer(self, name, writer_element, *self._find_topic(writer_element))
+                writer.autoenable = autoenable
+                self.writers[name] = writer
+        for subscriber in element.findall("subscriber"):
+            autoenable = self._autoenable(subscriber, "subscriber_qos")
+            for reader_element in subscriber.findall("data_reader"):
+                name = _entity_name(subscriber) + "::" + _entity_name(reader_element)
+                reader = _Reader(self, name, reader_element, *self._find_topic(reader_element))
+                reader.autoenable = autoenable
+                self.readers[name] = reader
+
+    def _load_domain(self, element, depth):
+        base_name = element.get("base_name")
+        if base_name and depth < 16:
+            base = self.configuration.domains.get(base_name)
+            if base is None:
+                raise _LoopbackError("cannot find the base domain {0}".format(base_name))
+            self._load_domain(base, depth + 1)
+        if element.get("domain_id") is not None:
+            self.domain_id = _parse_int(element.get("domain_id"), "domain_id")
+        self._load_topics(element)
+
+    def _load_topics(self, element):
+        for register_type in element.findall("register_type"):
+            type_name = register_type.get("type_ref") or register_type.get("name")
+            self.registered_types[register_type.get("name")] = \
+                self.configuration.find_type(type_name)
+        for topic in element.findall("topic"):
+            type_name = topic.get("register_type_ref")
+            type_ = self.registered_types.get(type_name)
+            if type_ is None:
+                raise _LoopbackError("cannot find the registered type {0} for topic {1}"\
+                    .format(type_name, topic.get("name")))
+            self.topics[topic.get("name")] = type_
+            self.topic_type_names[topic.get("name")] = type_name
+
+    def _find_topic(self, element):
+        topic_name = element.get("topic_ref")
+        type_ = self.topics.get(topic_name)
+        if type_ is None:
+            raise _LoopbackError("cannot find the topic {0}".format(topic_name))
+        return topic_name, type_
+
+    def _autoenable(self, element, qos_tag):
+        value = self.configuration.find_qos(
+            element.find(qos_tag), qos_tag, "entity_factory/autoenable_created_entities")
+        return value is None or value.lower() not in ("false", "0")
+
+    def writer(self, name):
+        writer = self.writers.get(name)
+        if writer is None:
+            raise _LoopbackError("cannot find the data writer {0}".format(name))
+        return writer
+
+    def reader(self, name):
+        reader = self.readers.get(name)
+        if reader is None:
+            raise _LoopbackError("cannot find the data reader {0}".format(name))
+        return reader
+
+    def delete(self):
+        for writer in self.writers.values():
+            writer.disable()
+        for reader in self.readers.values():
+            reader.disable()
+        _condition.notify_all()
+
+def _fromcstring(value):
+    if isinstance(value, ctypes.c_char_p):
+        value = value.value
+    return None if value is None else value.decode("utf-8")
+
+def _set_out(pointer, value):
+    """Writes value into the object referenced by pointer (byref or POINTER)"""
+
+    target = getattr(pointer, "_obj", None)
+    if target is None:
+        target = pointer.contents
+    target.value = value
+
+def _address(buffer):
+    """Returns the address of a buffer passed as a ctypes object, bytes or int"""
+
+    if isinstance(buffer, _integer_types):
+        return buffer
+    if isinstance(buffer, bytes):
+        return ctypes.cast(ctypes.c_char_p(buffer), ctypes.c_void_p).value
+    target = getattr(buffer, "_obj", None)
+    if target is not None:
+        return ctypes.addressof(target)
+    if isinstance(buffer, ctypes.c_void_p):
+        return buffer.value
+    return ctypes.addressof(buffer)
+
+def _wait(predicate, timeout):
+    """Waits until predicate() returns True; returns False on timeout"""
+
+    if timeout is None or timeout < 0:
+        deadline = None
+    else:
+        deadline = time.time() + timeout / 1000.0
+    while not predicate():
+        if deadline is None:
+            _condition.wait()
+        else:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            _condition.wait(remaining)
+    return True
+
+def _api(function):
+    """Runs a function of the library with the global lock and translates
+    its exceptions into return codes"""
+
+    def wrapper(*args):
+        with _lock:
+            try:
+                result = function(*args)
+            except _NoData:
+                return _NO_DATA
+            except _LoopbackError as error:
+                _set_last_error(str(error))
+                return error.retcode
+        return _OK if result is None else result
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+def _api_create(function):
+    """Like _api, for functions that return a handle (or NULL on error)"""
+
+    def wrapper(*args):
+        with _lock:
+            try:
+                return function(*args)
+            except _LoopbackError as error:
+                _set_last_error(str(error))
+                return None
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+def _type_code_api(function):
+    """Like _api, for the DDS_TypeCode functions, which receive a TypeCode and
+    report errors in their last argument, a DDS_ExceptionCode_t"""
+
+    def wrapper(type_code, *args):
+        with _lock:
+            try:
+                result = function(_resolve_handle(type_code, _Type), *args[:-1])
+            except _LoopbackError as error:
+                _set_out(args[-1], error.retcode)
+                return 0
+        _set_out(args[-1], _NO_EXCEPTION)
+        return result
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+def _check_type_kind(type_, *kinds):
+    if type_.kind not in kinds:
+        raise _LoopbackError("bad TypeCode kind", _BADKIND_EXCEPTION)
+
+def _check_member_index(type_, index):
+    _check_type_kind(type_, _TK_STRUCT, _TK_UNION, _TK_ENUM)
+    count = len(type_.enumerators) if type_.kind == _TK_ENUM else len(type_.members)
+    if index >= count:
+        raise _LoopbackError("member index out of bounds", _BOUNDS_EXCEPTION)
+
+def _array_dimensions(type_):
+    """Returns the dimensions and element of an array; a multidimensional
+    array is a chain of arrays"""
+
+    dimensions = []
+    while type_.kind == _TK_ARRAY:
+        dimensions.append(type_.length)
+        type_ = type_.element
+    return dimensions, type_
+
+class _Function:
+    """Emulates a function loaded with ctypes: the arguments are converted
+    according to argtypes, which raises ctypes.ArgumentError"""
+
+    def __init__(self, name, function):
+        self.__name__ = name
+        self.function = function
+        self.restype = ctypes.c_int
+        self.argtypes = None
+
+    def __call__(self, *args):
+        argtypes = self.argtypes
+        if argtypes is not None:
+            if len(args) != len(argtypes):
+                raise TypeError("this function takes {0} arguments ({1} given)"\
+                    .format(len(argtypes), len(args)))
+            for index, (argtype, arg) in enumerate(zip(argtypes, args)):
+                try:
+                    argtype.from_param(arg)
+                except TypeError as error:
+                    raise ctypes.ArgumentError(
+                        "argument {0}: {1}: {2}".format(index + 1, type(error).__name__, error))
+        return self.function(*args)
+
+    def __repr__(self):
+        return "<loopback function {0}>".format(self.__name__)
+
+def _get_loaned_data(reader, index):
+    # The data of a sample without valid data only contains its key
+    return reader.loaned_sample(index).written.data
+
+def _get_info_value(sample, name):
+    if name == "valid_data":
+        return sample.valid_data
+    if name in ("sample_identity", "identity"):
+        return sample.written.identity
+    if name == "related_sample_identity":
+        return sample.written.related_identity
+    if name == "source_timestamp":
+        return sample.written.source_timestamp
+    if name == "reception_timestamp":
+        return sample.reception_timestamp
+    if name == "sample_state":
+        return sample.sample_state
+    if name == "view_state":
+        return sample.view_state
+    if name == "instance_state":
+        return sample.instance_state
+    raise _LoopbackError("Unknown sample info field: {0}".format(name))
+
+def _set_any(selection, number_value, bool_value, string_value, value):
+    """Sets the outputs of the get_any functions"""
+
+    if isinstance(value, bool):
+        _set_out(bool_value, int(value))
+        _set_out(selection, _ANY_BOOLEAN)
+    elif isinstance(value, _integer_types + (float,)):
+        if isinstance(value, _integer_types) and abs(value) > _MAX_INTEGER_AS_DOUBLE:
+            _set_out(string_value, str(value).encode("utf-8"))
+            _set_out(selection, _ANY_STRING)
+        else:
+            _set_out(number_value, float(value))
+            _set_out(selection, _ANY_NUMBER)
+    elif isinstance(value, bytes):
+        _set_out(string_value, value)
+        _set_out(selection, _ANY_STRING)
+    else:
+        _set_out(string_value, value.encode("utf-8"))
+        _set_out(selection, _ANY_STRING)
+
+def _get_number(type_, value, field_name):
+    kind = type_.kind
+    if kind in _LARGE_INTEGER_KINDS and abs(value) > _MAX_INTEGER_AS_DOUBLE:
+        raise _LoopbackError("value of {0} is too large to be represented as a double"\
+            .format(field_name))
+    if kind in _NUMBER_KINDS or kind == _TK_ENUM:
+        return float(value)
+    if kind == _TK_BOOLEAN:
+        return float(int(value))
+    raise _LoopbackError("{0} is not a numeric field".format(field_name))
+
+def _get_string(type_, value):
+    kind = type_.kind
+    if kind in _STRING_KINDS or kind in _CHAR_KINDS:
+        return value
+    if kind in _NUMBER_KINDS or kind == _TK_ENUM:
+        return _number_to_string(value)
+    if kind == _TK_BOOLEAN:
+        return "true" if value else "false"
+    return _dumps(_to_json(type_, value)).decode("utf-8")
+
+def _get_any(type_, value):
+    kind = type_.kind
+    if kind in _COMPLEX_KINDS:
+        return _dumps(_to_json(type_, value))
+    return value
+
+_build_versions = [
+    ctypes.create_string_buffer(
+        b"NDDSCORE_BUILD_6.0.1.0_20200101T000000Z\nNDDSC_BUILD_6.0.1.0_20200101T000000Z"),
+    ctypes.create_string_buffer(b"RTICONNECTOR_BUILD_1.0.0_20200101T000000Z")
+]
+
+class LoopbackLibrary:
+    """Provides the functions of the native Connector library
+
+    The functions are attributes named after their C symbols, as in the
+    library loaded with ``ctypes.CDLL``.
+    """
+
+    def __init__(self):
+        for name in dir(self.__class__):
+            if name.startswith("RTI") or name.startswith("DDS_"):
+                setattr(self, name, _Function(name, getattr(self, name)))
+
+    def __getattr__(self, name):
+        if name.startswith("DDS_DynamicData_get_") and name.endswith("_array"):
+            element_kind = _ARRAY_FUNCTION_KINDS.get(name[len("DDS_DynamicData_get_"):-len("_array")])
+            if element_kind is not None:
+                function = _Function(name, _api(self._make_get_array(element_kind)))
+                setattr(self, name, function)
+                return function
+        if name.startswith("DDS_DynamicData_set_") and name.endswith("_array"):
+            element_kind = _ARRAY_FUNCTION_KINDS.get(name[len("DDS_DynamicData_set_"):-len("_array")])
+            if element_kind is not None:
+                function = _Function(name, _api(self._make_set_array(element_kind)))
+                setattr(self, name, function)
+                return function
+        raise AttributeError("function '{0}' not found in the loopback library".format(name))
+
+    # Connector
+
+    @staticmethod
+    @_api_create
+    def RTI_Connector_new(config_name, url, _options):
+        participant = _Participant(_fromcstring(config_name), _fromcstring(url))
+        return _new_handle(participant)
+
+    @staticmethod
+    def RTI_Connector_delete(connector):
+        with _lock:
+            try:
+                participant = _resolve_handle(connector, _Participant)
+            except _LoopbackError:
+                return
+            participant.delete()
+            del _handles[id(participant)]
+
+    @staticmethod
+    @_api_create
+    def RTI_Connector_get_datawriter(connector, writer_name):
+        writer = _resolve_handle(connector, _Participant).writer(_fromcstring(writer_name))
+        writer.enable()
+        return _new_handle(writer)
+
+    @staticmethod
+    @_api_create
+    def RTI_Connector_get_datareader(connector, reader_name):
+        reader = _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name))
+        reader.enable()
+        return _new_handle(reader)
+
+    @staticmethod
+    @_api_create
+    def RTI_Connector_get_native_sample(connector, reader_name, index):
+        reader = _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name))
+        return _new_handle(reader.loaned_sample(index).written.data)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_native_instance(connector, writer_name, instance):
+        writer = _resolve_handle(connector, _Participant).writer(_fromcstring(writer_name))
+        _set_out(instance, _new_handle(writer.instance))
+
+    # Output
+
+    @staticmethod
+    def _instance_member(connector, writer_name, field_name):
+        writer = _resolve_handle(connector, _Participant).writer(_fromcstring(writer_name))
+        field_name = _fromcstring(field_name)
+        tokens, length_suffix = _parse_field_name(field_name)
+        if length_suffix:
+            raise _LoopbackError("cannot set the length of {0}".format(field_name))
+        instance = writer.instance
+        return _lookup_for_set(instance.type, instance, None, tokens, field_name) + (field_name,)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_set_number_into_samples(connector, writer_name, field_name, value):
+        type_, holder, key, _, name = LoopbackLibrary._instance_member(
+            connector, writer_name, field_name)
+        if type_.kind in _LARGE_INTEGER_KINDS and abs(value) >= _MAX_INTEGER_AS_DOUBLE:
+            raise _LoopbackError("value of {0} is too large".format(name))
+        holder[key] = _convert_number(type_, value, name)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_set_boolean_into_samples(connector, writer_name, field_name, value):
+        type_, holder, key, _, name = LoopbackLibrary._instance_member(
+            connector, writer_name, field_name)
+        if type_.kind == _TK_BOOLEAN:
+            holder[key] = bool(value)
+        else:
+            holder[key] = _convert_number(type_, int(bool(value)), name)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_set_string_into_samples(connector, writer_name, field_name, value):
+        type_, holder, key, _, name = LoopbackLibrary._instance_member(
+            connector, writer_name, field_name)
+        holder[key] = _convert_string(type_, _fromcstring(value), name)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_clear_member(connector, writer_name, field_name):
+        type_, holder, key, member, _ = LoopbackLibrary._instance_member(
+            connector, writer_name, field_name)
+        if member is not None and member.optional:
+            holder[key] = None
+        else:
+            holder[key] = _default_value(type_, member)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_clear(connector, writer_name):
+        writer = _resolve_handle(connector, _Participant).writer(_fromcstring(writer_name))
+        writer.instance.value = _default_value(writer.type)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_set_json_instance(connector, writer_name, json_str):
+        writer = _resolve_handle(connector, _Participant).writer(_fromcstring(writer_name))
+        try:
+            json_value = json.loads(json_str.decode("utf-8"))
+        except ValueError as error:
+            raise _LoopbackError("error parsing the JSON string: {0}".format(error))
+        if not isinstance(json_value, dict):
+            raise _LoopbackError("the JSON string must be an object")
+        box = [_copy(writer.instance.value)]
+        for field_name, item in json_value.items():
+            _apply_json_field(writer.type, box, field_name, item, writer.type.name)
+        writer.instance.value = box[0]
+
+    @staticmethod
+    @_api_create
+    def RTIDDSConnector_getJSONInstance(connector, writer_name):
+        writer = _resolve_handle(connector, _Participant).writer(_fromcstring(writer_name))
+        json_str = _dumps(_to_json(writer.type, writer.instance.value))
+        return ctypes.cast(ctypes.create_string_buffer(json_str), ctypes.POINTER(ctypes.c_char))
+
+    @staticmethod
+    @_api
+    def RTI_Connector_write(connector, writer_name, params_json):
+        writer = _resolve_handle(connector, _Participant).writer(_fromcstring(writer_name))
+        params = {}
+        if params_json:
+            try:
+                params = json.loads(params_json.decode("utf-8"))
+            except ValueError as error:
+                raise _LoopbackError("error parsing the write parameters: {0}".format(error))
+        writer.write(params)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_wait_for_acknowledgments(writer, _timeout):
+        _resolve_handle(writer, _Writer)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_wait_for_matched_subscription(writer, timeout, current_count_change):
+        writer = _resolve_handle(writer, _Writer)
+        if not _wait(lambda: writer.match_change != 0, timeout):
+            return _TIMEOUT
+        _set_out(current_count_change, writer.match_change)
+        writer.match_change = 0
+        return _OK
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_matched_subscriptions(writer, json_str):
+        _set_out(json_str, _resolve_handle(writer, _Writer).matched_json())
+
+    # Input
+
+    @staticmethod
+    @_api
+    def RTI_Connector_read(connector, reader_name):
+        _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name)).read(False)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_take(connector, reader_name):
+        _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name)).read(True)
+
+    @staticmethod
+    @_api
+    def RTI_Connector_return_loan(connector, reader_name):
+        _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name)).loan = []
+
+    @staticmethod
+    @_api
+    def RTI_Connector_wait_for_data(connector, timeout):
+        participant = _resolve_handle(connector, _Participant)
+        readers = list(participant.readers.values())
+        if not _wait(lambda: any(reader.data_available for reader in readers), timeout):
+            return _TIMEOUT
+        return _OK
+
+    @staticmethod
+    @_api
+    def RTI_Connector_wait_for_data_on_reader(reader, timeout):
+        reader = _resolve_handle(reader, _Reader)
+        if not _wait(lambda: reader.data_available, timeout):
+            return _TIMEOUT
+        return _OK
+
+    @staticmethod
+    @_api
+    def RTI_Connector_wait_for_matched_publication(reader, timeout, current_count_change):
+        reader = _resolve_handle(reader, _Reader)
+        if not _wait(lambda: reader.match_change != 0, timeout):
+            return _TIMEOUT
+        _set_out(current_count_change, reader.match_change)
+        reader.match_change = 0
+        return _OK
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_matched_publications(reader, json_str):
+        _set_out(json_str, _resolve_handle(reader, _Reader).matched_json())
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_sample_count(connector, reader_name, value):
+        reader = _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name))
+        _set_out(value, float(len(reader.loan)))
+
+    @staticmethod
+    def _sample_member(connector, reader_name, index, field_name):
+        reader = _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name))
+        data = _get_loaned_data(reader, index)
+        field_name = _fromcstring(field_name)
+        tokens, length_suffix = _parse_field_name(field_name)
+        type_, value = _lookup(data.type, data.value, tokens, field_name)
+        if length_suffix:
+            if type_.kind in (_TK_SEQUENCE, _TK_ARRAY):
+                return _PRIMITIVE_TYPES["long"], len(value), field_name
+            if type_.kind == _TK_UNION:
+                return _STRING_TYPE, value.member.name, field_name
+            raise _LoopbackError("{0} is not a sequence or union".format(field_name))
+        return type_, value, field_name
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_number_from_sample(connector, number_value, reader_name, index, field_name):
+        type_, value, name = LoopbackLibrary._sample_member(
+            connector, reader_name, index, field_name)
+        _set_out(number_value, _get_number(type_, value, name))
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_boolean_from_sample(connector, bool_value, reader_name, index, field_name):
+        type_, value, name = LoopbackLibrary._sample_member(
+            connector, reader_name, index, field_name)
+        if type_.kind == _TK_BOOLEAN or type_.kind in _INTEGER_RANGES:
+            _set_out(bool_value, int(bool(value)))
+        else:
+            raise _LoopbackError("{0} is not a boolean field".format(name))
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_string_from_sample(connector, string_value, reader_name, index, field_name):
+        type_, value, _ = LoopbackLibrary._sample_member(
+            connector, reader_name, index, field_name)
+        _set_out(string_value, _get_string(type_, value).encode("utf-8"))
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_any_from_sample( # pylint: disable=too-many-arguments
+            connector, number_value, bool_value, string_value, selection,
+            reader_name, index, field_name):
+        type_, value, _ = LoopbackLibrary._sample_member(
+            connector, reader_name, index, field_name)
+        _set_any(selection, number_value, bool_value, string_value, _get_any(type_, value))
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_json_sample(connector, reader_name, index, json_str):
+        reader = _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name))
+        data = _get_loaned_data(reader, index)
+        _set_out(json_str, _dumps(_to_json(data.type, data.value)))
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_json_member(connector, reader_name, index, member_name, json_str):
+        reader = _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name))
+        data = _get_loaned_data(reader, index)
+        field_name = _fromcstring(member_name)
+        tokens, _ = _parse_field_name(field_name)
+        if _member_type(data.type, tokens, field_name)[0].kind not in _COMPLEX_KINDS:
+            raise _LoopbackError(_COMPLEX_KIND_ERROR)
+        type_, value = _lookup(data.type, data.value, tokens, field_name)
+        _set_out(json_str, _dumps(_to_json(type_, value)))
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_boolean_from_infos(connector, bool_value, reader_name, index, name):
+        reader = _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name))
+        name = _fromcstring(name)
+        if name != "valid_data":
+            raise _LoopbackError("Unknown boolean sample info field: {0}".format(name))
+        _set_out(bool_value, int(reader.loaned_sample(index).valid_data))
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_json_from_infos(connector, reader_name, index, name, json_str):
+        reader = _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name))
+        value = _get_info_value(reader.loaned_sample(index), _fromcstring(name))
+        _set_out(json_str, _dumps(value))
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_any_from_info( # pylint: disable=too-many-arguments
+            connector, number_value, bool_value, string_value, selection,
+            reader_name, index, name):
+        reader = _resolve_handle(connector, _Participant).reader(_fromcstring(reader_name))
+        sample = reader.loaned_sample(index)
+        name = _fromcstring(name)
+        if name in ("sample_identity", "identity"):
+            value = sample.written.identity_json
+        elif name == "related_sample_identity":
+            value = sample.written.related_identity_json
+        else:
+            value = _get_info_value(sample, name)
+        _set_any(selection, number_value, bool_value, string_value, value)
+
+    # Other
+
+    @staticmethod
+    @_api
+    def RTI_Connector_set_max_objects_per_thread(_value):
+        pass
+
+    @staticmethod
+    def RTI_Connector_get_last_error_message():
+        message = getattr(_errors, "message", None)
+        if not message:
+            return None
+        return ctypes.cast(
+            ctypes.create_string_buffer(message.encode("utf-8")),
+            ctypes.POINTER(ctypes.c_char))
+
+    @staticmethod
+    def RTI_Connector_free_string(_string):
+        pass
+
+    @staticmethod
+    @_api
+    def RTI_Connector_create_test_scenario(connector, scenario, writer):
+        participant = _resolve_handle(connector, _Participant)
+        writer = _resolve_handle(writer, _Writer)
+        if scenario != 0:
+            raise _LoopbackError("unknown test scenario {0}".format(scenario))
+        # Create a reader without an entity name that matches the writer
+        reader = _Reader(participant, None, None, writer.topic_name, writer.type)
+        participant.readers["<test scenario {0}>".format(len(participant.readers))] = reader
+        reader.enable()
+
+    @staticmethod
+    @_api
+    def RTI_Connector_get_build_versions(core_c_versions, connector_version):
+        _set_out(core_c_versions, ctypes.addressof(_build_versions[0]))
+        _set_out(connector_version, ctypes.addressof(_build_versions[1]))
+
+    # DDS API
+
+    @staticmethod
+    def DDS_DataReader_get_topicdescription(reader):
+        with _lock:
+            try:
+                return _new_handle(_resolve_handle(reader, _Reader).topic)
+            except _LoopbackError:
+                return None
+
+    @staticmethod
+    def DDS_DataWriter_get_topic(writer):
+        with _lock:
+            try:
+                return _new_handle(_resolve_handle(writer, _Writer).topic)
+            except _LoopbackError:
+                return None
+
+    @staticmethod
+    def DDS_Topic_as_topicdescription(topic):
+        return topic
+
+    @staticmethod
+    def DDS_TopicDescription_get_type_name(topic):
+        with _lock:
+            try:
+                return _resolve_handle(topic, _TopicDescription).type_name_bytes
+            except _LoopbackError:
+                return None
+
+    @staticmethod
+    def DDS_TopicDescription_get_name(topic):
+        with _lock:
+            try:
+                return _resolve_handle(topic, _TopicDescription).name_bytes
+            except _LoopbackError:
+                return None
+
+    @staticmethod
+    def DDS_DynamicData_get_member_count(sample):
+        with _lock:
+            try:
+                data = _resolve_handle(sample, _DynamicData)
+            except _LoopbackError:
+                return 0
+            if data.type.kind == _TK_STRUCT:
+                return sum(1 for member in data.type.members
+                           if data.value[member.name] is not None)
+            return 1
+
+    @staticmethod
+    @_api
+    def DDS_DynamicData_get_member_info(sample, info, member_name, _member_id):
+        data = _resolve_handle(sample, _DynamicData)
+        field_name = _fromcstring(member_name)
+        tokens, _ = _parse_field_name(field_name)
+        member_type, _ = _member_type(data.type, tokens, field_name)
+        try:
+            _, value = _lookup(data.type, data.value, tokens, field_name)
+        except _NoData:
+            value = None
+
+        info = info._obj if hasattr(info, "_obj") else info.contents
+        info.member_id = 0
+        info.member_name = tokens[-1].encode("utf-8") if not isinstance(tokens[-1], int) else None
+        info.member_exists = int(value is not None)
+        info.member_kind = member_type.kind
+        info.representation_count = 0
+        if member_type.kind in (_TK_SEQUENCE, _TK_ARRAY):
+            info.element_count = len(value) if value is not None else 0
+            info.element_kind = member_type.element.kind
+        else:
+            info.element_count = 0
+            info.element_kind = 0
+
+    @staticmethod
+    def DDS_DynamicData_get_type(sample):
+        with _lock:
+            try:
+                return _new_handle(_resolve_handle(sample, _DynamicData).type)
+            except _LoopbackError:
+                return None
+
+    # DDS_TypeCode functions
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_kind(type_):
+        return type_.kind
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_name(type_):
+        _check_type_kind(type_, _TK_STRUCT, _TK_UNION, _TK_ENUM)
+        return type_.name.encode("utf-8")
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_member_count(type_):
+        _check_type_kind(type_, _TK_STRUCT, _TK_UNION, _TK_ENUM)
+        if type_.kind == _TK_ENUM:
+            return len(type_.enumerators)
+        return len(type_.members)
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_member_name(type_, index):
+        _check_member_index(type_, index)
+        if type_.kind == _TK_ENUM:
+            return list(type_.enumerators)[index].encode("utf-8")
+        return type_.members[index].name.encode("utf-8")
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_member_type(type_, index):
+        _check_member_index(type_, index)
+        _check_type_kind(type_, _TK_STRUCT, _TK_UNION)
+        return _new_handle(type_.members[index].type)
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_is_member_key(type_, index):
+        _check_member_index(type_, index)
+        _check_type_kind(type_, _TK_STRUCT)
+        return int(type_.members[index].key)
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_is_member_optional(type_, index):
+        _check_member_index(type_, index)
+        _check_type_kind(type_, _TK_STRUCT)
+        return int(type_.members[index].optional)
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_member_ordinal(type_, index):
+        _check_member_index(type_, index)
+        _check_type_kind(type_, _TK_ENUM)
+        return list(type_.enumerators.values())[index]
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_discriminator_type(type_):
+        _check_type_kind(type_, _TK_UNION)
+        return _new_handle(type_.discriminator)
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_default_index(type_):
+        _check_type_kind(type_, _TK_UNION)
+        for index, member in enumerate(type_.members):
+            if member.labels is None:
+                return index
+        return -1
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_member_label_count(type_, index):
+        _check_member_index(type_, index)
+        _check_type_kind(type_, _TK_UNION)
+        labels = type_.members[index].labels
+        return 0 if labels is None else len(labels)
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_member_label(type_, index, label_index):
+        _check_member_index(type_, index)
+        _check_type_kind(type_, _TK_UNION)
+        labels = type_.members[index].labels or []
+        if label_index >= len(labels):
+            raise _LoopbackError("label index out of bounds", _BOUNDS_EXCEPTION)
+        return int(labels[label_index])
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_length(type_):
+        _check_type_kind(type_, _TK_STRING, _TK_WSTRING, _TK_SEQUENCE)
+        # The length of an unbounded string or sequence is the maximum DDS_Long
+        return 0x7fffffff if type_.bound is None else type_.bound
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_content_type(type_):
+        _check_type_kind(type_, _TK_SEQUENCE, _TK_ARRAY)
+        if type_.kind == _TK_ARRAY:
+            return _new_handle(_array_dimensions(type_)[1])
+        return _new_handle(type_.element)
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_array_dimension_count(type_):
+        _check_type_kind(type_, _TK_ARRAY)
+        return len(_array_dimensions(type_)[0])
+
+    @staticmethod
+    @_type_code_api
+    def DDS_TypeCode_array_dimension(type_, index):
+        _check_type_kind(type_, _TK_ARRAY)
+        dimensions = _array_dimensions(type_)[0]
+        if index >= len(dimensions):
+            raise _LoopbackError("dimension index out of bounds", _BOUNDS_EXCEPTION)
+        return dimensions[index]
+
+    @staticmethod
+    def _array_member(sample, member_name, element_kind):
+        data = _resolve_handle(sample, _DynamicData)
+        field_name = _fromcstring(member_name)
+        tokens, _ = _parse_field_name(field_name)
+        type_, holder, key, _ = _lookup_for_set(data.type, data, None, tokens, field_name)
+        if type_.kind not in (_TK_SEQUENCE, _TK_ARRAY) or type_.element.kind != element_kind:
+            raise _LoopbackError("the type of {0} doesn't match the array elements"\
+                .format(field_name), _BAD_PARAMETER)
+        return type_, holder, key, field_name
+
+    @staticmethod
+    def _make_get_array(element_kind):
+        typecode = _ARRAY_TYPECODES.get(element_kind, 'B')
+
+        def get_array(sample, buffer, length, member_name, _member_id):
+            _, holder, key, _ = LoopbackLibrary._array_member(sample, member_name, element_kind)
+            values = holder[key]
+            if values is None:
+                raise _NoData
+            capacity = length._obj.value if hasattr(length, "_obj") else length.contents.value
+            if capacity < len(values):
+                raise _LoopbackError("the array has {0} elements but the buffer only {1}"\
+                    .format(len(values), capacity), _BAD_PARAMETER)
+            data = _array_to_bytes(array.array(typecode, values))
+            if data:
+                ctypes.memmove(_address(buffer), data, len(data))
+            _set_out(length, len(values))
+        get_array.__name__ = "get_array"
+        return get_array
+
+    @staticmethod
+    def _make_set_array(element_kind):
+        typecode = _ARRAY_TYPECODES.get(element_kind, 'B')
+        itemsize = array.array(typecode).itemsize
+
+        def set_array(sample, member_name, _member_id, length, buffer):
+            type_, holder, key, field_name = LoopbackLibrary._array_member(
+                sample, member_name, element_kind)
+            if type_.kind == _TK_SEQUENCE and type_.bound is not None and length > type_.bound:
+                raise _LoopbackError("the length of {0} exceeds its maximum length ({1})"\
+                    .format(field_name, type_.bound), _BAD_PARAMETER)
+            if type_.kind == _TK_ARRAY and length != type_.length:
+                raise _LoopbackError("the length of {0} must be {1}"\
+                    .format(field_name, type_.length), _BAD_PARAMETER)
+            values = array.array(typecode)
+            if length:
+                _array_from_bytes(values, ctypes.string_at(_address(buffer), length * itemsize))
+            if element_kind == _TK_BOOLEAN:
+                values = [bool(value) for value in values]
+            holder[key] = values
+        set_array.__name__ = "set_array"
+        return set_array
@@ -0,0 +1,152 @@
+###############################################################################
+# (c) 2005-2020 Copyright, Real-Time Innovations.  All rights reserved.       #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""asyncio support for *RTI Connector* for Python
+
+The *wait* operations (:meth:`Input.wait`, :meth:`Connector.wait`,
+:meth:`Output.wait`, :meth:`Input.wait_for_publications` and
+:meth:`Output.wait_for_subscriptions`) are thread-safe but they block the
+calling thread. The coroutines in this module run them in a dedicated thread
+pool and resume the calling coroutine in its event loop when they return.
+
+Each pending wait occupies one thread of the pool (32 by default; see
+:func:`set_executor`). When more waits are pending than there are threads,
+such as more than 32 concurrent :func:`stream` iterations, the extra waits
+are queued: they only start when another wait returns or finishes one of
+its one-second intervals, so data may be delivered to them late. An
+application that waits on more entities at the same time should set a
+larger executor.
+
+This module requires Python 3.6 or newer.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from .rticonnextdds_connector import TimeoutError # pylint: disable=redefined-builtin
+
+# The native waits are split into intervals of this duration (in milliseconds)
+# so that a cancelled wait releases its thread and the pending waits, when
+# there are more than threads in the executor, take turns.
+_WAIT_INTERVAL = 1000
+
+_DEFAULT_MAX_WORKERS = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+
+try:
+    _get_running_loop = asyncio.get_running_loop
+except AttributeError: # Python 3.6; get_event_loop returns the running loop
+    _get_running_loop = asyncio.get_event_loop
+
+def set_executor(executor):
+    """Sets the executor that runs the native waits
+
+    By default, this module creates a ``concurrent.futures.ThreadPoolExecutor``
+    with up to 32 threads. The maximum number of waits that can block at the
+    same time is the number of threads of the executor; the rest are queued
+    and may be delayed by up to one second each time they're queued. For
+    example, an application with 100 concurrent :func:`stream` iterations
+    can call::
+
+        aio.set_executor(concurrent.futures.ThreadPoolExecutor(max_workers=100))
+
+    :param executor: A ``concurrent.futures.Executor``. If ``None``, the default executor is created the next time it's needed.
+    """
+    global _executor # pylint: disable=global-statement
+    with _executor_lock:
+        _executor = executor
+
+def get_executor():
+    """Returns the executor that runs the native waits (see :func:`set_executor`)"""
+    global _executor # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_DEFAULT_MAX_WORKERS,
+                thread_name_prefix="rticonnextdds_connector.aio")
+        return _executor
+
+async def _run_wait(wait_function, timeout):
+    loop = _get_running_loop()
+    executor = get_executor()
+    deadline = None if timeout is None else loop.time() + timeout / 1000.0
+    while True:
+        if deadline is None:
+            interval = _WAIT_INTERVAL
+            last_interval = False
+        else:
+            remaining = max(0, int((deadline - loop.time()) * 1000))
+            interval = min(remaining, _WAIT_INTERVAL)
+            last_interval = remaining <= _WAIT_INTERVAL
+        try:
+            return await loop.run_in_executor(executor, wait_function, interval)
+        except TimeoutError:
+            if last_interval:
+                raise
+
+async def wait(entity, timeout=None):
+    """Waits for an :class:`Input`, :class:`Output` or :class:`Connector` without blocking the event loop
+
+    Depending on the type of ``entity``, this coroutine performs the same
+    operation as :meth:`Input.wait`, :meth:`Output.wait` or :meth:`Connector.wait`.
+
+    If the operation times out, it raises :class:`TimeoutError`.
+
+    :param entity: The :class:`Input`, :class:`Output` or :class:`Connector`
+    :param number timeout: The maximum time to wait in milliseconds. By default, infinite.
+    """
+
+    return await _run_wait(entity.wait, timeout)
+
+async def wait_for_publications(input, timeout=None): # pylint: disable=redefined-builtin
+    """Coroutine version of :meth:`Input.wait_for_publications`
+
+    :param input: The :class:`Input`
+    :param number timeout: The maximum time to wait in milliseconds. By default, infinite.
+    :return: The change in the current number of matched outputs
+    """
+
+    return await _run_wait(input.wait_for_publications, timeout)
+
+async def wait_for_subscriptions(output, timeout=None):
+    """Coroutine version of :meth:`Output.wait_for_subscriptions`
+
+    :param output: The :class:`Output`
+    :param number timeout: The maximum time to wait in milliseconds. By default, infinite.
+    :return: The change in the current number of matched inputs
+    """
+
+    return await _run_wait(output.wait_for_subscriptions, timeout)
+
+async def stream(input, take=True): # pylint: disable=redefined-builtin
+    """Asynchronously iterates over the data received by an :class:`Input`
+
+    Each iteration waits for data, calls :meth:`Input.take` (or
+    :meth:`Input.read` if ``take`` is ``False``) and produces
+    :attr:`Input.samples`. For example::
+
+        async for samples in aio.stream(input):
+            for sample in samples.valid_data_iter:
+                print(sample.get_dictionary())
+
+    The samples produced by an iteration are only valid until the next one.
+
+    :param input: The :class:`Input`
+    :param bool take: Whether to take or read the samples
+    """
+
+    while True:
+        await wait(input)
+        if take:
+            input.take()
+        else:
+            input.read()
+        if input.samples.length > 0:
+            yield input.samples
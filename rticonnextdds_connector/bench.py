@@ -0,0 +1,599 @@
+###############################################################################
+# (c) 2005-2020 Copyright, Real-Time Innovations.  All rights reserved.       #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Benchmarks for *RTI Connector* for Python
+
+Run the benchmarks with::
+
+    python -m rticonnextdds_connector.bench --output results.json
+
+Each benchmark times one operation (for example :meth:`Output.write` or
+:meth:`SampleIterator.get_dictionary`) a number of times, after a number of
+warmup iterations that are not included in the results. The results contain,
+for each benchmark, the percentiles of the duration of the operation in
+nanoseconds.
+
+To detect performance regressions, pass the results of a previous run with
+``--baseline``; the command fails if the median duration of a benchmark
+increases more than ``--threshold`` (10% by default).
+
+The benchmarks use the native library unless the environment variable
+``RTI_CONNECTOR_BACKEND`` is set to ``loopback`` (or ``--backend loopback`` is
+passed), in which case they use the pure-Python implementation in the same
+process.
+
+The ``import`` benchmark measures the time it takes to import the package
+in a new Python interpreter.
+"""
+
+from __future__ import print_function
+import argparse
+import array
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+from . import rticonnextdds_connector as rti
+
+_perf_counter_ns = rti._perf_counter_ns # pylint: disable=protected-access, invalid-name
+
+_CONFIGURATION = """str://"<dds>
+<types>
+  <struct name="BenchPoint">
+    <member name="x" type="double"/>
+    <member name="y" type="double"/>
+  </struct>
+  <struct name="BenchType">
+    <member name="id" type="long" key="true"/>
+    <member name="value" type="double"/>
+    <member name="flag" type="boolean"/>
+    <member name="name" type="string" stringMaxLength="256"/>
+    <member name="point" type="nonBasic" nonBasicTypeName="BenchPoint"/>
+    <member name="payload" type="byte" sequenceMaxLength="1000000"/>
+    <member name="values" type="double" sequenceMaxLength="100000"/>
+  </struct>
+</types>
+<qos_library name="BenchQosLibrary">
+  <qos_profile name="BenchQos">
+    <datawriter_qos>
+      <reliability><kind>RELIABLE_RELIABILITY_QOS</kind></reliability>
+      <history><kind>KEEP_ALL_HISTORY_QOS</kind></history>
+    </datawriter_qos>
+    <datareader_qos>
+      <reliability><kind>RELIABLE_RELIABILITY_QOS</kind></reliability>
+      <history><kind>KEEP_ALL_HISTORY_QOS</kind></history>
+    </datareader_qos>
+  </qos_profile>
+</qos_library>
+<domain_library name="BenchDomainLibrary">
+  <domain name="BenchDomain" domain_id="0">
+    <register_type name="BenchType" type_ref="BenchType"/>
+    <topic name="BenchTopic" register_type_ref="BenchType"/>
+  </domain>
+</domain_library>
+<domain_participant_library name="BenchParticipantLibrary">
+  <domain_participant name="BenchParticipant" domain_ref="BenchDomainLibrary::BenchDomain">
+    <publisher name="BenchPublisher">
+      <data_writer name="BenchWriter" topic_ref="BenchTopic">
+        <datawriter_qos base_name="BenchQosLibrary::BenchQos"/>
+      </data_writer>
+    </publisher>
+    <subscriber name="BenchSubscriber">
+      <data_reader name="BenchReader" topic_ref="BenchTopic">
+        <datareader_qos base_name="BenchQosLibrary::BenchQos"/>
+      </data_reader>
+    </subscriber>
+  </domain_participant>
+</domain_participant_library>
+</dds>"
+"""
+
+_CONFIG_NAME = "BenchParticipantLibrary::BenchParticipant"
+_INPUT_NAME = "BenchSubscriber::BenchReader"
+_OUTPUT_NAME = "BenchPublisher::BenchWriter"
+
+# Payload sizes (number of elements) of the benchmarks that depend on the
+# size of the data
+PAYLOAD_SIZES = (16, 1024, 65536)
+
+# Number of samples taken at once by the take benchmark
+TAKE_BATCH_SIZES = (1, 100)
+
+_WAIT_TIMEOUT = 10000
+
+DEFAULT_ITERATIONS = 1000
+DEFAULT_IMPORT_RUNS = 10
+DEFAULT_WARMUP = 100
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_METRIC = "p50_ns"
+
+PERCENTILES = (50, 90, 99)
+
+class _Benchmark:
+    def __init__(self, name, factory, size):
+        self.name = name
+        self.factory = factory
+        self.size = size
+
+_BENCHMARKS = []
+
+def _benchmark(name, sizes=None):
+    """Registers a benchmark
+
+    The decorated function receives a :class:`_Context` and a size (``None``
+    if the benchmark doesn't have ``sizes``), and returns a tuple
+    ``(operation, prepare)``. ``operation`` is the function that is timed;
+    ``prepare`` (which can be ``None``) is called before each call to
+    ``operation``, and is not timed.
+    """
+
+    def decorator(factory):
+        if sizes is None:
+            _BENCHMARKS.append(_Benchmark(name, factory, None))
+        else:
+            for size in sizes:
+                _BENCHMARKS.append(
+                    _Benchmark("{0}[{1}]".format(name, size), factory, size))
+        return factory
+    return decorator
+
+class _Context:
+    """The Connector, Input and Output shared by all the benchmarks"""
+
+    def __init__(self, url=None):
+        self.connector = rti.Connector(_CONFIG_NAME, url or _CONFIGURATION)
+        self.input = self.connector.get_input(_INPUT_NAME)
+        self.output = self.connector.get_output(_OUTPUT_NAME)
+        self.output.wait_for_subscriptions(_WAIT_TIMEOUT)
+        self.input.wait_for_publications(_WAIT_TIMEOUT)
+
+    def close(self):
+        self.connector.close()
+
+    def reset(self):
+        """Discards the data and encoder of the previous benchmark"""
+        self.output._encoder = None # pylint: disable=protected-access
+        self.output.clear_members()
+        self.drain()
+
+    def drain(self):
+        self.input.take()
+
+    def write_and_read(self, count=1):
+        """Writes the current instance ``count`` times and waits until the
+        Input can read all the samples"""
+
+        for _ in range(0, count):
+            self.output.write()
+        wait_for_samples(self.input, count)
+
+def wait_for_samples(input, count, timeout=_WAIT_TIMEOUT): # pylint: disable=redefined-builtin
+    """Reads the samples of an :class:`Input` until it has at least ``count``
+
+    :param input: The :class:`Input`
+    :param int count: The number of samples
+    :param number timeout: The maximum time to wait, in milliseconds
+    :raises TimeoutError: If the Input doesn't have ``count`` samples before the timeout
+    """
+
+    deadline = rti._perf_counter() + timeout / 1000.0 # pylint: disable=protected-access
+    while True:
+        input.read()
+        if input.samples.length >= count:
+            return
+        remaining = int((deadline - rti._perf_counter()) * 1000) # pylint: disable=protected-access
+        if remaining <= 0:
+            raise rti.TimeoutError()
+        try:
+            input.wait(remaining)
+        except rti.TimeoutError:
+            pass
+
+def _payload(size):
+    return bytearray(i % 256 for i in range(0, size))
+
+def _values(size):
+    return array.array("d", (float(i) for i in range(0, size)))
+
+def _dictionary(size):
+    return {
+        "id": 1,
+        "value": 3.5,
+        "flag": True,
+        "name": "benchmark",
+        "point": {"x": 1.0, "y": 2.0},
+        "payload": list(_payload(size))
+    }
+
+@_benchmark("write")
+def _write(context, _):
+    context.output.instance.set_dictionary(_dictionary(16))
+    return context.output.write, context.drain
+
+@_benchmark("take", sizes=TAKE_BATCH_SIZES)
+def _take(context, size):
+    context.output.instance.set_dictionary(_dictionary(16))
+    def prepare():
+        context.write_and_read(size)
+    return context.input.take, prepare
+
+@_benchmark("round_trip")
+def _round_trip(context, _):
+    output, input = context.output, context.input # pylint: disable=redefined-builtin
+    output.instance.set_dictionary(_dictionary(16))
+    def operation():
+        output.write()
+        input.wait(_WAIT_TIMEOUT)
+        input.take()
+    return operation, None
+
+@_benchmark("set_dictionary", sizes=PAYLOAD_SIZES)
+def _set_dictionary(context, size):
+    dictionary = _dictionary(size)
+    instance = context.output.instance
+    def operation():
+        instance.set_dictionary(dictionary)
+    return operation, None
+
+@_benchmark("set_dictionary_compiled", sizes=PAYLOAD_SIZES)
+def _set_dictionary_compiled(context, size):
+    dictionary = _dictionary(size)
+    instance = context.output.instance
+    context.output.compile_encoder()
+    def operation():
+        instance.set_dictionary(dictionary)
+    return operation, None
+
+@_benchmark("get_dictionary", sizes=PAYLOAD_SIZES)
+def _get_dictionary(context, size):
+    context.output.instance.set_dictionary(_dictionary(size))
+    context.write_and_read()
+    return context.input.samples[0].get_dictionary, None
+
+@_benchmark("set_number")
+def _set_number(context, _):
+    instance = context.output.instance
+    def operation():
+        instance.set_number("point.x", 10.5)
+    return operation, None
+
+@_benchmark("set_string")
+def _set_string(context, _):
+    instance = context.output.instance
+    def operation():
+        instance.set_string("name", "benchmark")
+    return operation, None
+
+@_benchmark("instance_accessor")
+def _instance_accessor(context, _):
+    accessor = context.output.instance.accessor("point.x")
+    def operation():
+        accessor.set(10.5)
+    return operation, None
+
+@_benchmark("get_number")
+def _get_number(context, _):
+    context.output.instance.set_dictionary(_dictionary(16))
+    context.write_and_read()
+    sample = context.input.samples[0]
+    def operation():
+        return sample.get_number("point.x")
+    return operation, None
+
+@_benchmark("get_string")
+def _get_string(context, _):
+    context.output.instance.set_dictionary(_dictionary(16))
+    context.write_and_read()
+    sample = context.input.samples[0]
+    def operation():
+        return sample.get_string("name")
+    return operation, None
+
+@_benchmark("getitem")
+def _getitem(context, _):
+    context.output.instance.set_dictionary(_dictionary(16))
+    context.write_and_read()
+    sample = context.input.samples[0]
+    def operation():
+        return sample["point.x"]
+    return operation, None
+
+@_benchmark("sample_accessor")
+def _sample_accessor(context, _):
+    context.output.instance.set_dictionary(_dictionary(16))
+    context.write_and_read()
+    sample = context.input.samples[0]
+    accessor = context.input.accessor("point.x")
+    def operation():
+        return accessor.get(sample)
+    return operation, None
+
+@_benchmark("set_array", sizes=PAYLOAD_SIZES)
+def _set_array(context, size):
+    payload = _payload(size)
+    instance = context.output.instance
+    def operation():
+        instance.set_array("payload", payload)
+    return operation, None
+
+@_benchmark("set_sequence_from_list", sizes=PAYLOAD_SIZES)
+def _set_sequence_from_list(context, size):
+    values = list(_values(size))
+    instance = context.output.instance
+    def operation():
+        instance["values"] = values
+    return operation, None
+
+@_benchmark("get_array", sizes=PAYLOAD_SIZES)
+def _get_array(context, size):
+    context.output.instance.set_array("payload", _payload(size))
+    context.write_and_read()
+    sample = context.input.samples[0]
+    out = bytearray(size)
+    def operation():
+        return sample.get_array("payload", out)
+    return operation, None
+
+@_benchmark("sample_info")
+def _sample_info(context, _):
+    context.output.instance.set_dictionary(_dictionary(16))
+    context.write_and_read()
+    input = context.input # pylint: disable=redefined-builtin
+    def operation():
+        # read() invalidates the SampleInfo values cached by the Input
+        return input.samples[0].info["source_timestamp"]
+    return operation, input.read
+
+_IMPORT_BENCHMARK = "import"
+
+_IMPORT_SCRIPT = """
+import time
+perf_counter = getattr(time, "perf_counter", time.time)
+start = perf_counter()
+import rticonnextdds_connector
+print(int((perf_counter() - start) * 1e9))
+"""
+
+def benchmark_names():
+    """Returns the names of all the benchmarks"""
+    return [benchmark.name for benchmark in _BENCHMARKS] + [_IMPORT_BENCHMARK]
+
+def measure_import_time(runs=DEFAULT_IMPORT_RUNS):
+    """Measures the time it takes to import this package
+
+    Each run imports the package in a new Python interpreter. The first run,
+    which also fills the operating system's file cache, is not included.
+
+    :param int runs: The number of measured imports
+    :return: The duration of each import, in nanoseconds
+    """
+
+    package_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [package_path] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    durations = []
+    for i in range(0, runs + 1):
+        output = subprocess.check_output([sys.executable, "-c", _IMPORT_SCRIPT], env=env)
+        if i > 0:
+            durations.append(int(output.strip()))
+    return durations
+
+def summarize(durations):
+    """Calculates the statistics of a list of durations in nanoseconds
+
+    :param list durations: The durations of each iteration
+    :return: A dictionary with the minimum, maximum and mean durations, the percentiles in :data:`PERCENTILES` (for example ``"p99_ns"``), and the number of operations per second.
+    """
+
+    if not durations:
+        raise ValueError("durations cannot be empty")
+    ordered = sorted(durations)
+    count = len(ordered)
+    mean = sum(ordered) / float(count)
+    summary = {
+        "count": count,
+        "min_ns": ordered[0],
+        "max_ns": ordered[-1],
+        "mean_ns": mean,
+        "ops_per_sec": 1e9 / mean if mean > 0 else None
+    }
+    for percentile in PERCENTILES:
+        # Nearest-rank percentile
+        rank = max(0, -(-percentile * count // 100) - 1)
+        summary["p{0}_ns".format(percentile)] = ordered[rank]
+    return summary
+
+def _run_benchmark(context, benchmark, iterations, warmup):
+    operation, prepare = benchmark.factory(context, benchmark.size)
+    durations = []
+    for i in range(0, warmup + iterations):
+        if prepare is not None:
+            prepare()
+        start = _perf_counter_ns()
+        operation()
+        duration = _perf_counter_ns() - start
+        if i >= warmup:
+            durations.append(duration)
+    return summarize(durations)
+
+def run_benchmarks(
+        iterations=DEFAULT_ITERATIONS,
+        warmup=DEFAULT_WARMUP,
+        patterns=None,
+        url=None,
+        progress=None,
+        import_runs=DEFAULT_IMPORT_RUNS):
+    """Runs the benchmarks
+
+    :param int iterations: The number of timed iterations of each benchmark
+    :param int warmup: The number of iterations of each benchmark before the timed iterations
+    :param int import_runs: The number of timed iterations of the ``import`` benchmark, which is slower than the rest (see :func:`measure_import_time`)
+    :param list patterns: (Optional) Only run the benchmarks whose name matches one of these ``fnmatch`` patterns (for example ``"get_*"``)
+    :param str url: (Optional) A configuration file that defines the same types and entities as the default configuration of this module
+    :param progress: (Optional) A function called with the name of each benchmark before it runs
+    :return: A dictionary with the description of the environment and, in ``"results"``, the statistics (see :func:`summarize`) of each benchmark
+    """
+
+    if iterations < 1:
+        raise ValueError("iterations must be positive")
+    if warmup < 0:
+        raise ValueError("warmup cannot be negative")
+
+    def selected(name):
+        return not patterns or any(
+            fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+    results = {}
+    if selected(_IMPORT_BENCHMARK):
+        if progress is not None:
+            progress(_IMPORT_BENCHMARK)
+        results[_IMPORT_BENCHMARK] = summarize(measure_import_time(import_runs))
+
+    benchmarks = [benchmark for benchmark in _BENCHMARKS if selected(benchmark.name)]
+    if benchmarks:
+        context = _Context(url)
+        try:
+            for benchmark in benchmarks:
+                if progress is not None:
+                    progress(benchmark.name)
+                context.reset()
+                results[benchmark.name] = _run_benchmark(
+                    context, benchmark, iterations, warmup)
+        finally:
+            context.close()
+
+    return {
+        "backend": os.environ.get("RTI_CONNECTOR_BACKEND") or "native",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": iterations,
+        "warmup": warmup,
+        "results": results
+    }
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD, metric=DEFAULT_METRIC):
+    """Compares the results of :func:`run_benchmarks` with a baseline
+
+    Only the benchmarks that are in both ``report`` and ``baseline`` are compared.
+
+    :param dict report: The current results
+    :param dict baseline: The results of a previous run
+    :param float threshold: The maximum allowed relative increase of ``metric`` (for example, ``0.1`` allows a 10% increase)
+    :param str metric: The statistic to compare
+    :return: A list of ``(name, baseline_value, value)`` tuples, one for each benchmark that regressed
+    """
+
+    regressions = []
+    baseline_results = baseline.get("results", {})
+    for name, result in sorted(report.get("results", {}).items()):
+        if name not in baseline_results:
+            continue
+        baseline_value = baseline_results[name].get(metric)
+        value = result.get(metric)
+        if baseline_value is None or value is None:
+            continue
+        if value > baseline_value * (1 + threshold):
+            regressions.append((name, baseline_value, value))
+    return regressions
+
+def format_report(report, file=sys.stdout): # pylint: disable=redefined-builtin
+    """Prints a table with the results of :func:`run_benchmarks`"""
+
+    columns = ["p{0}_ns".format(percentile) for percentile in PERCENTILES]
+    columns.append("max_ns")
+    print("{0:<32}".format("benchmark") + "".join(
+        "{0:>14}".format(column) for column in columns), file=file)
+    for name, result in sorted(report["results"].items()):
+        print("{0:<32}".format(name) + "".join(
+            "{0:>14}".format(result[column]) for column in columns), file=file)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m rticonnextdds_connector.bench",
+        description="Runs the RTI Connector for Python benchmarks")
+    parser.add_argument(
+        "-n", "--iterations", type=int, default=DEFAULT_ITERATIONS,
+        help="number of timed iterations of each benchmark (default: %(default)s)")
+    parser.add_argument(
+        "-w", "--warmup", type=int, default=DEFAULT_WARMUP,
+        help="number of untimed iterations before the timed ones (default: %(default)s)")
+    parser.add_argument(
+        "-k", "--filter", action="append", dest="patterns", metavar="PATTERN",
+        help="only run the benchmarks that match this pattern (can be repeated)")
+    parser.add_argument(
+        "-o", "--output", metavar="FILE",
+        help="write the results as JSON to this file")
+    parser.add_argument(
+        "-b", "--baseline", metavar="FILE",
+        help="fail if the results regress with respect to these results")
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="maximum allowed relative increase (default: %(default)s)")
+    parser.add_argument(
+        "-m", "--metric", default=DEFAULT_METRIC,
+        help="statistic compared with the baseline (default: %(default)s)")
+    parser.add_argument(
+        "--import-runs", type=int, default=DEFAULT_IMPORT_RUNS,
+        help="number of timed iterations of the import benchmark (default: %(default)s)")
+    parser.add_argument(
+        "--backend", choices=["native", "loopback"],
+        help="use the native library or the pure-Python loopback implementation "
+        "(default: the value of RTI_CONNECTOR_BACKEND, or native)")
+    parser.add_argument(
+        "--url", metavar="FILE",
+        help="configuration file to use instead of the built-in configuration")
+    parser.add_argument(
+        "-l", "--list", action="store_true",
+        help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in benchmark_names():
+            print(name)
+        return 0
+
+    if args.backend == "loopback":
+        os.environ["RTI_CONNECTOR_BACKEND"] = "loopback"
+    elif args.backend == "native":
+        os.environ.pop("RTI_CONNECTOR_BACKEND", None)
+    if args.backend is not None and \
+            rti._loaded_connector_binding is not None: # pylint: disable=protected-access
+        parser.error("--backend must be selected before the native library is loaded")
+
+    def progress(name):
+        print("Running {0}...".format(name), file=sys.stderr)
+
+    report = run_benchmarks(
+        iterations=args.iterations,
+        warmup=args.warmup,
+        patterns=args.patterns,
+        url=args.url,
+        progress=progress,
+        import_runs=args.import_runs)
+    format_report(report)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(report, baseline, args.threshold, args.metric)
+        for name, baseline_value, value in regressions:
+            print("Regression in {0}: {1} {2} (baseline: {3})".format(
+                name, args.metric, value, baseline_value), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+###############################################################################
+# (c) 2005-2020 Copyright, Real-Time Innovations.  All rights reserved.       #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+"""Recording the data received by an Input and replaying it through an Output
+
+A :class:`Recorder` appends the samples taken by an :class:`Input` to a file::
+
+    from rticonnextdds_connector.recording import Recorder, Replayer
+
+    with Recorder(input, "squares.rec") as recorder:
+        while running:
+            input.wait()
+            input.take()
+            recorder.record()
+
+A :class:`Replayer` writes them later with an :class:`Output` of the same type,
+with the original timing or as fast as possible::
+
+    with Replayer(output, "squares.rec", speed=None) as replayer:
+        replayer.replay()
+
+The file is a sequence of length-prefixed records, one per sample, that
+contain the JSON representation of the sample (as returned by
+:meth:`SampleIterator.get_json_bytes`), its ``source_timestamp``,
+``reception_timestamp`` and ``identity``, and whether the sample was a write,
+a dispose or an unregistration. The samples are copied into and read from a
+memory-mapped file, without converting them into dictionaries.
+
+Every ``index_interval`` records, the ``Recorder`` appends the reception
+timestamp and position of the next record to an index file (the same path
+with the extension ``.index``). The ``Replayer`` uses it to find where to start
+when it only replays the samples received after a given time.
+"""
+
+import bisect
+import ctypes
+import mmap
+import struct
+import time
+from . import rticonnextdds_connector as rti
+
+# pylint: disable=protected-access
+
+_MAGIC = b"RTICREC1"
+
+# Length of the record (including this header), action, source_timestamp,
+# reception_timestamp and length of the identity; followed by the identity
+# and the sample
+_RECORD_HEADER = struct.Struct("<IBqqH")
+
+# Reception timestamp and offset of a record
+_INDEX_ENTRY = struct.Struct("<qQ")
+
+_ACTIONS = ("write", "dispose", "unregister")
+_WRITE, _DISPOSE, _UNREGISTER = range(len(_ACTIONS))
+
+_INSTANCE_STATE_ACTIONS = {
+    "NOT_ALIVE_DISPOSED": _DISPOSE,
+    "NOT_ALIVE_NO_WRITERS": _UNREGISTER
+}
+
+# A timestamp that is not available is recorded as -1
+_NO_TIMESTAMP = -1
+
+DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+DEFAULT_INDEX_INTERVAL = 1024
+
+def _index_path(path):
+    return path + ".index"
+
+class Recorder:
+    """Appends the samples received by an Input to a file
+
+    :param input: The :class:`Input` whose samples are recorded
+    :param str path: The file to create. If it exists, it is overwritten.
+    :param int segment_size: The file grows by this many bytes at a time
+    :param int index_interval: The number of records between entries in the time index
+    """
+
+    def __init__( # pylint: disable=redefined-builtin
+            self, input, path, segment_size=DEFAULT_SEGMENT_SIZE,
+            index_interval=DEFAULT_INDEX_INTERVAL):
+        if segment_size < len(_MAGIC) or index_interval < 1:
+            raise ValueError("segment_size and index_interval must be positive")
+        self.input = input
+        self.path = path
+        self._segment_size = segment_size
+        self._index_interval = index_interval
+        self._file = open(path, "w+b")
+        self._index_file = open(_index_path(path), "wb")
+        self._file.truncate(segment_size)
+        self._map = mmap.mmap(self._file.fileno(), segment_size)
+        self._map[0:len(_MAGIC)] = _MAGIC
+        self._position = len(_MAGIC)
+        self._count = 0
+
+    @property
+    def count(self):
+        """The number of samples recorded so far"""
+        return self._count
+
+    def _reserve(self, length):
+        """Grows the file if the next record, with this length, doesn't fit"""
+
+        # A record of length 0 (the end of the data) must always fit
+        required = self._position + length + _RECORD_HEADER.size
+        if required <= len(self._map):
+            return
+        size = len(self._map)
+        while size < required:
+            size += self._segment_size
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def _append(self, action, source_timestamp, reception_timestamp, identity, data): # pylint: disable=too-many-arguments
+        length = _RECORD_HEADER.size + len(identity) + len(data)
+        self._reserve(length)
+        if self._count % self._index_interval == 0:
+            self._index_file.write(_INDEX_ENTRY.pack(reception_timestamp, self._position))
+        position = self._position
+        _RECORD_HEADER.pack_into(
+            self._map,
+            position,
+            length,
+            action,
+            source_timestamp,
+            reception_timestamp,
+            len(identity))
+        position += _RECORD_HEADER.size
+        self._map[position:position + len(identity)] = identity
+        position += len(identity)
+        self._map[position:position + len(data)] = data
+        self._position = position + len(data)
+        self._count += 1
+
+    def record(self, new_only=False):
+        """Appends the samples held by the Input
+
+        Call this method after :meth:`Input.take()` or :meth:`Input.read()`.
+        It records the samples with valid data and the samples that indicate
+        that an instance has been disposed or unregistered.
+
+        :param bool new_only: Whether to skip the samples that had already been read (whose ``sample_state`` is ``"READ"``). Use it when the application calls :meth:`Input.read()` to record each sample only once.
+        :return: The number of samples recorded
+        """
+
+        input = self.input # pylint: disable=redefined-builtin
+        connector = input.connector.native
+        input_name = rti.tocstring(input.name)
+        get_json_from_infos = rti.connector_binding.get_json_from_infos
+        get_timestamp = input._get_timestamp_function()
+        identity_name = rti.tocstring("sample_identity")
+        native_json_str = ctypes.c_char_p()
+        native_json_str_ref = ctypes.byref(native_json_str)
+        first_index = input._read_state.index_offset + 1
+
+        count = 0
+        for index in range(input._get_sample_count()):
+            if new_only and input._get_info(index, "sample_state") != "NOT_READ":
+                continue
+            if input._is_valid(index):
+                action = _WRITE
+            else:
+                action = _INSTANCE_STATE_ACTIONS.get(
+                    input._get_info(index, "instance_state"))
+                if action is None:
+                    continue
+
+            native_sample_json = input.samples._get_native_json(index)
+            if native_sample_json is None:
+                continue
+            data = rti._move_native_bytes(native_sample_json)
+            rti._check_retcode(get_json_from_infos(
+                connector, input_name, index + first_index, identity_name, native_json_str_ref))
+            identity = rti._move_native_bytes(native_json_str)
+            source_timestamp = get_timestamp(index, "source_timestamp")
+            reception_timestamp = get_timestamp(index, "reception_timestamp")
+            self._append(
+                action,
+                _NO_TIMESTAMP if source_timestamp is None else source_timestamp,
+                _NO_TIMESTAMP if reception_timestamp is None else reception_timestamp,
+                identity,
+                data)
+            count += 1
+        return count
+
+    def flush(self):
+        """Writes the recorded samples to disk"""
+        self._map.flush()
+        self._index_file.flush()
+
+    def close(self):
+        """Closes the file, which is truncated to the size of the data"""
+        if self._map is None:
+            return
+        self._map.close()
+        self._map = None
+        self._file.truncate(self._position)
+        self._file.close()
+        self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class Replayer:
+    """Writes the samples recorded by a :class:`Recorder`
+
+    :param output: The :class:`Output` that writes the samples. Its type must be compatible with the type of the recorded samples.
+    :param str path: The file created by the ``Recorder``
+    :param speed: The speed of the replay relative to the original timing (based on the reception timestamps), for example ``2.0`` to replay twice as fast; or ``None`` to write the samples as fast as possible. By default, ``1.0``.
+    """
+
+    def __init__(self, output, path, speed=1.0):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None")
+        self.output = output
+        self.path = path
+        self.speed = speed
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[0:len(_MAGIC)] != _MAGIC:
+            self.close()
+            raise ValueError("{0} is not a recording".format(path))
+        self._index = self._load_index()
+
+    def _load_index(self):
+        """Returns the list of (reception_timestamp, offset) index entries"""
+
+        try:
+            with open(_index_path(self.path), "rb") as index_file:
+                index_data = index_file.read()
+        except (IOError, OSError):
+            return []
+        entry_count = len(index_data) // _INDEX_ENTRY.size
+        return [_INDEX_ENTRY.unpack_from(index_data, entry * _INDEX_ENTRY.size)
+                for entry in range(entry_count)]
+
+    def _find_start(self, start_time):
+        """Returns the offset of a record at or before the first record
+        received at start_time"""
+
+        if start_time is None or not self._index:
+            return len(_MAGIC)
+        position = bisect.bisect_right(self._index, (start_time, 0))
+        if position == 0:
+            return len(_MAGIC)
+        return self._index[position - 1][1]
+
+    def records(self, start_time=None, end_time=None):
+        """Iterates over the recorded samples
+
+        Each record is a tuple ``(action, source_timestamp,
+        reception_timestamp, identity, data)``, where ``action`` is
+        ``"write"``, ``"dispose"`` or ``"unregister"``, the timestamps are
+        integers in nanoseconds (``-1`` if not available) and ``identity`` and
+        ``data`` are the JSON representation of the sample identity and the
+        sample as ``bytes``.
+
+        :param int start_time: (Optional) Skip the samples received before this time, in nanoseconds
+        :param int end_time: (Optional) Stop at the first sample received after this time, in nanoseconds
+        """
+
+        for record in self._read_records(start_time, end_time):
+            yield (_ACTIONS[record[0]],) + record[1:]
+
+    def _read_records(self, start_time, end_time):
+        recording = self._map
+        size = len(recording)
+        position = self._find_start(start_time)
+        header_size = _RECORD_HEADER.size
+        unpack_header = _RECORD_HEADER.unpack_from
+        while position + header_size <= size:
+            length, action, source_timestamp, reception_timestamp, identity_length = \
+                unpack_header(recording, position)
+            if length == 0:
+                # The rest of a file that wasn't closed
+                break
+            if end_time is not None and reception_timestamp > end_time:
+                break
+            if start_time is None or reception_timestamp >= start_time:
+                identity_start = position + header_size
+                data_start = identity_start + identity_length
+                yield (
+                    action,
+                    source_timestamp,
+                    reception_timestamp,
+                    recording[identity_start:data_start],
+                    recording[data_start:position + length])
+            position += length
+
+    def replay(self, start_time=None, end_time=None):
+        """Writes the recorded samples with the Output
+
+        Each sample is written with its original ``source_timestamp`` and, for
+        the samples that disposed or unregistered an instance, the same
+        ``action``. With a ``speed``, this method waits between writes to
+        reproduce the intervals between the reception timestamps.
+
+        :param int start_time: (Optional) Skip the samples received before this time, in nanoseconds
+        :param int end_time: (Optional) Stop at the first sample received after this time, in nanoseconds
+        :return: A :class:`WriteSummary`
+        """
+
+        output = self.output
+        connector = output.connector.native
+        output_name = rti.tocstring(output.name)
+        binding = rti.connector_binding
+        clear, set_json_instance, write = binding.clear, binding.set_json_instance, binding.write
+        check_retcode = rti._check_retcode
+        speed = self.speed
+        params_formats = [
+            '{{"action":"{0}","source_timestamp":%d}}'.format(action).encode("ascii")
+            for action in _ACTIONS]
+        default_params = [
+            '{{"action":"{0}"}}'.format(action).encode("ascii") for action in _ACTIONS]
+
+        count = 0
+        first_reception_timestamp = None
+        start = rti._perf_counter()
+        try:
+            for action, source_timestamp, reception_timestamp, _, data in \
+                    self._read_records(start_time, end_time):
+                if speed is not None and reception_timestamp != _NO_TIMESTAMP:
+                    if first_reception_timestamp is None:
+                        first_reception_timestamp = reception_timestamp
+                    delay = (reception_timestamp - first_reception_timestamp) / 1e9 / speed \
+                        - (rti._perf_counter() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+                check_retcode(clear(connector, output_name))
+                check_retcode(set_json_instance(connector, output_name, data))
+                if source_timestamp == _NO_TIMESTAMP:
+                    params = default_params[action]
+                else:
+                    params = params_formats[action] % source_timestamp
+                check_retcode(write(connector, output_name, params))
+                count += 1
+        except rti.TimeoutError as error:
+            error.samples_written = count
+            raise
+        return rti.WriteSummary(count, rti._perf_counter() - start)
+
+    def close(self):
+        """Closes the file"""
+        if self._map is None:
+            return
+        self._map.close()
+        self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
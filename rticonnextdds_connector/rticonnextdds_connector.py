@@ -16,16 +16,47 @@ The entry point is the class :class:`Connector`, which creates :class:`Input`
 and :class:`Output` objects.
 """
 
+import array
 import ctypes
 import os
 import sys
-import platform
 import json
-import pkg_resources
+import time
+import threading
+from collections import deque, namedtuple, OrderedDict
 from contextlib import contextmanager
 from numbers import Number
 from ctypes import * # pylint: disable=unused-wildcard-import, wildcard-import, ungrouped-imports
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping # pylint: disable=deprecated-class
+try:
+    from types import MappingProxyType as _read_only_mapping
+except ImportError:
+    class _read_only_mapping(Mapping): # pylint: disable=invalid-name
+        """A read-only view of a mapping, like Python 3's MappingProxyType"""
+
+        def __init__(self, mapping):
+            self._mapping = mapping
+
+        def __getitem__(self, key):
+            return self._mapping[key]
+
+        def __iter__(self):
+            return iter(self._mapping)
+
+        def __len__(self):
+            return len(self._mapping)
+
+        def __repr__(self):
+            return repr(self._mapping)
+try:
+    from queue import Full as QueueFull
+except ImportError:
+    from Queue import Full as QueueFull # pylint: disable=import-error
+
 # pylint: disable=too-many-lines
 # pylint: disable=line-too-long
 # pylint: disable=too-few-public-methods
@@ -51,6 +82,99 @@ if sys.version_info[0] == 3:
     tocstring = _tocstring3
     fromcstring = _fromcstring3
 
+class JsonCodec:
+    """A JSON encoder and decoder used by *Connector* to convert dictionaries
+
+    See :func:`set_json_codec`.
+
+    :param str name: A name that identifies this codec
+    :param encode: A function that receives a Python object and returns its UTF-8 encoded JSON representation as ``bytes``
+    :param decode: A function that receives a UTF-8 encoded JSON string as ``bytes`` and returns the Python object. It must raise ``ValueError`` if the string is not valid JSON.
+    """
+
+    def __init__(self, name, encode, decode):
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+
+    def __repr__(self):
+        return "JsonCodec(" + repr(self.name) + ")"
+
+def _create_json_codec():
+    dumps = json.dumps
+    if sys.version_info[0] == 3:
+        return JsonCodec("json", lambda value: dumps(value).encode('utf8'), json.loads)
+    return JsonCodec("json", dumps, json.loads)
+
+def _create_orjson_codec():
+    import orjson # pylint: disable=import-outside-toplevel, import-error
+    return JsonCodec("orjson", orjson.dumps, orjson.loads)
+
+def _create_ujson_codec():
+    import ujson # pylint: disable=import-outside-toplevel, import-error
+    dumps = ujson.dumps
+    return JsonCodec("ujson", lambda value: dumps(value).encode('utf8'), ujson.loads)
+
+def _create_simdjson_codec():
+    import simdjson # pylint: disable=import-outside-toplevel, import-error
+    return JsonCodec("simdjson", _create_json_codec().encode, simdjson.loads)
+
+_JSON_CODECS = {
+    "json": _create_json_codec,
+    "orjson": _create_orjson_codec,
+    "ujson": _create_ujson_codec,
+    "simdjson": _create_simdjson_codec
+}
+
+_json_codec = _create_json_codec() # pylint: disable=invalid-name
+
+def set_json_codec(codec):
+    """Selects the JSON codec used to convert dictionaries
+
+    *Connector* exchanges complex values with the native library as JSON
+    strings, for example in :meth:`Instance.set_dictionary`,
+    :meth:`SampleIterator.get_dictionary` or :meth:`Output.write`. By default
+    it uses Python's ``json`` module. This function allows selecting a faster
+    implementation, if it is installed: ``"orjson"``, ``"ujson"`` or
+    ``"simdjson"`` (which only provides decoding). It also accepts a
+    :class:`JsonCodec`.
+
+    The codec can also be selected with the environment variable
+    ``RTI_CONNECTOR_JSON_CODEC``.
+
+    Note that different codecs may represent some values differently, for
+    example ``NaN`` or integers that don't fit in 64 bits.
+
+    :param codec: The name of the codec (``"json"``, ``"orjson"``, ``"ujson"``, ``"simdjson"``) or a :class:`JsonCodec`.
+    """
+
+    global _json_codec # pylint: disable=global-statement, invalid-name
+    if isinstance(codec, JsonCodec):
+        _json_codec = codec
+    elif codec in _JSON_CODECS:
+        _json_codec = _JSON_CODECS[codec]()
+    else:
+        raise ValueError("Unknown JSON codec: " + str(codec))
+
+def get_json_codec():
+    """Returns the :class:`JsonCodec` currently in use (see :func:`set_json_codec`)"""
+    return _json_codec
+
+if os.environ.get("RTI_CONNECTOR_JSON_CODEC"):
+    try:
+        set_json_codec(os.environ["RTI_CONNECTOR_JSON_CODEC"])
+    except (ImportError, ValueError) as codec_error:
+        print("Warning: error loading JSON codec: " + str(codec_error))
+
+# time.perf_counter is not available in Python 2
+_perf_counter = getattr(time, "perf_counter", time.time) # pylint: disable=invalid-name
+
+if hasattr(time, "perf_counter_ns"):
+    _perf_counter_ns = time.perf_counter_ns # pylint: disable=invalid-name, no-member
+else:
+    def _perf_counter_ns():
+        return int(_perf_counter() * 1e9)
+
 def _move_native_string(native_str):
     """Copies a natively-allocated string into a python string and returns the
     native memory"""
@@ -58,6 +182,13 @@ def _move_native_string(native_str):
     connector_binding.free_string(native_str)
     return python_str
 
+def _move_native_bytes(native_str):
+    """Copies a natively-allocated string into a bytes object without decoding
+    it and returns the native memory"""
+    python_bytes = cast(native_str, c_char_p).value
+    connector_binding.free_string(native_str)
+    return python_bytes
+
 class Error(Exception):
     """An error in the *RTIConnext DDS Core*"""
     def __init__(self, message):
@@ -65,9 +196,14 @@ class Error(Exception):
 
 # pylint: disable=redefined-builtin
 class TimeoutError(Error):
-    """A timeout error in operations that can block"""
-    def __init__(self):
+    """A timeout error in operations that can block
+
+    Attributes:
+        * ``samples_written`` (int): When raised by :meth:`Output.write_many`, the number of samples written before the timeout. Otherwise ``None``.
+    """
+    def __init__(self, samples_written=None):
         Error.__init__(self, "DDS Timeout Error")
+        self.samples_written = samples_written
 
 def _get_last_dds_error_message():
     error_msg = connector_binding.get_last_error_message()
@@ -100,74 +236,211 @@ class _AnyValueKind:
     connector_boolean = 2
     connector_string = 3
 
-# pylint: disable=too-many-instance-attributes
-class _ConnectorBinding:
-    def __init__(self): # pylint: disable=too-many-statements
-        (bits, _) = platform.architecture()
-        osname = platform.system()
-        machine = platform.uname()[4]
-        additional_lib = None
-        is_windows = False
+# Definition of this class must match the DDS_TCKind enum in the DDS C API
+class _TypeCodeKind:
+    tk_null = 0
+    tk_short = 1
+    tk_long = 2
+    tk_ushort = 3
+    tk_ulong = 4
+    tk_float = 5
+    tk_double = 6
+    tk_boolean = 7
+    tk_char = 8
+    tk_octet = 9
+    tk_struct = 10
+    tk_union = 11
+    tk_enum = 12
+    tk_string = 13
+    tk_sequence = 14
+    tk_array = 15
+    tk_alias = 16
+    tk_longlong = 17
+    tk_ulonglong = 18
+    tk_longdouble = 19
+    tk_wchar = 20
+    tk_wstring = 21
+    tk_value = 22
+
+# Definition of this class must match DDS_DynamicDataMemberInfo in the DDS C API
+class _DynamicDataMemberInfo(ctypes.Structure):
+    _fields_ = [
+        ("member_id", ctypes.c_int32),
+        ("member_name", ctypes.c_char_p),
+        ("member_exists", ctypes.c_ubyte),
+        ("member_kind", ctypes.c_int),
+        ("representation_count", ctypes.c_uint32),
+        ("element_count", ctypes.c_uint32),
+        ("element_kind", ctypes.c_int)]
+
+# Python 2's array module doesn't have the 'q' and 'Q' typecodes; 'l' and 'L'
+# have the same size on the LP64 platforms where it's supported
+try:
+    array.array('q')
+    _INT64_TYPECODE, _UINT64_TYPECODE = 'q', 'Q'
+except ValueError:
+    _INT64_TYPECODE, _UINT64_TYPECODE = 'l', 'L'
+
+# Maps the element kind of a sequence or array to the name used by the
+# DDS_DynamicData_<op>_<name>_array functions and the array module typecode
+# with the same representation
+_ARRAY_ELEMENT_KINDS = {
+    _TypeCodeKind.tk_octet: ('octet', 'B'),
+    _TypeCodeKind.tk_boolean: ('boolean', 'B'),
+    _TypeCodeKind.tk_short: ('short', 'h'),
+    _TypeCodeKind.tk_ushort: ('ushort', 'H'),
+    _TypeCodeKind.tk_long: ('long', 'i'),
+    _TypeCodeKind.tk_ulong: ('ulong', 'I'),
+    _TypeCodeKind.tk_longlong: ('longlong', _INT64_TYPECODE),
+    _TypeCodeKind.tk_ulonglong: ('ulonglong', _UINT64_TYPECODE),
+    _TypeCodeKind.tk_float: ('float', 'f'),
+    _TypeCodeKind.tk_double: ('double', 'd')
+}
+
+# Maps the kind of a buffer element (from its struct-module format character)
+# and its size to the name used by the DDS_DynamicData_<op>_<name>_array functions
+_ARRAY_FORMAT_KINDS = {
+    'b': 'int', 'h': 'int', 'i': 'int', 'l': 'int', 'q': 'int', 'n': 'int',
+    'B': 'uint', 'H': 'uint', 'I': 'uint', 'L': 'uint', 'Q': 'uint', 'N': 'uint',
+    'c': 'uint', 'f': 'float', 'd': 'float', '?': 'bool'
+}
+
+_ARRAY_ELEMENT_TYPES = {
+    ('int', 1): 'octet',
+    ('uint', 1): 'octet',
+    ('int', 2): 'short',
+    ('uint', 2): 'ushort',
+    ('int', 4): 'long',
+    ('uint', 4): 'ulong',
+    ('int', 8): 'longlong',
+    ('uint', 8): 'ulonglong',
+    ('float', 4): 'float',
+    ('float', 8): 'double',
+    ('bool', 1): 'boolean'
+}
+
+# The attributes of a memoryview used by set_array and get_array
+_BufferView = namedtuple("_BufferView", "format itemsize nbytes readonly c_contiguous")
+
+def _get_buffer_view(data):
+    """Returns a memoryview of data or, on Python 2, an equivalent _BufferView:
+    there, memoryview doesn't have nbytes or c_contiguous and array.array only
+    supports the old buffer protocol"""
 
-        if "Linux" in osname:
-            # "Linux" can be ARMv7, ARMv8 or x64
-            if "64" in bits:
-                # ARMv8 can have the following strings returned by uname:
-                # aarch64, aarch64_be, armv8b, armv8l
-                # We want to match any of them
-                if "aarch64" in machine or "armv8" in machine:
-                    # ARMv8
-                    directory = "linux-arm64"
-                else:
-                    # x64
-                    directory = "linux-x64"
-            elif "arm" in machine:
-                # ARMv7
-                directory = "linux-arm"
-            else:
-                # (Unsupported) Linux 32 bit, allows user to manually swap libs
-                # for 32-bit version
-                directory = "linux-x64"
-            # All of the above variants have the same libname.post
-            libname = "librtiddsconnector"
-            post = "so"
-        elif "Darwin" in osname:
-            directory = "osx-x64"
-            libname = "librtiddsconnector"
-            post = "dylib"
-        elif "Windows" in osname:
-            directory = "win-x64"
-            libname = "rtiddsconnector"
-            post = "dll"
-            additional_lib = "vcruntime140.dll"
-            is_windows = True
-        else:
-            raise RuntimeError("This platform ({0}) is not supported".format(osname))
+    try:
+        view = memoryview(data)
+    except TypeError:
+        if isinstance(data, array.array):
+            return _BufferView(
+                data.typecode, data.itemsize, len(data) * data.itemsize, False, True)
+        raise TypeError("'{0}' does not support the buffer protocol"\
+            .format(type(data).__name__))
+    if hasattr(view, "nbytes"):
+        return view
+    nbytes = view.itemsize
+    for dimension in view.shape or ():
+        nbytes *= dimension
+    return _BufferView(
+        view.format, view.itemsize, nbytes, view.readonly,
+        getattr(view, "c_contiguous", True))
+
+def _get_array_element_type(view):
+    """Returns the DynamicData primitive name for the elements of a memoryview"""
+    element_format = view.format
+    if element_format[:1] in ('@', '='):
+        element_format = element_format[1:]
+    elif element_format[:1] in ('<', '>', '!'):
+        little_endian = element_format[0] == '<'
+        if little_endian != (sys.byteorder == 'little') and view.itemsize > 1:
+            raise ValueError("array elements must be in native byte order")
+        element_format = element_format[1:]
+    element_kind = _ARRAY_FORMAT_KINDS.get(element_format)
+    element_type = _ARRAY_ELEMENT_TYPES.get((element_kind, view.itemsize))
+    if element_type is None:
+        raise TypeError("'{0}' is not a supported array element format"\
+            .format(view.format))
+    return element_type
+
+# The DynamicData member id that indicates that a member is identified by name
+_DYNAMIC_DATA_MEMBER_ID_UNSPECIFIED = 0
+
+def _check_dynamic_data_retcode(retcode, function_name, field_name):
+    if retcode != _ReturnCode.ok:
+        raise Error("DDS Exception: {0} failed for field '{1}' (retcode {2})"\
+            .format(function_name, field_name, retcode))
+
+def _get_member_info(native_sample, field_name):
+    info = _DynamicDataMemberInfo()
+    get_member_info = connector_binding.get_member_info_function()
+    retcode = get_member_info(
+        native_sample,
+        ctypes.byref(info),
+        tocstring(field_name),
+        _DYNAMIC_DATA_MEMBER_ID_UNSPECIFIED)
+    _check_dynamic_data_retcode(retcode, get_member_info.__name__, field_name)
+    return info
+
+# Member kinds that are set and obtained as a number by the field accessors;
+# 64-bit integers are not included because they may not fit in a double
+_NUMERIC_KINDS = frozenset([
+    _TypeCodeKind.tk_short, _TypeCodeKind.tk_long, _TypeCodeKind.tk_ushort,
+    _TypeCodeKind.tk_ulong, _TypeCodeKind.tk_float, _TypeCodeKind.tk_double,
+    _TypeCodeKind.tk_octet, _TypeCodeKind.tk_enum])
+
+_INTEGER_KINDS = frozenset([
+    _TypeCodeKind.tk_short, _TypeCodeKind.tk_long, _TypeCodeKind.tk_ushort,
+    _TypeCodeKind.tk_ulong, _TypeCodeKind.tk_octet, _TypeCodeKind.tk_enum])
+
+_FLOAT_KINDS = frozenset([_TypeCodeKind.tk_float, _TypeCodeKind.tk_double])
+
+# SampleInfo fields that are extracted into int64 columns by Input.take_columns
+_TIMESTAMP_INFO_FIELDS = frozenset(["source_timestamp", "reception_timestamp"])
+
+def _get_member_kind(native_sample, field_name):
+    """Returns the DDS_TCKind of a member, or None if it can't be determined"""
+    try:
+        return _get_member_info(native_sample, field_name).member_kind
+    except Error:
+        return None
 
-        # Connector is not supported on a (non ARM) 32-bit platform
-        # We continue, incase the user has manually replaced the libraries within
-        # the directory which we are going to load.
-        if not "64" in bits and not "arm" in machine:
-            print("Warning: 32-bit {0} not supported".format(osname))
+def _get_array_into(native_sample, field_name, out, element_type=None):
+    """Copies a sequence or array from a DynamicData sample into a buffer and
+    returns the number of elements copied
 
-        path = os.path.dirname(os.path.realpath(__file__))
-        path = os.path.join(path, "..", "rticonnextdds-connector/lib", directory)
+    The element type is obtained from the buffer format unless it is specified.
+    """
 
-        # Load Visual C++ redistributable if available
-        if additional_lib is not None:
-            try:
-                ctypes.cdll.LoadLibrary(os.path.join(path, additional_lib))
-            except OSError:
-                # Don't fail; try to load rtiddsconnector.dll anyway
-                print("Warning: error loading " + additional_lib)
+    view = _get_buffer_view(out)
+    if element_type is None:
+        element_type = _get_array_element_type(view)
+    if view.readonly or not view.c_contiguous:
+        raise ValueError("out must be a writable, C-contiguous buffer")
 
-        # On Windows we need to explicitly load all of the libraries
-        if is_windows:
-            ctypes.CDLL(os.path.join(path, "nddscore.dll"), ctypes.RTLD_GLOBAL)
-            ctypes.CDLL(os.path.join(path, "nddsc.dll"), ctypes.RTLD_GLOBAL)
+    length = ctypes.c_uint32(view.nbytes // view.itemsize)
+    if view.nbytes == 0:
+        buffer = None
+    else:
+        buffer = (ctypes.c_char * view.nbytes).from_buffer(out)
+
+    get_array = connector_binding.get_get_array_function(element_type)
+    retcode = get_array(
+        native_sample,
+        buffer,
+        ctypes.byref(length),
+        tocstring(field_name),
+        _DYNAMIC_DATA_MEMBER_ID_UNSPECIFIED)
+    _check_dynamic_data_retcode(retcode, get_array.__name__, field_name)
+    return length.value
 
-        libname = libname + "." + post
-        self.library = ctypes.CDLL(os.path.join(path, libname), ctypes.RTLD_GLOBAL)
+# pylint: disable=too-many-instance-attributes
+class _ConnectorBinding:
+    def __init__(self): # pylint: disable=too-many-statements
+        if os.environ.get("RTI_CONNECTOR_BACKEND") == "loopback":
+            # Pure-Python implementation of the native library, for testing
+            from ._loopback import LoopbackLibrary # pylint: disable=import-outside-toplevel
+            self.library = LoopbackLibrary()
+        else:
+            self.library = self._load_native_library()
 
         self.new = self.library.RTI_Connector_new
         self.new.restype = ctypes.c_void_p
@@ -331,6 +604,214 @@ class _ConnectorBinding:
         self.get_build_versions.restype = ctypes.c_int
         self.get_build_versions.argtypes = [POINTER(ctypes.c_void_p), POINTER(ctypes.c_void_p)]
 
+        # DDS_DynamicData functions, resolved by get_dynamic_data_function
+        self._dynamic_data_functions = {}
+        self._strlen = None
+
+        # The functions above, which enable_instrumentation() replaces with
+        # an _InstrumentedFunction
+        self._function_names = sorted(
+            name for name, value in vars(self).items()
+            if name != "library" and hasattr(value, "argtypes"))
+        self._call_stats = {}
+        self._call_stats_lock = threading.Lock()
+        self._instrumented = False
+
+    @staticmethod
+    def _load_native_library():
+        import platform # pylint: disable=import-outside-toplevel
+        (bits, _) = platform.architecture()
+        osname = platform.system()
+        machine = platform.uname()[4]
+        additional_lib = None
+        is_windows = False
+
+        if "Linux" in osname:
+            # "Linux" can be ARMv7, ARMv8 or x64
+            if "64" in bits:
+                # ARMv8 can have the following strings returned by uname:
+                # aarch64, aarch64_be, armv8b, armv8l
+                # We want to match any of them
+                if "aarch64" in machine or "armv8" in machine:
+                    # ARMv8
+                    directory = "linux-arm64"
+                else:
+                    # x64
+                    directory = "linux-x64"
+            elif "arm" in machine:
+                # ARMv7
+                directory = "linux-arm"
+            else:
+                # (Unsupported) Linux 32 bit, allows user to manually swap libs
+                # for 32-bit version
+                directory = "linux-x64"
+            # All of the above variants have the same libname.post
+            libname = "librtiddsconnector"
+            post = "so"
+        elif "Darwin" in osname:
+            directory = "osx-x64"
+            libname = "librtiddsconnector"
+            post = "dylib"
+        elif "Windows" in osname:
+            directory = "win-x64"
+            libname = "rtiddsconnector"
+            post = "dll"
+            additional_lib = "vcruntime140.dll"
+            is_windows = True
+        else:
+            raise RuntimeError("This platform ({0}) is not supported".format(osname))
+
+        # Connector is not supported on a (non ARM) 32-bit platform
+        # We continue, incase the user has manually replaced the libraries within
+        # the directory which we are going to load.
+        if not "64" in bits and not "arm" in machine:
+            print("Warning: 32-bit {0} not supported".format(osname))
+
+        path = os.path.dirname(os.path.realpath(__file__))
+        path = os.path.join(path, "..", "rticonnextdds-connector/lib", directory)
+
+        # Load Visual C++ redistributable if available
+        if additional_lib is not None:
+            try:
+                ctypes.cdll.LoadLibrary(os.path.join(path, additional_lib))
+            except OSError:
+                # Don't fail; try to load rtiddsconnector.dll anyway
+                print("Warning: error loading " + additional_lib)
+
+        # On Windows we need to explicitly load all of the libraries
+        if is_windows:
+            ctypes.CDLL(os.path.join(path, "nddscore.dll"), ctypes.RTLD_GLOBAL)
+            ctypes.CDLL(os.path.join(path, "nddsc.dll"), ctypes.RTLD_GLOBAL)
+
+        libname = libname + "." + post
+        return ctypes.CDLL(os.path.join(path, libname), ctypes.RTLD_GLOBAL)
+
+    def strlen(self, native_str):
+        "Returns the length of a natively-allocated string without copying it"
+        if self._strlen is None:
+            import platform # pylint: disable=import-outside-toplevel
+            if "Windows" in platform.system():
+                c_runtime = ctypes.cdll.msvcrt
+            else:
+                c_runtime = ctypes.CDLL(None)
+            self._strlen = c_runtime.strlen
+            self._strlen.restype = ctypes.c_size_t
+            self._strlen.argtypes = [ctypes.c_void_p]
+        return self._strlen(native_str)
+
+    def get_dynamic_data_function(self, name, restype, argtypes):
+        """Returns the DDS function (for example, a DDS_DynamicData or
+        DDS_TypeCode function) with the given name
+
+        These functions are resolved on first use because, unlike the Connector
+        API, they are not exported by the native libraries on every platform.
+        """
+        function = self._dynamic_data_functions.get(name)
+        if function is None:
+            try:
+                function = getattr(self.library, name)
+            except AttributeError:
+                raise Error(name + " is not available in the native libraries")
+            function.restype = restype
+            function.argtypes = argtypes
+            self._dynamic_data_functions[name] = function
+        return function
+
+    def _get_instrumented_dynamic_data_function(self, name, restype, argtypes):
+        function = _ConnectorBinding.get_dynamic_data_function(self, name, restype, argtypes)
+        return self._instrument(name, function)
+
+    def _instrument(self, name, function):
+        if isinstance(function, _InstrumentedFunction):
+            return function
+        stats = self._call_stats.get(name)
+        if stats is None:
+            stats = self._call_stats[name] = _CallStats()
+        return _InstrumentedFunction(
+            name,
+            function,
+            stats,
+            self._call_stats_lock,
+            _JSON_STRING_ARGUMENTS.get(name),
+            self._native_string_size)
+
+    def _native_string_size(self, value):
+        if isinstance(value, bytes):
+            return len(value)
+        # Out-parameters are passed with ctypes.byref()
+        value = getattr(value, "_obj", value)
+        address = cast(value, ctypes.c_void_p).value
+        return 0 if address is None else self.strlen(address)
+
+    def enable_instrumentation(self):
+        """Replaces the native functions with functions that record statistics
+        about each call (see :func:`enable_stats`)"""
+        if self._instrumented:
+            return
+        for name in self._function_names:
+            setattr(self, name, self._instrument(name, getattr(self, name)))
+        # The DDS_DynamicData functions are instrumented as they're requested
+        self.get_dynamic_data_function = self._get_instrumented_dynamic_data_function
+        self._instrumented = True
+
+    def disable_instrumentation(self):
+        """Restores the original native functions"""
+        if not self._instrumented:
+            return
+        for name in self._function_names:
+            setattr(self, name, getattr(self, name).function)
+        del self.get_dynamic_data_function
+        self._instrumented = False
+
+    def get_call_stats(self):
+        "Returns a dictionary with the statistics of each function that has been called"
+        with self._call_stats_lock:
+            return dict(
+                (name, stats.to_dict()) for name, stats in self._call_stats.items()
+                if stats.calls > 0)
+
+    def reset_call_stats(self):
+        "Resets the statistics of all the functions"
+        with self._call_stats_lock:
+            for stats in self._call_stats.values():
+                stats.reset()
+
+    def get_member_info_function(self):
+        """Returns DDS_DynamicData_get_member_info"""
+        return self.get_dynamic_data_function(
+            "DDS_DynamicData_get_member_info",
+            ctypes.c_int,
+            [ctypes.c_void_p, POINTER(_DynamicDataMemberInfo), ctypes.c_char_p, ctypes.c_int32])
+
+    def get_get_array_function(self, element_type):
+        """Returns DDS_DynamicData_get_<element_type>_array"""
+        return self.get_dynamic_data_function(
+            "DDS_DynamicData_get_" + element_type + "_array",
+            ctypes.c_int,
+            [ctypes.c_void_p, ctypes.c_void_p, POINTER(ctypes.c_uint32), ctypes.c_char_p, ctypes.c_int32])
+
+    def get_set_array_function(self, element_type):
+        """Returns DDS_DynamicData_set_<element_type>_array"""
+        return self.get_dynamic_data_function(
+            "DDS_DynamicData_set_" + element_type + "_array",
+            ctypes.c_int,
+            [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int32, ctypes.c_uint32, ctypes.c_void_p])
+
+    def get_type_function(self):
+        """Returns DDS_DynamicData_get_type"""
+        return self.get_dynamic_data_function(
+            "DDS_DynamicData_get_type",
+            ctypes.c_void_p,
+            [ctypes.c_void_p])
+
+    def get_type_code_function(self, name, restype, index_count=0):
+        """Returns DDS_TypeCode_<name>, which receives a TypeCode,
+        index_count indexes and the exception code"""
+        return self.get_dynamic_data_function(
+            "DDS_TypeCode_" + name,
+            restype,
+            [ctypes.c_void_p] + [ctypes.c_uint32] * index_count + [POINTER(ctypes.c_int)])
+
     @staticmethod
     def get_any_value(getter_function, connector, input_name, index, field_name):
         "Calls one of the get_any functions and translates the result from ctypes to python"
@@ -362,18 +843,183 @@ class _ConnectorBinding:
             #  - A json string; we parse it and convert it to a dictionary
             #  - An integer (larger than what number_value can represent precisely)
             #    the same json parser returns the integer
-            python_string = _move_native_string(string_value)
+            python_bytes = _move_native_bytes(string_value)
             try:
-                return json.loads(python_string)
+                return _json_codec.decode(python_bytes)
             except ValueError:
                 # This is the best way we have to detect that this is not a json
                 # string or an integer
-                return python_string
+                return fromcstring(python_bytes)
         else:
             # This shouldn't happen
             raise Error("Unexpected type returned by " + getter_function.__name__)
 
-connector_binding = _ConnectorBinding() # pylint: disable=invalid-name
+# Position of the argument of the native functions that contains a JSON
+# string, to count the bytes sent or received, or "return" if the JSON string
+# is the return value. The get_any functions may also return a string or a
+# large integer as a string.
+_JSON_STRING_ARGUMENTS = {
+    "set_json_instance": 2,
+    "get_json_instance": "return",
+    "get_json_sample": 3,
+    "get_json_member": 4,
+    "get_json_from_infos": 4,
+    "get_any_from_samples": 3,
+    "get_any_from_info": 3
+}
+
+class _CallStats:
+    __slots__ = ["calls", "total_ns", "max_ns", "json_bytes"]
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.json_bytes = 0
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "total_ns": self.total_ns,
+            "max_ns": self.max_ns,
+            "json_bytes": self.json_bytes
+        }
+
+class _InstrumentedFunction:
+    """Calls a native function and records the number of calls, their
+    duration and the size of the JSON strings passed or returned"""
+
+    def __init__(self, name, function, stats, lock, json_argument, string_size): # pylint: disable=too-many-arguments
+        self.__name__ = getattr(function, "__name__", name)
+        self.function = function
+        self.stats = stats
+        self.lock = lock
+        self.json_argument = json_argument
+        self.string_size = string_size
+
+    def __call__(self, *args):
+        start = _perf_counter_ns()
+        result = self.function(*args)
+        duration = _perf_counter_ns() - start
+
+        json_bytes = 0
+        if self.json_argument == "return":
+            json_bytes = self.string_size(result)
+        elif self.json_argument is not None:
+            json_bytes = self.string_size(args[self.json_argument])
+
+        stats = self.stats
+        with self.lock:
+            stats.calls += 1
+            stats.total_ns += duration
+            if duration > stats.max_ns:
+                stats.max_ns = duration
+            stats.json_bytes += json_bytes
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.function, name)
+
+class _LazyConnectorBinding:
+    """Stands for the _ConnectorBinding until the native library is needed
+
+    Loading the native library and binding its functions takes a significant
+    time, so it's deferred until an attribute of the binding is accessed for
+    the first time (for example, when the first Connector is created). Then
+    the connector_binding of this module and of the package are replaced with
+    the actual binding, and this object only forwards the accesses from
+    references obtained before that (for example, with
+    ``from rticonnextdds_connector import connector_binding``).
+    """
+
+    def __getattr__(self, name):
+        return getattr(_get_connector_binding(), name)
+
+    def __setattr__(self, name, value):
+        setattr(_get_connector_binding(), name, value)
+
+    def __delattr__(self, name):
+        delattr(_get_connector_binding(), name)
+
+_loaded_connector_binding = None # pylint: disable=invalid-name
+_connector_binding_lock = threading.Lock()
+_stats_enabled = os.environ.get("RTI_CONNECTOR_STATS") in ("1", "true") # pylint: disable=invalid-name
+
+def _get_connector_binding():
+    """Returns the _ConnectorBinding, creating it the first time"""
+    global connector_binding, _loaded_connector_binding # pylint: disable=global-statement, invalid-name
+    binding = _loaded_connector_binding
+    if binding is not None:
+        return binding
+    with _connector_binding_lock:
+        if _loaded_connector_binding is None:
+            binding = _ConnectorBinding()
+            if _stats_enabled:
+                binding.enable_instrumentation()
+            _loaded_connector_binding = binding
+            connector_binding = binding
+            # The package re-exports connector_binding
+            package = sys.modules.get(__name__.rpartition(".")[0])
+            if isinstance(getattr(package, "connector_binding", None), _LazyConnectorBinding):
+                package.connector_binding = binding
+    return _loaded_connector_binding
+
+connector_binding = _LazyConnectorBinding() # pylint: disable=invalid-name
+
+def enable_stats():
+    """Starts recording statistics about the calls to the native library
+
+    After calling this function, :func:`stats` reports, for each function of
+    the native library that *Connector* calls, the number of calls, their
+    cumulative and maximum duration, and the number of bytes of the JSON
+    strings exchanged with the native library. This allows finding out how
+    much time is spent in the native library and how much in Python.
+
+    The statistics can also be enabled by setting the environment variable
+    ``RTI_CONNECTOR_STATS`` to ``1``.
+
+    When the statistics are not enabled, which is the default, they don't add
+    any overhead.
+    """
+    global _stats_enabled # pylint: disable=global-statement, invalid-name
+    _stats_enabled = True
+    if _loaded_connector_binding is not None:
+        _loaded_connector_binding.enable_instrumentation()
+
+def disable_stats():
+    """Stops recording the statistics enabled by :func:`enable_stats`
+
+    The statistics recorded so far are still available in :func:`stats`.
+    """
+    global _stats_enabled # pylint: disable=global-statement, invalid-name
+    _stats_enabled = False
+    if _loaded_connector_binding is not None:
+        _loaded_connector_binding.disable_instrumentation()
+
+def stats():
+    """Returns the statistics of the calls to the native library
+
+    The statistics are recorded only after calling :func:`enable_stats`. For
+    example::
+
+        rti.enable_stats()
+        output.write()
+        print(rti.stats()["write"])
+        # {'calls': 1, 'total_ns': 15102, 'max_ns': 15102, 'json_bytes': 0}
+
+    :return: A dictionary where the keys are the names of the native functions that have been called (for example ``"write"``, ``"take"`` or ``"set_json_instance"``) and the values are dictionaries with the number of ``calls``, their cumulative duration (``total_ns``) and maximum duration (``max_ns``) in nanoseconds, and the number of bytes of the JSON strings passed to or returned by the function (``json_bytes``).
+    """
+    if _loaded_connector_binding is None:
+        return {}
+    return _loaded_connector_binding.get_call_stats()
+
+def reset_stats():
+    """Resets the statistics returned by :func:`stats`"""
+    if _loaded_connector_binding is not None:
+        _loaded_connector_binding.reset_call_stats()
 
 class _ConnectorOptions(ctypes.Structure):
     _fields_ = [("enable_on_data_event", c_int), ("one_based_sequence_indexing", c_int)]
@@ -445,13 +1091,7 @@ class Samples:
     # Deprecated function
     def getLength(self):
         # pylint: disable=invalid-name, missing-docstring
-        c_value = ctypes.c_double()
-        retcode = connector_binding.get_sample_count(
-            self.input.connector.native,
-            tocstring(self.input.name),
-            ctypes.byref(c_value))
-        _check_retcode(retcode)
-        return int(c_value.value)
+        return self.input._get_sample_count() # pylint: disable=protected-access
 
     # Deprecated function
     def getNumber(self, index, field_name):
@@ -462,7 +1102,7 @@ class Samples:
             raise ValueError("index must be positive")
 
         # Adding 1 to index because the C API was based on Lua where indexes start from 1
-        index = index + 1
+        index = index + 1 + self.input._read_state.index_offset # pylint: disable=protected-access
         c_value = ctypes.c_double()
         retcode = connector_binding.get_number_from_samples(
             self.input.connector.native,
@@ -485,7 +1125,7 @@ class Samples:
         if index < 0:
             raise ValueError("index must be positive")
         #Adding 1 to index because the C API was based on Lua where indexes start from 1
-        index = index + 1
+        index = index + 1 + self.input._read_state.index_offset # pylint: disable=protected-access
 
         c_value = ctypes.c_int()
         retcode = connector_binding.get_boolean_from_samples(
@@ -509,7 +1149,7 @@ class Samples:
         if index < 0:
             raise ValueError("index must be positive")
 
-        index = index + 1
+        index = index + 1 + self.input._read_state.index_offset # pylint: disable=protected-access
         c_value = ctypes.c_char_p()
         retcode = connector_binding.get_string_from_samples(
             self.input.connector.native,
@@ -526,12 +1166,21 @@ class Samples:
     # Deprecated
     def getDictionary(self, index, member_name=None):
         # pylint: disable=invalid-name, missing-docstring
+        native_json_str = self._get_native_json(index, member_name)
+        if native_json_str is None:
+            return None
+        return _json_codec.decode(_move_native_bytes(native_json_str))
+
+    def _get_native_json(self, index, member_name=None):
+        """Returns the natively-allocated JSON string for a sample or one of its
+        members, which must be freed, or None if there is no data"""
+
         if not isinstance(index, int):
             raise ValueError("index must be an integer")
         if index < 0:
             raise ValueError("index must be positive")
         # Adding 1 to index because the C API was based on Lua where indexes start from 1
-        index = index + 1
+        index = index + 1 + self.input._read_state.index_offset # pylint: disable=protected-access
         if member_name is None:
             native_json_str = ctypes.c_char_p()
             retcode = connector_binding.get_json_sample(
@@ -552,13 +1201,13 @@ class Samples:
         _check_retcode(retcode)
         if retcode == _ReturnCode.no_data:
             return None
-        return json.loads(_move_native_string(native_json_str))
+        return native_json_str
 
     # Deprecated
     def getNative(self, index):
         # pylint: disable=invalid-name, missing-docstring
         # Adding 1 to index because the C API was based on Lua where indexes start from 1
-        index = index + 1
+        index = index + 1 + self.input._read_state.index_offset # pylint: disable=protected-access
         dynamic_data_ptr = connector_binding.get_native_sample(
             self.input.connector.native,
             tocstring(self.input.name),
@@ -575,13 +1224,7 @@ class Infos:
     # Deprecated function
     def getLength(self):
         # pylint: disable=invalid-name, missing-docstring
-        c_value = ctypes.c_double()
-        retcode = connector_binding.get_sample_count(
-            self.input.connector.native,
-            tocstring(self.input.name),
-            ctypes.byref(c_value))
-        _check_retcode(retcode)
-        return c_value.value
+        return float(self.input._get_sample_count()) # pylint: disable=protected-access
 
     # Deprecated function
     def isValid(self, index):
@@ -590,8 +1233,11 @@ class Infos:
             raise ValueError("index must be an integer")
         if index < 0:
             raise ValueError("index must be positive")
-        #Adding 1 to index because the C API was based on Lua where indexes start from 1
-        index = index + 1
+        return self.input._is_valid(index) # pylint: disable=protected-access
+
+    def _get_valid_data(self, index):
+        # Adding 1 to index because the C API was based on Lua where indexes start from 1
+        index = index + 1 + self.input._read_state.index_offset # pylint: disable=protected-access
 
         c_value = ctypes.c_int()
         retcode = connector_binding.get_boolean_from_infos(
@@ -639,12 +1285,7 @@ class SampleInfo:
         self.index = index
 
     def __getitem__(self, field_name):
-        return connector_binding.get_any_value(
-            getter_function=connector_binding.get_any_from_info,
-            connector=self.input.connector.native,
-            input_name=self.input.name,
-            index=self.index,
-            field_name=field_name)
+        return self.input._get_info(self.index, field_name) # pylint: disable=protected-access
 
 class SampleIterator:
     """Iterates and provides access to a data sample
@@ -703,7 +1344,7 @@ class SampleIterator:
             getter_function=connector_binding.get_any_from_samples,
             connector=self.input.connector.native,
             input_name=self.input.name,
-            index=self.index,
+            index=self.index + self.input._read_state.index_offset, # pylint: disable=protected-access
             field_name=field_name)
 
     def get_dictionary(self, member_name=None):
@@ -719,6 +1360,59 @@ class SampleIterator:
 
         return self.input.samples.getDictionary(self.index, member_name)
 
+    def get_json_bytes(self, member_name=None):
+        """Gets the JSON representation of this sample as UTF-8 encoded bytes
+
+        This method returns the same data as :meth:`get_dictionary`, but
+        without parsing it. The result can be passed to
+        :meth:`Instance.set_json_bytes` to forward the sample, or stored as is.
+
+        :param str member_name: (Optional) The name of a complex member, as in :meth:`get_dictionary`.
+        :return: The JSON string as ``bytes``, or ``None`` if the member is an unset optional member.
+        """
+
+        native_json_str = self.input.samples._get_native_json(self.index, member_name) # pylint: disable=protected-access
+        if native_json_str is None:
+            return None
+        return _move_native_bytes(native_json_str)
+
+    @contextmanager
+    def json_buffer(self, member_name=None):
+        """A context manager that provides the JSON representation of this
+        sample without copying it
+
+        It yields a ``memoryview`` of the UTF-8 encoded JSON string allocated
+        by the native library, which can be written to a file or socket
+        directly. The memory is released when the ``with`` block exits::
+
+            with sample.json_buffer() as json_buffer:
+                my_file.write(json_buffer)
+
+        On Python 2 the ``memoryview`` is of a copy of the string.
+
+        :param str member_name: (Optional) The name of a complex member, as in :meth:`get_dictionary`.
+        """
+
+        native_json_str = self.input.samples._get_native_json(self.index, member_name) # pylint: disable=protected-access
+        if native_json_str is None:
+            yield None
+            return
+        try:
+            address = ctypes.cast(native_json_str, ctypes.c_void_p).value
+            length = connector_binding.strlen(address)
+            if not hasattr(memoryview, "release"):
+                # Python 2's memoryview can't be released or cast, so a view
+                # of the native string would outlive it; provide a copy
+                yield memoryview(ctypes.string_at(address, length))
+                return
+            view = memoryview((ctypes.c_char * length).from_address(address)).cast('B')
+            try:
+                yield view
+            finally:
+                view.release()
+        finally:
+            connector_binding.free_string(native_json_str)
+
     def get_number(self, field_name):
         """Gets the value of a numeric field in this sample
 
@@ -749,6 +1443,77 @@ class SampleIterator:
 
         return self.input.samples.getString(self.index, field_name)
 
+    def get_array(self, field_name, out=None, dtype=None):
+        """Gets the values of a sequence or array of primitive values as a buffer
+
+        The values are copied directly from the sample, without creating a
+        Python list or parsing a JSON string.
+
+        If ``out`` is supplied, it must be a writable, C-contiguous buffer (for
+        example a ``bytearray``, an ``array.array`` or a NumPy array) with
+        enough capacity for all the elements, and with an element format that
+        matches the type of the field (see :meth:`Instance.set_array`). In this
+        case the values are copied into ``out`` and this method returns the
+        number of elements copied.
+
+        Otherwise, this method returns a new buffer with the values. By default,
+        the buffer is an ``array.array`` whose typecode corresponds to the type
+        of the field. ``dtype`` can be an ``array`` typecode, or a NumPy dtype
+        (NumPy is only imported in this case) to obtain a NumPy array::
+
+            pixels = sample.get_array("pixels", dtype=numpy.uint8)
+
+        :param str field_name: The name of a sequence or array of primitive values. See :ref:`Accessing the data`.
+        :param out: (Optional) The buffer where the values are copied.
+        :param dtype: (Optional) The element type of the new buffer, if ``out`` is not supplied.
+        :return: The number of elements copied into ``out``, or a new buffer. If the field is an unset optional member, it returns ``0`` or ``None``, respectively.
+        """
+
+        if field_name is None:
+            raise AttributeError("field_name cannot be None")
+
+        native_sample = self.native
+        info = _get_member_info(native_sample, field_name)
+        if not info.member_exists:
+            return None if out is None else 0
+
+        if out is None:
+            element_type = None
+            if dtype is None:
+                element = _ARRAY_ELEMENT_KINDS.get(info.element_kind)
+                if element is None:
+                    raise TypeError("field '{0}' is not a sequence or array of primitive values"\
+                        .format(field_name))
+                element_type, dtype = element
+            if isinstance(dtype, str) and len(dtype) == 1:
+                result = array.array(dtype, [0]) * info.element_count
+            else:
+                import numpy # pylint: disable=import-outside-toplevel
+                result = numpy.empty(info.element_count, dtype=dtype)
+            _get_array_into(native_sample, field_name, result, element_type)
+            return result
+
+        return _get_array_into(native_sample, field_name, out)
+
+    def view(self, threshold=4):
+        """Returns a read-only dictionary that obtains the values of this sample on demand
+
+        The returned :class:`LazySample` provides the same values as
+        :meth:`get_dictionary()`, but only obtains the members that are
+        accessed. This is more efficient when an application only needs a few
+        members of a large sample. For example::
+
+            for sample in input.samples.valid_data_iter:
+                view = sample.view()
+                if view["color"] == "BLUE":
+                    print(view["x"])
+
+        :param int threshold: The number of different members accessed after which the whole sample is obtained in one call
+        :rtype: :class:`LazySample`
+        """
+
+        return LazySample(self.input, self.index, threshold)
+
     @property
     def native(self):
         "Returns the native pointer to this sample"
@@ -791,50 +1556,1285 @@ class ValidSampleIterator(SampleIterator):
     def next(self):
         return self.__next__()
 
-class Input:
-    """Allows reading data for a Topic
+# Member kinds whose values LazySample converts from the number returned by
+# the native library into an int or bool, as in SampleIterator.get_dictionary
+_LAZY_SAMPLE_INTEGER_KINDS = _INTEGER_KINDS | frozenset([
+    _TypeCodeKind.tk_longlong, _TypeCodeKind.tk_ulonglong])
+# Member kinds that LazySample obtains as strings
+_LAZY_SAMPLE_STRING_KINDS = frozenset([
+    _TypeCodeKind.tk_string, _TypeCodeKind.tk_wstring,
+    _TypeCodeKind.tk_char, _TypeCodeKind.tk_wchar])
+
+class LazySample(Mapping):
+    """A read-only dictionary with the values of a sample that obtains them on demand
+
+    A ``LazySample`` is obtained with :meth:`SampleIterator.view`. It provides
+    the same values as :meth:`SampleIterator.get_dictionary`, but instead of
+    obtaining the whole sample at once, each member is obtained the first
+    time it is accessed and then cached. When the number of different
+    members accessed reaches the ``threshold`` specified in
+    :meth:`SampleIterator.view`, the whole sample is obtained in one call
+    and the rest of the members are obtained from it.
+
+    Besides the names of the members, a ``LazySample`` also accepts the
+    name of a nested field (for example ``view["my_point.x"]``, see
+    :ref:`Accessing the data`).
+
+    Iterating over a ``LazySample`` or obtaining its length requires the
+    whole sample.
+
+    A ``LazySample`` can only be used until the next call to
+    :meth:`Input.read()`, :meth:`Input.take()` or
+    :meth:`Input.return_samples()`; after that, it raises :class:`Error`.
+    """
 
-    To get an input object, use :meth:`Connector.get_input()`.
+    def __init__(self, input, index, threshold): # pylint: disable=redefined-builtin
+        self.input = input
+        self.index = index
+        self.threshold = threshold
+        self._generation = input._read_state.generation # pylint: disable=protected-access
+        self._values = {}
+        self._dictionary = None
+
+    def _check_generation(self):
+        if self.input._read_state.generation != self._generation: # pylint: disable=protected-access
+            raise Error("The sample is no longer available")
+
+    def _get_dictionary(self):
+        if self._dictionary is None:
+            self._dictionary = self.input.samples.getDictionary(self.index)
+            if self._dictionary is None:
+                raise Error("The sample doesn't contain valid data")
+        return self._dictionary
+
+    def __getitem__(self, field_name):
+        self._check_generation()
+        if self._dictionary is not None and field_name in self._dictionary:
+            return self._dictionary[field_name]
+        try:
+            return self._values[field_name]
+        except KeyError:
+            pass
+
+        if len(self._values) + 1 >= self.threshold and self._dictionary is None:
+            dictionary = self._get_dictionary()
+            if field_name in dictionary:
+                return dictionary[field_name]
+
+        # Not a member name, or below the threshold
+        input = self.input # pylint: disable=redefined-builtin
+        kind = input._get_member_kind(self.index, field_name) # pylint: disable=protected-access
+        try:
+            if kind in _LAZY_SAMPLE_STRING_KINDS:
+                # Not get_any_value, which would parse "123" as a number
+                value = input.samples.getString(self.index, field_name)
+            else:
+                value = connector_binding.get_any_value(
+                    getter_function=connector_binding.get_any_from_samples,
+                    connector=input.connector.native,
+                    input_name=input.name,
+                    index=self.index + input._read_state.index_offset, # pylint: disable=protected-access
+                    field_name=field_name)
+        except Error:
+            raise KeyError(field_name)
+        if value is not None:
+            if kind in _LAZY_SAMPLE_INTEGER_KINDS:
+                value = int(value)
+            elif kind == _TypeCodeKind.tk_boolean:
+                value = bool(value)
+            elif isinstance(value, bytes):
+                # Python 2: get_dictionary returns unicode strings
+                value = value.decode("utf8")
+        self._values[field_name] = value
+        return value
+
+    def __iter__(self):
+        self._check_generation()
+        return iter(self._get_dictionary())
+
+    def __len__(self):
+        self._check_generation()
+        return len(self._get_dictionary())
+
+    def __repr__(self):
+        return "LazySample(index={0}, cached={1})".format(
+            self.index,
+            "all" if self._dictionary is not None else sorted(self._values))
+
+class SampleAccessor:
+    """Gets the value of a field of the samples of an :class:`Input`
+
+    A ``SampleAccessor`` is obtained with :meth:`Input.accessor` and is intended
+    for applications that read the same fields at a high rate. ``accessor.get(sample)``
+    returns the same value as ``sample[field_name]``, but the names are encoded
+    only once, and the type of the field is looked up the first time it's used
+    to select the native getter for that type. Until the type can be
+    determined (for example, while the field is an unset optional member),
+    the accessor uses the same path as ``__getitem__``.
 
     Attributes:
-        * ``connector`` (:class:`Connector`): The ``Connector`` that created this ``Input``
-        * ``name`` (str): The name of this ``Output`` (the name used in :meth:`Connector.getOutput`)
-        * ``native``: A native handle that allows accessing additional *Connext DDS* APIs in C.
+        * ``input`` (:class:`Input`): The ``Input`` that created this accessor
+        * ``field_name`` (str): The name of the field. See :ref:`Accessing the data`.
     """
 
-    def __init__(self, connector, name):
-        self.connector = connector
+    def __init__(self, input, field_name):
+        if field_name is None:
+            raise AttributeError("field_name cannot be None")
+        self.input = input
+        self.field_name = field_name
+        self._input_name = tocstring(input.name)
+        self._field_name = tocstring(field_name)
+
+    def get(self, sample):
+        """Gets the value of the field in a sample
+
+        :param sample: A sample of this accessor's ``Input``
+        :type sample: :class:`SampleIterator`
+        :return: The value of the field, or ``None`` if it is an unset optional member
+        """
+
+        kind = _get_member_kind(sample.native, self.field_name)
+        if kind is None:
+            # For example, an unset optional member; a later sample may
+            # determine the kind
+            return self._get_any(sample)
+        if kind in _NUMERIC_KINDS:
+            self.get = self._get_number
+        elif kind == _TypeCodeKind.tk_boolean:
+            self.get = self._get_boolean
+        elif kind == _TypeCodeKind.tk_string:
+            self.get = self._get_string
+        else:
+            self.get = self._get_any
+        return self.get(sample)
+
+    def _get_number(self, sample):
+        c_value = ctypes.c_double()
+        retcode = connector_binding.get_number_from_samples(
+            self.input.connector.native,
+            ctypes.byref(c_value),
+            self._input_name,
+            sample.index + 1 + self.input._read_state.index_offset, # pylint: disable=protected-access
+            self._field_name)
+        _check_retcode(retcode)
+        if retcode == _ReturnCode.no_data:
+            return None
+        return c_value.value
+
+    def _get_boolean(self, sample):
+        c_value = ctypes.c_int()
+        retcode = connector_binding.get_boolean_from_samples(
+            self.input.connector.native,
+            ctypes.byref(c_value),
+            self._input_name,
+            sample.index + 1 + self.input._read_state.index_offset, # pylint: disable=protected-access
+            self._field_name)
+        _check_retcode(retcode)
+        if retcode == _ReturnCode.no_data:
+            return None
+        return c_value.value
+
+    def _get_string(self, sample):
+        c_value = ctypes.c_char_p()
+        retcode = connector_binding.get_string_from_samples(
+            self.input.connector.native,
+            ctypes.byref(c_value),
+            self._input_name,
+            sample.index + 1 + self.input._read_state.index_offset, # pylint: disable=protected-access
+            self._field_name)
+        _check_retcode(retcode)
+        if retcode == _ReturnCode.no_data:
+            return None
+        return _move_native_string(c_value)
+
+    def _get_any(self, sample):
+        return sample[self.field_name]
+
+class Columns(dict):
+    """The values of a batch of samples, organized by field (:meth:`Input.take_columns`)
+
+    A ``Columns`` object is a dictionary where each key is a field name and
+    each value is a column with the value of that field in every sample. The
+    columns are NumPy arrays if NumPy is available, or ``array.array`` otherwise:
+
+    * Integer fields (except 64-bit integers) are int64 columns.
+    * Floating point fields are float64 columns.
+    * Boolean fields are boolean columns (``'B'`` ``array.array`` without NumPy).
+    * Other fields (strings, 64-bit integers, complex members) are lists.
+
+    Samples without valid data and unset optional members get a default value:
+    ``0``, ``NaN`` or ``None`` depending on the type of column.
+
+    Attributes:
+        * ``valid_data``: A boolean column indicating which samples contain valid data
+        * ``info`` (dict): The columns of the requested *SampleInfo* fields. ``"source_timestamp"`` and ``"reception_timestamp"`` are int64 columns.
+        * ``length`` (int): The number of samples
+    """
+
+    def __init__(self, length, valid_data, columns, info):
+        dict.__init__(self, columns)
+        self.length = length
+        self.valid_data = valid_data
+        self.info = info
+
+    def to_pandas(self):
+        """Returns a ``pandas.DataFrame`` with the fields, info and a ``valid_data`` column
+
+        This method requires *pandas*.
+        """
+
+        import pandas # pylint: disable=import-outside-toplevel
+        data = dict(self)
+        data.update(self.info)
+        data["valid_data"] = self.valid_data
+        return pandas.DataFrame({name: list(column) if isinstance(column, array.array) else column
+                                 for name, column in data.items()})
+
+    def to_arrow(self):
+        """Returns a ``pyarrow.RecordBatch`` with the fields, info and a ``valid_data`` column
+
+        This method requires *pyarrow*.
+        """
+
+        import pyarrow # pylint: disable=import-outside-toplevel
+        data = dict(self)
+        data.update(self.info)
+        data["valid_data"] = self.valid_data
+        names = list(data.keys())
+        return pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array(data[name]) for name in names], names=names)
+
+def _to_column(values, typecode):
+    """Converts an array.array column into a NumPy array, if NumPy is available"""
+    try:
+        import numpy # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return values
+    if typecode == 'B':
+        return numpy.frombuffer(values, dtype=numpy.bool_)
+    return numpy.frombuffer(values, dtype=typecode)
+
+# The names of the kinds of TypeInfo, which for primitive types are the
+# names used in the type attribute of the XML <member> tag
+_TYPE_KIND_NAMES = {
+    _TypeCodeKind.tk_short: "short",
+    _TypeCodeKind.tk_long: "long",
+    _TypeCodeKind.tk_ushort: "unsignedShort",
+    _TypeCodeKind.tk_ulong: "unsignedLong",
+    _TypeCodeKind.tk_float: "float",
+    _TypeCodeKind.tk_double: "double",
+    _TypeCodeKind.tk_boolean: "boolean",
+    _TypeCodeKind.tk_char: "char",
+    _TypeCodeKind.tk_octet: "octet",
+    _TypeCodeKind.tk_struct: "struct",
+    _TypeCodeKind.tk_union: "union",
+    _TypeCodeKind.tk_enum: "enum",
+    _TypeCodeKind.tk_string: "string",
+    _TypeCodeKind.tk_sequence: "sequence",
+    _TypeCodeKind.tk_array: "array",
+    _TypeCodeKind.tk_longlong: "longLong",
+    _TypeCodeKind.tk_ulonglong: "unsignedLongLong",
+    _TypeCodeKind.tk_longdouble: "longDouble",
+    _TypeCodeKind.tk_wchar: "wchar",
+    _TypeCodeKind.tk_wstring: "wstring",
+    _TypeCodeKind.tk_value: "struct"
+}
+
+# The XML member types that are aliases of the names above
+_XML_TYPE_KIND_NAMES = {
+    "char8": "char", "char16": "wchar", "byte": "octet", "uint8": "octet",
+    "int8": "octet", "int16": "short", "uint16": "unsignedShort",
+    "int32": "long", "uint32": "unsignedLong", "int64": "longLong",
+    "uint64": "unsignedLongLong", "float32": "float", "float64": "double",
+    "float128": "longDouble"
+}
+
+# Definition of this value must match DDS_NO_EXCEPTION_CODE in the DDS C API
+_DDS_NO_EXCEPTION_CODE = 0
+
+# The length of the TypeCode of an unbounded string or sequence
+_UNBOUNDED_LENGTH = 0x7fffffff
+
+class _Immutable(object):
+    """Base class for the objects that can't be modified after __init__"""
+    __slots__ = []
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'{0}' object is read-only".format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("'{0}' object is read-only".format(type(self).__name__))
+
+    def _set(self, **kwargs):
+        for name, value in kwargs.items():
+            object.__setattr__(self, name, value)
+
+    def _fields(self):
+        return tuple(getattr(self, name) for name in self.__slots__ if not name.startswith("_"))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._fields() == other._fields() # pylint: disable=protected-access
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+class MemberInfo(_Immutable):
+    """Describes a member of a struct or a union (:attr:`TypeInfo.members`)
+
+    Attributes:
+        * ``name`` (str): The name of the member
+        * ``type`` (:class:`TypeInfo`): The type of the member
+        * ``key`` (bool): Whether the member is a key of the struct
+        * ``optional`` (bool): Whether the member is optional
+        * ``labels`` (tuple): For the members of a union, the values of the discriminator that select the member, or ``None`` for the default member
+    """
+
+    __slots__ = ["name", "type", "key", "optional", "labels"]
+
+    def __init__(self, name, type, key=False, optional=False, labels=None): # pylint: disable=redefined-builtin, too-many-arguments
+        self._set(name=name, type=type, key=key, optional=optional, labels=labels)
+
+    def __repr__(self):
+        return "MemberInfo(name={0!r}, type={1!r})".format(self.name, self.type)
+
+class TypeInfo(_Immutable):
+    """Describes a type (:attr:`Input.type_info` and :attr:`Output.type_info`)
+
+    A ``TypeInfo`` and the ``TypeInfo`` of its members, elements, etc. form a
+    tree that describes a type. For example::
+
+        type_info = output.type_info
+        type_info.kind # "struct"
+        type_info.members["color"].key # True
+        type_info.members["color"].type.bound # 128
+        type_info.key_fields # ("color",)
+
+    Attributes:
+        * ``kind`` (str): ``"struct"``, ``"union"``, ``"enum"``, ``"sequence"``, ``"array"`` or, for primitive types, the name used in the type attribute of the ``<member>`` XML tag: ``"boolean"``, ``"char"``, ``"wchar"``, ``"octet"``, ``"short"``, ``"unsignedShort"``, ``"long"``, ``"unsignedLong"``, ``"longLong"``, ``"unsignedLongLong"``, ``"float"``, ``"double"``, ``"longDouble"``, ``"string"`` or ``"wstring"``
+        * ``name`` (str): The fully-qualified name of a struct, union or enum, or else ``None``
+        * ``members``: For structs and unions, a read-only dictionary where the keys are the member names and the values are :class:`MemberInfo`, in order of declaration. A struct includes the members of its base type.
+        * ``element`` (:class:`TypeInfo`): The type of the elements of a sequence or array
+        * ``bound`` (int): The maximum length of a string or sequence, or ``None`` if it is unbounded
+        * ``dimensions`` (tuple): The dimensions of an array
+        * ``enumerators``: For enums, a read-only dictionary where the keys are the enumerator names and the values their ordinals, in order of declaration
+        * ``discriminator`` (:class:`TypeInfo`): The type of the discriminator of a union
+    """
+
+    __slots__ = ["kind", "name", "members", "element", "bound", "dimensions",
+                 "enumerators", "discriminator", "_enumerator_names", "_key_fields"]
+
+    def __init__( # pylint: disable=too-many-arguments
+            self, kind, name=None, members=None, element=None, bound=None,
+            dimensions=None, enumerators=None, discriminator=None):
+        if members is not None:
+            members = _read_only_mapping(OrderedDict((member.name, member) for member in members))
+        enumerator_names = None
+        if enumerators is not None:
+            enumerators = OrderedDict(enumerators)
+            enumerator_names = {}
+            for enumerator_name, ordinal in enumerators.items():
+                enumerator_names.setdefault(ordinal, enumerator_name)
+            enumerators = _read_only_mapping(enumerators)
+        self._set(
+            kind=kind,
+            name=name,
+            members=members,
+            element=element,
+            bound=bound,
+            dimensions=None if dimensions is None else tuple(dimensions),
+            enumerators=enumerators,
+            discriminator=discriminator,
+            _enumerator_names=enumerator_names,
+            _key_fields=None)
+
+    @property
+    def key_fields(self):
+        """The names of the key fields of a struct
+
+        The key members of a struct that has key members are named with the
+        format ``"member.nested_key"``. A struct without key members has no
+        key fields.
+
+        :rtype: tuple
+        """
+        if self._key_fields is None:
+            key_fields = []
+            if self.kind == "struct":
+                for member in self.members.values():
+                    if not member.key:
+                        continue
+                    nested_key_fields = member.type.key_fields
+                    if nested_key_fields:
+                        key_fields.extend(
+                            member.name + "." + field for field in nested_key_fields)
+                    else:
+                        key_fields.append(member.name)
+            self._set(_key_fields=tuple(key_fields))
+        return self._key_fields
+
+    def enumerator(self, ordinal):
+        """Returns the name of the enumerator of an enum with a given ordinal
+
+        :param int ordinal: The ordinal of the enumerator
+        :return: The name of the enumerator, or ``None`` if the enum doesn't have one with that ordinal
+        :rtype: str
+        """
+        if self._enumerator_names is None:
+            raise Error("{0} is not an enum".format(self))
+        return self._enumerator_names.get(ordinal)
+
+    def __repr__(self):
+        if self.name is not None:
+            return "TypeInfo(kind={0!r}, name={1!r})".format(self.kind, self.name)
+        if self.element is not None:
+            return "TypeInfo(kind={0!r}, element={1!r})".format(self.kind, self.element)
+        return "TypeInfo(kind={0!r})".format(self.kind)
+
+class _TypeCodeReader:
+    """Builds the TypeInfo of a native DDS_TypeCode"""
+
+    def __init__(self, type_infos):
+        # The TypeInfo of each named type, shared by the Connector
+        self.type_infos = type_infos
+        self._reading = set()
+
+    def call(self, function_name, restype, type_code, *indexes):
+        function = connector_binding.get_type_code_function(
+            function_name, restype, len(indexes))
+        exception_code = ctypes.c_int()
+        result = function(type_code, *(indexes + (ctypes.byref(exception_code),)))
+        if exception_code.value != _DDS_NO_EXCEPTION_CODE:
+            raise Error("DDS Exception: DDS_TypeCode_{0} failed (exception code {1})"\
+                .format(function_name, exception_code.value))
+        return result
+
+    def read(self, type_code):
+        kind = self.call("kind", ctypes.c_int, type_code)
+        while kind == _TypeCodeKind.tk_alias:
+            type_code = self.call("content_type", ctypes.c_void_p, type_code)
+            kind = self.call("kind", ctypes.c_int, type_code)
+
+        if kind in (_TypeCodeKind.tk_struct, _TypeCodeKind.tk_value,
+                    _TypeCodeKind.tk_union, _TypeCodeKind.tk_enum):
+            name = fromcstring(self.call("name", ctypes.c_char_p, type_code))
+            type_info = self.type_infos.get(name)
+            if type_info is None:
+                if name in self._reading:
+                    raise Error("Recursive type {0} is not supported".format(name))
+                self._reading.add(name)
+                try:
+                    type_info = self._read_named_type(type_code, kind, name)
+                finally:
+                    self._reading.discard(name)
+                self.type_infos[name] = type_info
+            return type_info
+        if kind in (_TypeCodeKind.tk_string, _TypeCodeKind.tk_wstring):
+            return TypeInfo(_TYPE_KIND_NAMES[kind], bound=self._read_bound(type_code))
+        if kind == _TypeCodeKind.tk_sequence:
+            return TypeInfo(
+                "sequence",
+                element=self.read(self.call("content_type", ctypes.c_void_p, type_code)),
+                bound=self._read_bound(type_code))
+        if kind == _TypeCodeKind.tk_array:
+            dimension_count = self.call("array_dimension_count", ctypes.c_uint32, type_code)
+            return TypeInfo(
+                "array",
+                element=self.read(self.call("content_type", ctypes.c_void_p, type_code)),
+                dimensions=[self.call("array_dimension", ctypes.c_uint32, type_code, index)
+                            for index in range(dimension_count)])
+        if kind not in _TYPE_KIND_NAMES:
+            raise Error("Unsupported TypeCode kind {0}".format(kind))
+        return TypeInfo(_TYPE_KIND_NAMES[kind])
+
+    def _read_bound(self, type_code):
+        bound = self.call("length", ctypes.c_uint32, type_code)
+        return None if bound in (0, _UNBOUNDED_LENGTH) else bound
+
+    def _read_named_type(self, type_code, kind, name):
+        member_count = self.call("member_count", ctypes.c_uint32, type_code)
+        member_names = [fromcstring(self.call("member_name", ctypes.c_char_p, type_code, index))
+                        for index in range(member_count)]
+        if kind == _TypeCodeKind.tk_enum:
+            return TypeInfo("enum", name, enumerators=[
+                (member_names[index], self.call("member_ordinal", ctypes.c_int32, type_code, index))
+                for index in range(member_count)])
+
+        members = []
+        if kind == _TypeCodeKind.tk_union:
+            discriminator = self.read(self.call("discriminator_type", ctypes.c_void_p, type_code))
+            default_index = self.call("default_index", ctypes.c_int32, type_code)
+            for index in range(member_count):
+                labels = None
+                if index != default_index:
+                    label_count = self.call("member_label_count", ctypes.c_uint32, type_code, index)
+                    labels = tuple(
+                        self.call("member_label", ctypes.c_int32, type_code, index, label_index)
+                        for label_index in range(label_count))
+                members.append(MemberInfo(
+                    member_names[index],
+                    self.read(self.call("member_type", ctypes.c_void_p, type_code, index)),
+                    labels=labels))
+            return TypeInfo("union", name, members=members, discriminator=discriminator)
+
+        if kind == _TypeCodeKind.tk_value:
+            base_type_code = self.call("concrete_base_type", ctypes.c_void_p, type_code)
+            if base_type_code:
+                members.extend(self.read(base_type_code).members.values())
+        for index in range(member_count):
+            members.append(MemberInfo(
+                member_names[index],
+                self.read(self.call("member_type", ctypes.c_void_p, type_code, index)),
+                key=bool(self.call("is_member_key", ctypes.c_ubyte, type_code, index)),
+                optional=bool(self.call("is_member_optional", ctypes.c_ubyte, type_code, index))))
+        return TypeInfo("struct", name, members=members)
+
+def _split_configuration_url(url):
+    """Returns the file names and XML strings in the url of a Connector"""
+
+    documents = []
+    position = 0
+    while position < len(url):
+        if url.startswith('str://"', position):
+            end = url.find('</dds>"', position)
+            if end < 0:
+                raise Error("Unterminated XML string in url")
+            documents.append(("string", url[position + len('str://"'):end + len('</dds>')]))
+            position = end + len('</dds>"')
+        else:
+            end = len(url)
+            for separator in ";|":
+                separator_position = url.find(separator, position)
+                if 0 <= separator_position < end:
+                    end = separator_position
+            name = url[position:end].strip()
+            if name.startswith("file://"):
+                name = name[len("file://"):]
+            if name:
+                documents.append(("file", name))
+            position = end
+        while position < len(url) and url[position] in ";| \t\r\n":
+            position += 1
+    return documents
+
+def _xml_flag(element, name):
+    return element.get(name, "").strip().lower() in ("true", "1")
+
+class _XmlTypeReader:
+    """Builds the TypeInfo of the types defined in the <types> of the XML
+    configuration of a Connector"""
+
+    def __init__(self, url, type_infos):
+        import xml.etree.ElementTree as ElementTree # pylint: disable=import-outside-toplevel
+        self.type_infos = type_infos
+        self._type_elements = {}
+        # Registered type name -> type name
+        self._registered_types = {}
+        self._reading = set()
+        for source, document in _split_configuration_url(url):
+            try:
+                if source == "file":
+                    root = ElementTree.parse(document).getroot()
+                else:
+                    root = ElementTree.fromstring(document)
+            except (IOError, OSError, ElementTree.ParseError) as error:
+                raise Error("Error loading the XML configuration: " + str(error))
+            for child in root:
+                if child.tag == "types":
+                    self._load_types(child, "")
+            for register_type in root.iter("register_type"):
+                type_ref = register_type.get("type_ref")
+                if type_ref:
+                    self._registered_types[register_type.get("name")] = type_ref
+
+    def _load_types(self, element, scope):
+        for child in element:
+            if child.tag == "module":
+                self._load_types(child, scope + child.get("name") + "::")
+            elif child.tag in ("struct", "valuetype", "union", "enum", "typedef"):
+                self._type_elements[scope + child.get("name")] = (child, scope)
+
+    def read_registered_type(self, registered_type_name):
+        type_name = self._registered_types.get(registered_type_name, registered_type_name)
+        return self.read(type_name)
+
+    def read(self, type_name, scope=""):
+        type_name = type_name.strip()
+        if type_name.startswith("::"):
+            candidates = [type_name[2:]]
+        else:
+            # From the innermost to the outermost module
+            modules = scope.split("::")[:-1]
+            candidates = ["::".join(modules[:count] + [type_name])
+                          for count in range(len(modules), -1, -1)]
+        for candidate in candidates:
+            if candidate in self._type_elements:
+                element, element_scope = self._type_elements[candidate]
+                if element.tag == "typedef":
+                    return self._read_member_type(element, element_scope)
+                type_info = self.type_infos.get(candidate)
+                if type_info is None:
+                    if candidate in self._reading:
+                        raise Error("Recursive type {0} is not supported".format(candidate))
+                    self._reading.add(candidate)
+                    try:
+                        type_info = self._read_named_type(candidate, element, element_scope)
+                    finally:
+                        self._reading.discard(candidate)
+                    self.type_infos[candidate] = type_info
+                return type_info
+        raise Error("Cannot find type {0} in the XML configuration".format(type_name))
+
+    def _read_named_type(self, name, element, scope):
+        if element.tag == "enum":
+            enumerators = []
+            ordinal = 0
+            for enumerator in element.findall("enumerator"):
+                if enumerator.get("value") is not None:
+                    ordinal = int(enumerator.get("value"), 0)
+                enumerators.append((enumerator.get("name"), ordinal))
+                ordinal += 1
+            return TypeInfo("enum", name, enumerators=enumerators)
+
+        if element.tag == "union":
+            discriminator = self._read_member_type(element.find("discriminator"), scope)
+            members = []
+            for case in element.findall("case"):
+                labels = [self._read_label(discriminator, label.get("value"))
+                          for label in case.findall("caseDiscriminator")]
+                member = case.find("member")
+                members.append(MemberInfo(
+                    member.get("name"),
+                    self._read_member_type(member, scope),
+                    labels=None if "default" in labels else tuple(labels)))
+            return TypeInfo("union", name, members=members, discriminator=discriminator)
+
+        members = []
+        base_name = element.get("baseType") or element.get("baseClass")
+        if base_name:
+            members.extend(self.read(base_name, scope).members.values())
+        for member in element.findall("member"):
+            members.append(MemberInfo(
+                member.get("name"),
+                self._read_member_type(member, scope),
+                key=_xml_flag(member, "key"),
+                optional=_xml_flag(member, "optional")))
+        return TypeInfo("struct", name, members=members)
+
+    @staticmethod
+    def _read_label(discriminator, text):
+        text = text.strip()
+        if text.startswith("(") and text.endswith(")"):
+            text = text[1:-1].strip()
+        if text == "default":
+            return text
+        if discriminator.kind == "enum":
+            ordinal = discriminator.enumerators.get(text.split("::")[-1])
+            if ordinal is not None:
+                return ordinal
+        if discriminator.kind == "boolean":
+            return int(text.lower() in ("true", "1"))
+        return int(text, 0)
+
+    def _read_member_type(self, element, scope):
+        xml_type = element.get("type")
+        if xml_type in ("nonBasic", None):
+            type_info = self.read(element.get("nonBasicTypeName", ""), scope)
+        elif xml_type in ("string", "wstring"):
+            # The default maximum length of a string is 255 characters
+            bound = int(element.get("stringMaxLength", "255"))
+            type_info = TypeInfo(xml_type, bound=None if bound < 0 else bound)
+        else:
+            kind = _XML_TYPE_KIND_NAMES.get(xml_type, xml_type)
+            if kind not in _TYPE_KIND_NAMES.values():
+                raise Error("Unknown type {0} in the XML configuration".format(xml_type))
+            type_info = TypeInfo(kind)
+
+        if element.get("arrayDimensions"):
+            type_info = TypeInfo(
+                "array",
+                element=type_info,
+                dimensions=[int(dimension) for dimension in element.get("arrayDimensions").split(",")])
+        if element.get("sequenceMaxLength"):
+            bound = int(element.get("sequenceMaxLength"))
+            type_info = TypeInfo(
+                "sequence", element=type_info, bound=None if bound < 0 else bound)
+        return type_info
+
+def _get_type_info(connector, native_sample, get_topic_description):
+    """Returns the TypeInfo of the type of an Input or Output
+
+    The TypeInfo is obtained from the TypeCode of native_sample, a DynamicData
+    object. If native_sample is None, or if the native libraries don't
+    provide the DDS_TypeCode functions, it's obtained from the XML
+    configuration using the type name of the Topic.
+    """
+
+    # pylint: disable=protected-access
+    if native_sample:
+        try:
+            type_code = connector_binding.get_type_function()(native_sample)
+            if type_code:
+                return _TypeCodeReader(connector._type_infos).read(type_code)
+        except Error:
+            pass
+
+    get_type_name = connector_binding.get_dynamic_data_function(
+        "DDS_TopicDescription_get_type_name", ctypes.c_char_p, [ctypes.c_void_p])
+    type_name = get_type_name(get_topic_description())
+    if not type_name:
+        raise Error("Cannot obtain the type name of the topic")
+    if connector._xml_types is None:
+        connector._xml_types = _XmlTypeReader(connector._url, connector._type_infos)
+    return connector._xml_types.read_registered_type(fromcstring(type_name))
+
+class LatencyHistogram:
+    """A histogram of latencies in nanoseconds (:meth:`Input.enable_latency_tracking`)
+
+    The histogram has a constant relative precision, like an HDR histogram:
+    the values from 0 to ``buckets - 1`` are counted exactly, and each
+    following power-of-two range (for example, from 1024 to 2047) is divided
+    into ``buckets / 2`` buckets of the same width. The percentiles are
+    reported as the highest value that falls in the same bucket, so their
+    relative error is at most ``2 / buckets``.
+
+    Negative latencies, which are possible when the clocks of the publishing
+    and subscribing applications are not synchronized, are recorded as 0.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, buckets=64):
+        if buckets < 2 or buckets & (buckets - 1) != 0:
+            raise ValueError("buckets must be a power of two greater than 1")
+        self.buckets = buckets
+        self._bits = buckets.bit_length() - 1
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Removes all the recorded values"""
+        with self._lock:
+            self._counts = []
+            self._count = 0
+            self._total = 0
+            self._min = None
+            self._max = None
+
+    def _index(self, value):
+        if value < self.buckets:
+            return value
+        shift = value.bit_length() - self._bits
+        half = self.buckets >> 1
+        return self.buckets + (shift - 1) * half + (value >> shift) - half
+
+    def _highest_value(self, index):
+        if index < self.buckets:
+            return index
+        half = self.buckets >> 1
+        shift, offset = divmod(index - self.buckets, half)
+        shift += 1
+        return ((offset + half + 1) << shift) - 1
+
+    def record(self, value):
+        """Records one latency
+
+        :param int value: The latency in nanoseconds
+        """
+        self.record_many((value,))
+
+    def record_many(self, values):
+        """Records several latencies
+
+        :param values: An iterable of latencies in nanoseconds
+        """
+        with self._lock:
+            counts = self._counts
+            for value in values:
+                value = max(0, int(value))
+                index = self._index(value)
+                if index >= len(counts):
+                    counts.extend([0] * (index + 1 - len(counts)))
+                counts[index] += 1
+                self._count += 1
+                self._total += value
+                if self._min is None or value < self._min:
+                    self._min = value
+                if self._max is None or value > self._max:
+                    self._max = value
+
+    @property
+    def count(self):
+        """The number of recorded values"""
+        return self._count
+
+    @property
+    def max(self):
+        """The maximum recorded value, or ``None`` if the histogram is empty"""
+        return self._max
+
+    def percentile(self, percentile):
+        """Returns the value below which a percentage of the values fall
+
+        :param float percentile: The percentage, from 0 to 100
+        :return: The latency in nanoseconds, or ``None`` if the histogram is empty
+        """
+        with self._lock:
+            return self._percentile(percentile)
+
+    def _percentile(self, percentile):
+        if self._count == 0:
+            return None
+        if percentile < 0 or percentile > 100:
+            raise ValueError("percentile must be between 0 and 100")
+        target = max(1, -(-percentile * self._count // 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(self._highest_value(index), self._max)
+        return self._max
+
+    def snapshot(self, reset=False):
+        """Returns a summary of the recorded values
+
+        :param bool reset: Whether to remove the recorded values after obtaining the summary
+        :return: A dictionary with the ``count`` of values and the ``min_ns``, ``max_ns``, ``mean_ns``, ``p50_ns``, ``p90_ns``, ``p99_ns`` and ``p999_ns`` latencies in nanoseconds (``None`` if the histogram is empty)
+        """
+        with self._lock:
+            summary = {
+                "count": self._count,
+                "min_ns": self._min,
+                "max_ns": self._max,
+                "mean_ns": self._total / float(self._count) if self._count else None,
+                "p50_ns": self._percentile(50),
+                "p90_ns": self._percentile(90),
+                "p99_ns": self._percentile(99),
+                "p999_ns": self._percentile(99.9)
+            }
+        if reset:
+            self.reset()
+        return summary
+
+    def __repr__(self):
+        return "LatencyHistogram(count={0}, p50_ns={1}, p99_ns={2}, max_ns={3})".format(
+            self._count, self.percentile(50), self.percentile(99), self._max)
+
+def _to_hashable(value, type_info):
+    """Converts the dictionaries and lists in a value into tuples, with the
+    members of a struct in order of declaration"""
+    if isinstance(value, dict):
+        if type_info is not None and type_info.kind == "struct":
+            return tuple(
+                _to_hashable(value[name], member.type)
+                for name, member in type_info.members.items() if name in value)
+        return tuple(_to_hashable(item, None) for item in value.values())
+    if isinstance(value, list):
+        element = None if type_info is None else type_info.element
+        return tuple(_to_hashable(item, element) for item in value)
+    return value
+
+def _get_key_paths(type_info):
+    """Returns the member names of each key field of a type, and its type"""
+    key_paths = []
+    for field in type_info.key_fields:
+        path = field.split(".")
+        field_type = type_info
+        for name in path:
+            field_type = field_type.members[name].type
+        key_paths.append((path, field_type))
+    return key_paths
+
+def _get_instance_key(key_paths, data):
+    """Returns the key of the instance of a sample, given as a dictionary:
+    the value of its only key field or a tuple with the values of the key
+    fields, as given by _get_key_paths"""
+    key = []
+    for path, field_type in key_paths:
+        value = data
+        for name in path:
+            value = value.get(name) if isinstance(value, dict) else None
+        key.append(_to_hashable(value, field_type))
+    return key[0] if len(key) == 1 else tuple(key)
+
+class InstanceCache:
+    """The last value of each instance received by an Input (:meth:`Input.instance_cache`)
+
+    An ``InstanceCache`` is a read-only dictionary-like table where the keys
+    identify the instances and the values are the last sample received for
+    each instance, as returned by :meth:`SampleIterator.get_dictionary`. For
+    example::
+
+        cache = input.instance_cache()
+        ...
+        input.take()
+        square = cache.get("BLUE") # the last sample with color "BLUE"
+
+    Each key is the value of the key field of the type or, if the type has
+    several key fields, a tuple with their values (in the order of
+    :attr:`TypeInfo.key_fields`). The value of a key field that is a struct or
+    a sequence is converted into a tuple, with the members of a struct in order
+    of declaration. If the type doesn't have key fields, the only key is the
+    empty tuple ``()``.
+
+    The samples are stored as tuples, not as dictionaries; the methods that
+    return a sample create a new dictionary.
+
+    Attributes:
+        * ``key_fields`` (tuple): The names of the key fields that form the keys
+    """
+
+    def __init__(self, type_info):
+        self.key_fields = type_info.key_fields
+        self._key_paths = _get_key_paths(type_info)
+        self._member_names = tuple(type_info.members)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _to_dictionary(self, row):
+        return dict(
+            (name, value) for name, value in zip(self._member_names, row)
+            if value is not None)
+
+    def _update(self, input): # pylint: disable=redefined-builtin
+        """Applies the samples that input has taken or read"""
+
+        # pylint: disable=protected-access
+        changes = []
+        for index in range(input._get_sample_count()):
+            if not input._is_new_sample(index):
+                continue
+            native_json_str = input.samples._get_native_json(index)
+            if native_json_str is None:
+                continue
+            data = _json_codec.decode(_move_native_bytes(native_json_str))
+            if input._get_info(index, "instance_state") != "ALIVE":
+                changes.append((_get_instance_key(self._key_paths, data), None))
+            elif input._is_valid(index):
+                changes.append((
+                    _get_instance_key(self._key_paths, data),
+                    tuple(data.get(name) for name in self._member_names)))
+
+        with self._lock:
+            for key, row in changes:
+                if row is None:
+                    self._values.pop(key, None)
+                else:
+                    self._values[key] = row
+
+    def get(self, key, default=None):
+        """Returns the last sample of an instance
+
+        :param key: The key of the instance
+        :param default: The value to return if there is no such instance
+        :return: A dictionary with the sample, or ``default``
+        """
+        row = self._values.get(key)
+        if row is None:
+            return default
+        return self._to_dictionary(row)
+
+    def __getitem__(self, key):
+        row = self._values[key]
+        return self._to_dictionary(row)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        """Returns a list with the keys of the instances in the cache"""
+        with self._lock:
+            return list(self._values)
+
+    def snapshot(self):
+        """Returns the last sample of every instance
+
+        The snapshot reflects the state of the cache after a complete
+        :meth:`Input.take()` or :meth:`Input.read()`, even if another thread is
+        updating the cache.
+
+        :return: A new dictionary where the keys identify the instances and the values are dictionaries with the last sample of each instance.
+        :rtype: dict
+        """
+        with self._lock:
+            rows = list(self._values.items())
+        return dict((key, self._to_dictionary(row)) for key, row in rows)
+
+    def clear(self):
+        """Removes all the instances from the cache"""
+        with self._lock:
+            self._values.clear()
+
+    def __repr__(self):
+        return "InstanceCache(key_fields={0!r}, instances={1})".format(
+            self.key_fields, len(self))
+
+def _check_batch_size(batch_size):
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be positive")
+
+class _ReadState:
+    """The samples of a DataReader accessible from its Inputs, and the values
+    cached for them"""
+
+    def __init__(self):
+        self.generation = 0
+        # The position in the native loan of the first accessible sample and
+        # the number of samples after the accessible ones that were taken with
+        # batch_size and haven't been made accessible yet (see Input.take())
+        self.index_offset = 0
+        self.pending_count = 0
+        # Whether read() has been called, in which case the samples returned
+        # by take() or read() may have been accounted for already
+        self.may_have_read_samples = False
+        self.reset()
+
+    def reset(self):
+        """Invalidates the values cached for the samples of the previous
+        read/take; called every time the accessible samples change"""
+
+        self.generation += 1
+        self.sample_count = None
+        # Two packed bitmaps with one bit per sample: whether the valid_data
+        # flag of the sample has been fetched, and its value
+        self.valid_data_fetched = None
+        self.valid_data = None
+        self.info_cache = {}
+
+class Input:
+    """Allows reading data for a Topic
+
+    To get an input object, use :meth:`Connector.get_input()`.
+
+    Attributes:
+        * ``connector`` (:class:`Connector`): The ``Connector`` that created this ``Input``
+        * ``name`` (str): The name of this ``Output`` (the name used in :meth:`Connector.getOutput`)
+        * ``native``: A native handle that allows accessing additional *Connext DDS* APIs in C.
+    """
+
+    def __init__(self, connector, name):
+        self.connector = connector
         self.name = name
         self.native = connector_binding.get_reader(self.connector.native, tocstring(self.name))
         _check_entity_creation(self.native, "Input")
         self._samples = Samples(self)
         self.infos = Infos(self)
-
-    def read(self):
+        # Shared with any other Input created for the same DataReader, since
+        # they access the same native samples
+        self._read_state = connector._read_states.setdefault( # pylint: disable=protected-access
+            name, _ReadState())
+        self._latency_histogram = None
+        # The DDS_TCKind of the fields obtained by _get_member_kind
+        self._member_kinds = {}
+        self._type_info = None
+        self._instance_cache = None
+
+    def _get_sample_count(self):
+        if self._read_state.sample_count is None:
+            c_value = ctypes.c_double()
+            retcode = connector_binding.get_sample_count(
+                self.connector.native,
+                tocstring(self.name),
+                ctypes.byref(c_value))
+            _check_retcode(retcode)
+            self._read_state.sample_count = int(c_value.value)
+        return self._read_state.sample_count
+
+    def _is_valid(self, index):
+        state = self._read_state
+        if state.valid_data is None:
+            bitmap_size = (self._get_sample_count() + 7) // 8
+            state.valid_data_fetched = bytearray(bitmap_size)
+            state.valid_data = bytearray(bitmap_size)
+
+        byte, mask = index >> 3, 1 << (index & 7)
+        if byte < len(state.valid_data) and state.valid_data_fetched[byte] & mask:
+            return int(bool(state.valid_data[byte] & mask))
+
+        value = self.infos._get_valid_data(index) # pylint: disable=protected-access
+        if value is not None and byte < len(state.valid_data):
+            state.valid_data_fetched[byte] |= mask
+            if value:
+                state.valid_data[byte] |= mask
+        return value
+
+    def _get_member_kind(self, index, field_name):
+        """Returns the DDS_TCKind of a field of the type of this Input, using
+        the sample at index the first time"""
+        try:
+            return self._member_kinds[field_name]
+        except KeyError:
+            kind = _get_member_kind(self.samples.getNative(index), field_name)
+            if kind is not None:
+                # The kind can't be determined if the field is, or is inside,
+                # an unset optional member
+                self._member_kinds[field_name] = kind
+            return kind
+
+    def _is_new_sample(self, index):
+        """Whether the sample at index hadn't been obtained by a previous read()"""
+        return not self._read_state.may_have_read_samples or \
+            self._get_info(index, "sample_state") == "NOT_READ"
+
+    def _get_info(self, index, field_name):
+        key = (index, field_name)
+        try:
+            return self._read_state.info_cache[key]
+        except KeyError:
+            value = connector_binding.get_any_value(
+                getter_function=connector_binding.get_any_from_info,
+                connector=self.connector.native,
+                input_name=self.name,
+                index=index + self._read_state.index_offset,
+                field_name=field_name)
+            self._read_state.info_cache[key] = value
+            return value
+
+    def read(self, batch_size=None):
         """Access the samples received by this Input
 
         This operation performs the same operation as :meth:`take()` except that
         the samples remain accessible.
+
+        This method can't be called while a :meth:`take()` with
+        ``batch_size`` has batches that haven't been made accessible yet,
+        since those samples are no longer in the *DataReader*; call
+        :meth:`take()` until they have all been accessed.
+
+        :param int batch_size: (Optional) The maximum number of samples made accessible. The first ``batch_size`` samples read are accessible; the rest remain in the *DataReader* and can be read again. By default, all the samples.
+        :raises Error: If batches of a previous :meth:`take()` are pending
         """
 
+        _check_batch_size(batch_size)
+        if self._read_state.pending_count:
+            raise Error(
+                "Cannot read from {0}: {1} samples taken in batches haven't been "
+                "accessed yet; call take() first".format(
+                    self.name, self._read_state.pending_count))
+        self._read_state.reset()
+        self._read_state.index_offset = 0
         _check_retcode(connector_binding.read(self.connector.native, tocstring(self.name)))
+        self._limit_samples(batch_size, False)
+        self._on_new_samples()
+        self._read_state.may_have_read_samples = True
 
-    def take(self):
+    def take(self, batch_size=None):
         """Accesses the sample received by this Input
 
         After calling this method, the samples are accessible from :attr:`samples`
 
+        When ``batch_size`` is specified, the samples are made accessible in
+        batches: only the first ``batch_size`` samples are accessible, and the
+        next calls to :meth:`take()` make the rest accessible, ``batch_size``
+        at a time, before any new sample is taken. This bounds the size of
+        each batch that the application processes::
+
+            input.take(batch_size=500)
+            for sample in input.samples.valid_data_iter:
+                ...
+
+        All the batches come from a single native take, which obtains all the
+        available samples and holds them until the last batch has been
+        returned, so ``batch_size`` doesn't limit the memory used. To limit
+        the samples obtained from the *DataReader* in each take, set
+        ``max_samples_per_read`` in the ``<reader_resource_limits>`` of its
+        QoS. While batches are pending, :meth:`read()` raises an
+        :class:`Error` and :meth:`wait()` returns immediately.
+
+        :param int batch_size: (Optional) The maximum number of samples made accessible. By default, all the samples.
+        """
+
+        _check_batch_size(batch_size)
+        if self._read_state.pending_count:
+            self._next_batch(batch_size)
+        else:
+            self._read_state.reset()
+            self._read_state.index_offset = 0
+            _check_retcode(connector_binding.take(self.connector.native, tocstring(self.name)))
+            self._limit_samples(batch_size, True)
+        self._on_new_samples()
+
+    def _on_new_samples(self):
+        if self._latency_histogram is not None:
+            self._record_latencies()
+        if self._instance_cache is not None:
+            self._instance_cache._update(self) # pylint: disable=protected-access
+
+    def _limit_samples(self, batch_size, keep_pending):
+        """Makes only the first batch_size samples of the native loan
+        accessible; if keep_pending, the rest are made accessible by the next
+        takes"""
+
+        if batch_size is None:
+            return
+        count = self._get_sample_count()
+        if count > batch_size:
+            self._read_state.sample_count = batch_size
+            if keep_pending:
+                self._read_state.pending_count = count - batch_size
+
+    def _next_batch(self, batch_size):
+        """Makes the next pending samples of the native loan accessible"""
+
+        offset = self._read_state.index_offset + self._get_sample_count()
+        pending_count = self._read_state.pending_count
+        count = pending_count if batch_size is None else min(pending_count, batch_size)
+        self._read_state.reset()
+        self._read_state.index_offset = offset
+        self._read_state.sample_count = count
+        self._read_state.pending_count = pending_count - count
+
+    @contextmanager
+    def taken(self, batch_size=None):
+        """Takes samples and returns them when the ``with`` block finishes
+
+        This context manager calls :meth:`take()` and provides :attr:`samples`.
+        On exit, even if an exception is raised, it calls :meth:`return_samples()`,
+        which only releases the native samples after the last batch (see
+        :meth:`take()`)::
+
+            with input.taken(batch_size=500) as samples:
+                for sample in samples.valid_data_iter:
+                    print(sample["x"])
+
+        :param int batch_size: (Optional) The maximum number of samples made accessible. See :meth:`take()`.
+        :rtype: :class:`Samples`
         """
 
-        _check_retcode(connector_binding.take(self.connector.native, tocstring(self.name)))
+        self.take(batch_size)
+        try:
+            yield self.samples
+        finally:
+            self.return_samples()
 
     def return_samples(self):
         """Returns any samples held by this Input
 
         After calling this method, the samples are no longer accessible from :attr:`samples`
 
+        If a :meth:`take()` with ``batch_size`` left batches that haven't
+        been made accessible, this method only makes the current batch
+        inaccessible: the native samples, including the current batch, remain
+        loaned until the last batch is returned, and the rest of the samples
+        are still available to the next :meth:`take()`.
         """
 
+        if self._read_state.pending_count:
+            offset = self._read_state.index_offset + self._get_sample_count()
+            self._read_state.reset()
+            self._read_state.index_offset = offset
+            self._read_state.sample_count = 0
+            return
+
+        self._read_state.reset()
+        self._read_state.index_offset = 0
         _check_retcode(
             connector_binding.return_samples(self.connector.native, tocstring(self.name))
         )
@@ -858,6 +2858,11 @@ class Input:
         this input.
         If the operation times out, it raises :class:`TimeoutError`.
 
+        If a :meth:`take()` with ``batch_size`` left batches that haven't been
+        made accessible yet, this method returns immediately, without
+        checking whether new data has been received, so that the pending
+        batches are taken first.
+
         :param number timeout: The maximum time to wait in milliseconds. By default, infinite.
         :param bool return_samples: Whether to return samples before waiting. By default and for backwards compatibility, ``False``. It is recommended to set it to ``True`` for most scenarios.
         """
@@ -865,9 +2870,358 @@ class Input:
             timeout = -1
         if return_samples:
             self.return_samples()
+        if self._read_state.pending_count:
+            return
         retcode = connector_binding.wait_for_data(self.native, timeout)
         _check_retcode(retcode)
 
+    def wait_async(self, timeout=None):
+        """Returns an awaitable that waits for this input to receive data
+
+        This is the ``asyncio`` version of :meth:`wait()`. For example::
+
+            await input.wait_async(1000)
+            input.take()
+
+        See :mod:`rticonnextdds_connector.aio`. Requires Python 3.6 or newer.
+
+        :param number timeout: The maximum time to wait in milliseconds. By default, infinite.
+        """
+
+        from . import aio # pylint: disable=import-outside-toplevel
+        return aio.wait(self, timeout)
+
+    def stream(self, take=True):
+        """Returns an asynchronous iterator over the data received by this input
+
+        Each iteration waits for data, calls :meth:`take()` (or :meth:`read()`
+        if ``take`` is ``False``) and produces :attr:`samples`::
+
+            async for samples in input.stream():
+                for sample in samples.valid_data_iter:
+                    print(sample.get_dictionary())
+
+        See :func:`rticonnextdds_connector.aio.stream`. Requires Python 3.6 or newer.
+
+        :param bool take: Whether to take or read the samples
+        """
+
+        from . import aio # pylint: disable=import-outside-toplevel
+        return aio.stream(self, take)
+
+    def prefetch(self, depth=2, decode="dict", fields=None, info=None):
+        """Creates a :class:`Prefetcher` that takes and decodes the samples in a background thread
+
+        For example::
+
+            with input.prefetch(depth=2, decode="columns", fields=["x", "y"]) as prefetcher:
+                for columns in prefetcher:
+                    print(columns["x"].sum())
+
+        :param int depth: The maximum number of decoded batches waiting to be obtained
+        :param str decode: The format of the batches: ``"dict"`` (default), ``"json"`` or ``"columns"``. See :class:`Prefetcher`.
+        :param fields: The names of the fields to extract when ``decode`` is ``"columns"``. See :meth:`take_columns()`.
+        :param info: (Optional) The names of the *SampleInfo* fields to extract when ``decode`` is ``"columns"``
+        :rtype: :class:`Prefetcher`
+        """
+
+        return Prefetcher(self, depth, decode, fields, info)
+
+    def enable_latency_tracking(self, buckets=64):
+        """Starts recording the latency of the samples received by this Input
+
+        After calling this method, every :meth:`take()` or :meth:`read()`
+        records in a :class:`LatencyHistogram` the difference between the
+        ``reception_timestamp`` and the ``source_timestamp`` (see
+        :attr:`SampleIterator.info`) of each sample that hadn't been read
+        before. For example::
+
+            histogram = input.enable_latency_tracking()
+            ...
+            input.take()
+            ...
+            print(histogram.snapshot(reset=True)["p99_ns"])
+
+        The source timestamp is set by the publishing application; the latency
+        is only meaningful if the clocks of both applications are synchronized.
+
+        If latency tracking is already enabled, this method returns the
+        current histogram.
+
+        :param int buckets: The precision of the histogram (see :class:`LatencyHistogram`)
+        :return: The histogram, also available in :attr:`latency_histogram`
+        :rtype: :class:`LatencyHistogram`
+        """
+
+        if self._latency_histogram is None:
+            self._latency_histogram = LatencyHistogram(buckets)
+        return self._latency_histogram
+
+    def disable_latency_tracking(self):
+        """Stops recording the latency of the samples (see :meth:`enable_latency_tracking`)"""
+        self._latency_histogram = None
+
+    @property
+    def latency_histogram(self):
+        """The :class:`LatencyHistogram` of this Input, or ``None`` if latency tracking is disabled"""
+        return self._latency_histogram
+
+    def _get_info_function(self):
+        """Returns a function that obtains a field of the SampleInfo of a
+        sample, given its index and the field name, with the same value that
+        _get_info() caches"""
+
+        connector = self.connector.native
+        input_name = tocstring(self.name)
+        get_any_from_info = connector_binding.get_any_from_info
+        number_value = ctypes.c_double()
+        bool_value = ctypes.c_int()
+        string_value = ctypes.c_char_p()
+        selection = ctypes.c_int()
+        number_value_ref = ctypes.byref(number_value)
+        bool_value_ref = ctypes.byref(bool_value)
+        string_value_ref = ctypes.byref(string_value)
+        selection_ref = ctypes.byref(selection)
+        encoded_names = {}
+
+        first_index = self._read_state.index_offset + 1
+
+        def get_info(index, field_name):
+            try:
+                encoded_name = encoded_names[field_name]
+            except KeyError:
+                encoded_name = encoded_names[field_name] = tocstring(field_name)
+            retcode = get_any_from_info(
+                connector,
+                number_value_ref,
+                bool_value_ref,
+                string_value_ref,
+                selection_ref,
+                input_name,
+                index + first_index,
+                encoded_name)
+            _check_retcode(retcode)
+            if retcode == _ReturnCode.no_data:
+                return None
+            if selection.value == _AnyValueKind.connector_number:
+                return number_value.value
+            if selection.value == _AnyValueKind.connector_boolean:
+                return bool_value.value
+            # Timestamps that don't fit in a double are returned as strings,
+            # as are the states
+            python_bytes = _move_native_bytes(string_value)
+            try:
+                return _json_codec.decode(python_bytes)
+            except ValueError:
+                return fromcstring(python_bytes)
+
+        return get_info
+
+    def _get_timestamp_function(self):
+        """Returns a function that obtains a timestamp from the SampleInfo of a
+        sample, given its index and the field name, as an integer"""
+
+        get_info = self._get_info_function()
+
+        def get_timestamp(index, field_name):
+            value = get_info(index, field_name)
+            return None if value is None else int(value)
+
+        return get_timestamp
+
+    def _record_latencies(self):
+        count = self._get_sample_count()
+        if count == 0:
+            return
+
+        # The values are cached for SampleIterator.info and the next calls
+        get_info = self._get_info_function()
+        info_cache = self._read_state.info_cache
+
+        def get_cached_info(index, field_name):
+            key = (index, field_name)
+            try:
+                return info_cache[key]
+            except KeyError:
+                value = info_cache[key] = get_info(index, field_name)
+                return value
+
+        check_state = self._read_state.may_have_read_samples
+        latencies = []
+        for index in range(count):
+            if check_state and get_cached_info(index, "sample_state") != "NOT_READ":
+                continue
+            source_time = get_cached_info(index, "source_timestamp")
+            reception_time = get_cached_info(index, "reception_timestamp")
+            if source_time is not None and reception_time is not None:
+                latencies.append(int(reception_time) - int(source_time))
+        self._latency_histogram.record_many(latencies)
+
+    def instance_cache(self):
+        """Starts keeping the last sample of each instance received by this Input
+
+        After calling this method, every :meth:`take()` or :meth:`read()`
+        updates an :class:`InstanceCache` with the samples that hadn't been
+        read before: a sample with valid data replaces the previous sample of
+        its instance, and an instance is removed when its ``instance_state``
+        (see :attr:`SampleIterator.info`) is ``"NOT_ALIVE_DISPOSED"`` or
+        ``"NOT_ALIVE_NO_WRITERS"``. For example::
+
+            cache = input.instance_cache()
+            while True:
+                input.wait()
+                input.take()
+                print(cache.snapshot())
+
+        The instances are identified by the key fields of the type (see
+        :attr:`type_info`). If the cache already exists, this method returns
+        it.
+
+        :rtype: :class:`InstanceCache`
+        """
+
+        if self._instance_cache is None:
+            self._instance_cache = InstanceCache(self.type_info)
+        return self._instance_cache
+
+    def take_columns(self, fields, info=None):
+        """Takes the available samples and returns their values organized by field
+
+        This method performs a :meth:`take()`, copies the values of ``fields``
+        and of the *SampleInfo* fields ``info`` from all the samples into one
+        column per field, and returns the samples (see :meth:`return_samples()`).
+        It is more efficient than iterating over :attr:`samples` when the
+        application processes the data by field rather than by sample.
+
+        For example::
+
+            columns = input.take_columns(["x", "y"], info=["source_timestamp"])
+            for x, y, valid in zip(columns["x"], columns["y"], columns.valid_data):
+                ...
+
+        :param fields: The names of the fields to extract. See :ref:`Accessing the data`.
+        :param info: (Optional) The names of the *SampleInfo* fields to extract. See :attr:`SampleIterator.info`.
+        :return: The extracted columns
+        :rtype: :class:`Columns`
+        """
+
+        self.take()
+        try:
+            return self._extract_columns(fields, info or [])
+        finally:
+            self.return_samples()
+
+    def _extract_columns(self, fields, info_fields): # pylint: disable=too-many-locals, too-many-branches
+        count = self._get_sample_count()
+        connector = self.connector.native
+        input_name = tocstring(self.name)
+        # The native index of the sample at index 0
+        first_index = self._read_state.index_offset + 1
+
+        valid_data = array.array('B', [0]) * count
+        for index in range(count):
+            if self.infos._get_valid_data(index): # pylint: disable=protected-access
+                valid_data[index] = 1
+
+        kinds = {}
+        if 1 in valid_data:
+            native_sample = self.samples.getNative(valid_data.index(1))
+            for field_name in fields:
+                kinds[field_name] = _get_member_kind(native_sample, field_name)
+
+        c_number = ctypes.c_double()
+        c_number_ref = ctypes.byref(c_number)
+        c_boolean = ctypes.c_int()
+        c_boolean_ref = ctypes.byref(c_boolean)
+        columns = {}
+        for field_name in fields:
+            kind = kinds.get(field_name)
+            c_field_name = tocstring(field_name)
+            if kind in _INTEGER_KINDS or kind in _FLOAT_KINDS:
+                typecode = _INT64_TYPECODE if kind in _INTEGER_KINDS else 'd'
+                default = 0 if kind in _INTEGER_KINDS else float('nan')
+                column = array.array(typecode, [default]) * count
+                for index in range(count):
+                    if valid_data[index]:
+                        retcode = connector_binding.get_number_from_samples(
+                            connector, c_number_ref, input_name, index + first_index, c_field_name)
+                        _check_retcode(retcode)
+                        if retcode != _ReturnCode.no_data:
+                            column[index] = int(c_number.value) if typecode == _INT64_TYPECODE else c_number.value
+                column = _to_column(column, typecode)
+            elif kind == _TypeCodeKind.tk_boolean:
+                column = array.array('B', [0]) * count
+                for index in range(count):
+                    if valid_data[index]:
+                        retcode = connector_binding.get_boolean_from_samples(
+                            connector, c_boolean_ref, input_name, index + first_index, c_field_name)
+                        _check_retcode(retcode)
+                        if retcode != _ReturnCode.no_data and c_boolean.value:
+                            column[index] = 1
+                column = _to_column(column, 'B')
+            else:
+                column = [None] * count
+                for index in range(count):
+                    if valid_data[index]:
+                        column[index] = connector_binding.get_any_value(
+                            connector_binding.get_any_from_samples,
+                            connector, self.name, index + self._read_state.index_offset, field_name)
+            columns[field_name] = column
+
+        info_columns = {}
+        for field_name in info_fields:
+            if field_name in _TIMESTAMP_INFO_FIELDS:
+                column = array.array(_INT64_TYPECODE, [0]) * count
+                for index in range(count):
+                    column[index] = int(self._get_info(index, field_name))
+                column = _to_column(column, _INT64_TYPECODE)
+            else:
+                column = [self._get_info(index, field_name) for index in range(count)]
+            info_columns[field_name] = column
+
+        return Columns(count, _to_column(valid_data, 'B'), columns, info_columns)
+
+    def accessor(self, field_name):
+        """Returns an object that gets the value of a field in the samples of this Input
+
+        For example::
+
+            x = input.accessor("my_point.x")
+            for sample in input.samples.valid_data_iter:
+                value = x.get(sample)
+
+        :param str field_name: The name of the field. See :ref:`Accessing the data`.
+        :rtype: :class:`SampleAccessor`
+        """
+
+        return SampleAccessor(self, field_name)
+
+    @property
+    def type_info(self):
+        """The description of the type of this Input
+
+        The description is obtained from the native type of the samples if
+        this Input holds any samples (after :meth:`read()` or :meth:`take()`),
+        or else from the ``<types>`` in the XML configuration. It is obtained
+        once and shared by all the Inputs and Outputs of the same
+        :class:`Connector` with the same type.
+
+        :rtype: :class:`TypeInfo`
+        """
+
+        if self._type_info is None:
+            native_sample = None
+            if self._get_sample_count() > 0:
+                native_sample = self.samples.getNative(0)
+            self._type_info = _get_type_info(
+                self.connector, native_sample, self._get_topic_description)
+        return self._type_info
+
+    def _get_topic_description(self):
+        get_topic_description = connector_binding.get_dynamic_data_function(
+            "DDS_DataReader_get_topicdescription", ctypes.c_void_p, [ctypes.c_void_p])
+        return get_topic_description(self.native)
+
     def wait_for_publications(self, timeout=None):
         """Waits until this input matches or unmatches a compatible DDS subscription.
 
@@ -902,7 +3256,7 @@ class Input:
         native_json_str = ctypes.c_char_p()
         retcode = connector_binding.get_matched_publications(self.native, byref(native_json_str))
         _check_retcode(retcode)
-        return json.loads(_move_native_string(native_json_str))
+        return _json_codec.decode(_move_native_bytes(native_json_str))
 
 class Instance:
     """A data sample
@@ -1077,11 +3431,27 @@ class Instance:
         :param dict dictionary: The dictionary containing the keys (member names) and values (values for the members)
         """
 
-        json_str = json.dumps(dictionary)
         _check_retcode(connector_binding.set_json_instance(
             self.output.connector.native,
             tocstring(self.output.name),
-            tocstring(json_str)))
+            self.output._encode_sample(dictionary))) # pylint: disable=protected-access
+
+    def set_json_bytes(self, json_bytes):
+        """Sets the member values from a UTF-8 encoded JSON string
+
+        This method has the same effect as :meth:`set_dictionary`, but receives
+        the JSON representation directly (for example, obtained with
+        :meth:`SampleIterator.get_json_bytes`), so it doesn't need to be encoded.
+
+        :param json_bytes: A JSON object as ``bytes``, ``bytearray`` or ``memoryview``. A ``bytes`` object is passed to the native library without copying it.
+        """
+
+        if not isinstance(json_bytes, bytes):
+            json_bytes = memoryview(json_bytes).tobytes()
+        _check_retcode(connector_binding.set_json_instance(
+            self.output.connector.native,
+            tocstring(self.output.name),
+            json_bytes))
 
     def get_dictionary(self):
         "Retrieves the values of this instance as a dictionary"
@@ -1091,7 +3461,74 @@ class Instance:
 
         if not native_json_str:
             raise Error("Failed to create dictionary")
-        return json.loads(_move_native_string(native_json_str))
+        return _json_codec.decode(_move_native_bytes(native_json_str))
+
+    def set_array(self, field_name, data):
+        """Sets a sequence or array of primitive values from a buffer
+
+        ``data`` can be any object that supports the buffer protocol, such as
+        ``bytes``, ``bytearray``, ``memoryview``, ``array.array`` or a NumPy
+        array. Its contents are copied directly into the sample, without
+        converting them into a Python list or JSON string first.
+
+        The element type is selected from the format and size of the buffer
+        elements: ``bytes`` and other 8-bit integers set an octet sequence,
+        16, 32 and 64-bit integers set a short, long or long long sequence
+        (signed or unsigned), 32 and 64-bit floating point numbers set a float
+        or double sequence, and ``'?'`` (NumPy ``bool``) sets a boolean sequence.
+        The element type must match the type of the field as defined in the
+        configuration file.
+
+        For example::
+
+            output.instance.set_array("my_int_sequence", array.array("i", [1, 2, 3]))
+
+        Sequences are resized to the number of elements in ``data``.
+
+        :param str field_name: The name of a sequence or array of primitive values. See :ref:`Accessing the data`.
+        :param data: A C-contiguous buffer with the values to set.
+        """
+
+        if field_name is None:
+            raise AttributeError("field_name cannot be None")
+
+        view = _get_buffer_view(data)
+        element_type = _get_array_element_type(view)
+        if not view.c_contiguous:
+            raise ValueError("data must be a C-contiguous buffer")
+
+        length = view.nbytes // view.itemsize
+        if length == 0:
+            buffer = None
+        elif isinstance(data, bytes):
+            buffer = data
+        elif view.readonly:
+            buffer = memoryview(data).tobytes()
+        else:
+            buffer = (ctypes.c_char * view.nbytes).from_buffer(data)
+
+        set_array = connector_binding.get_set_array_function(element_type)
+        retcode = set_array(
+            self.native,
+            tocstring(field_name),
+            _DYNAMIC_DATA_MEMBER_ID_UNSPECIFIED,
+            length,
+            buffer)
+        _check_dynamic_data_retcode(retcode, set_array.__name__, field_name)
+
+    def accessor(self, field_name):
+        """Returns an object that sets the value of a field of this instance
+
+        For example::
+
+            x = output.instance.accessor("my_point.x")
+            x.set(10) # equivalent to output.instance["my_point.x"] = 10
+
+        :param str field_name: The name of the field. See :ref:`Accessing the data`.
+        :rtype: :class:`InstanceAccessor`
+        """
+
+        return InstanceAccessor(self, field_name)
 
     # Deprecated: use set_dictionary
     def setDictionary(self, dictionary):
@@ -1119,6 +3556,282 @@ class Instance:
         return self.native
 
 
+class InstanceAccessor:
+    """Sets the value of a field of an :class:`Instance`
+
+    An ``InstanceAccessor`` is obtained with :meth:`Instance.accessor` and is
+    intended for applications that write the same fields at a high rate.
+    ``accessor.set(value)`` is equivalent to ``instance[field_name] = value``,
+    but the names are encoded only once, and the type of the field is looked up
+    the first time it's used to select the native setter for that type. Until
+    the type can be determined, the accessor uses the same path as
+    ``__setitem__``.
+
+    Attributes:
+        * ``instance`` (:class:`Instance`): The ``Instance`` that created this accessor
+        * ``field_name`` (str): The name of the field. See :ref:`Accessing the data`.
+    """
+
+    def __init__(self, instance, field_name):
+        if field_name is None:
+            raise AttributeError("field_name cannot be None")
+        self.instance = instance
+        self.field_name = field_name
+        self._output_name = tocstring(instance.output.name)
+        self._field_name = tocstring(field_name)
+
+    def set(self, value):
+        """Sets the value of the field
+
+        :param value: A value of the type of the field, or ``None`` to unset an optional member
+        """
+
+        kind = _get_member_kind(self.instance.native, self.field_name)
+        if kind is None:
+            # For example, a field inside an unset optional member; a later
+            # call may determine the kind
+            self._set_any(value)
+            return
+        if kind in _NUMERIC_KINDS:
+            self.set = self._set_number
+        elif kind == _TypeCodeKind.tk_boolean:
+            self.set = self._set_boolean
+        elif kind == _TypeCodeKind.tk_string:
+            self.set = self._set_string
+        else:
+            self.set = self._set_any
+        self.set(value)
+
+    def _set_number(self, value):
+        if value is None:
+            self.instance.clear_member(self.field_name)
+            return
+        try:
+            retcode = connector_binding.set_number_into_samples(
+                self.instance.output.connector.native,
+                self._output_name,
+                self._field_name,
+                value)
+        except ctypes.ArgumentError:
+            raise TypeError("value for field '{0}' must be of a numeric type"\
+                .format(self.field_name))
+        _check_retcode(retcode)
+
+    def _set_boolean(self, value):
+        if value is None:
+            self.instance.clear_member(self.field_name)
+            return
+        try:
+            retcode = connector_binding.set_boolean_into_samples(
+                self.instance.output.connector.native,
+                self._output_name,
+                self._field_name,
+                value)
+        except ctypes.ArgumentError:
+            raise TypeError("value for field '{0}' must be of type bool"\
+                .format(self.field_name))
+        _check_retcode(retcode)
+
+    def _set_string(self, value):
+        if value is None:
+            self.instance.clear_member(self.field_name)
+            return
+        try:
+            retcode = connector_binding.set_string_into_samples(
+                self.instance.output.connector.native,
+                self._output_name,
+                self._field_name,
+                tocstring(value))
+        except (AttributeError, ctypes.ArgumentError):
+            raise TypeError("value for field '{0}' must be of type str"\
+                .format(self.field_name))
+        _check_retcode(retcode)
+
+    def _set_any(self, value):
+        self.instance[self.field_name] = value
+
+class WriteSummary:
+    """The result of :meth:`Output.write_many`
+
+    Attributes:
+        * ``count`` (int): The number of samples written
+        * ``duration`` (float): The time it took to write them, in seconds
+        * ``rate`` (float): The number of samples written per second
+    """
+
+    def __init__(self, count, duration):
+        self.count = count
+        self.duration = duration
+        self.rate = count / duration if duration > 0 else float('inf')
+
+    def __repr__(self):
+        return "WriteSummary(count={0}, duration={1:.6f}, rate={2:.1f})".format(
+            self.count, self.duration, self.rate)
+
+_INTEGER_TYPE_KINDS = (
+    "octet", "short", "unsignedShort", "long", "unsignedLong", "longLong",
+    "unsignedLongLong")
+_FLOAT_TYPE_KINDS = ("float", "double", "longDouble")
+_STRING_TYPE_KINDS = ("char", "wchar", "string", "wstring")
+
+# The functions that encode a value of the expected type into JSON, or raise
+# TypeError or ValueError for any other value. int.__repr__ and
+# float.__repr__ are the same functions that the json module uses; a boolean
+# in an integer member is encoded as its integer value.
+_encode_string = json.encoder.encode_basestring_ascii
+_encode_integer = int.__repr__
+_float_repr = float.__repr__
+
+def _encode_float(value):
+    if type(value) is float: # pylint: disable=unidiomatic-typecheck
+        if value - value == 0:
+            return _float_repr(value)
+        raise ValueError("NaN and infinity are encoded by the JSON codec")
+    return _encode_integer(value)
+
+def _encode_boolean(value):
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    raise TypeError("Not a boolean")
+
+def _encode_enum(value):
+    try:
+        return _encode_integer(value)
+    except TypeError:
+        return _encode_string(value)
+
+# The source of the function that encodes a struct when the dictionary has
+# all its members: a single string formatting with the member names already
+# rendered. Any other dictionary is encoded by encode_members.
+_STRUCT_ENCODER_SOURCE = """
+def encode_struct(value):
+    if len(value) == {count}:
+        try:
+            return template % ({arguments})
+        except (KeyError, TypeError, ValueError):
+            pass
+    return encode_members(value)
+"""
+
+class _TypeEncoderCompiler:
+    """Builds a function that encodes the values of a TypeInfo into JSON
+
+    The values that the function for a type doesn't support, such as unions
+    or values of an unexpected type, are encoded by the fallback function.
+    """
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+
+    def compile(self, type_info):
+        kind = type_info.kind
+        if kind in _INTEGER_TYPE_KINDS:
+            return _encode_integer
+        if kind in _FLOAT_TYPE_KINDS:
+            return _encode_float
+        if kind in _STRING_TYPE_KINDS:
+            return _encode_string
+        if kind == "boolean":
+            return _encode_boolean
+        if kind == "enum":
+            return _encode_enum
+        if kind == "struct":
+            return self._compile_struct(type_info)
+        if kind == "sequence" or (kind == "array" and len(type_info.dimensions) == 1):
+            return self._compile_sequence(type_info)
+        return self.fallback
+
+    def _compile_sequence(self, type_info):
+        encode_element = self.compile(type_info.element)
+        fallback = self.fallback
+
+        def encode_sequence(value):
+            if isinstance(value, (list, tuple)):
+                try:
+                    return "[" + ",".join(map(encode_element, value)) + "]"
+                except (TypeError, ValueError):
+                    pass
+            return fallback(value)
+
+        return encode_sequence
+
+    def _compile_struct(self, type_info):
+        fallback = self.fallback
+        members = OrderedDict()
+        for name, member in type_info.members.items():
+            members[name] = (_encode_string(name) + ":", self.compile(member.type))
+
+        def encode_members(value):
+            if not isinstance(value, dict):
+                return fallback(value)
+            parts = []
+            for name, item in value.items():
+                try:
+                    fragment, encode = members[name]
+                except (KeyError, TypeError):
+                    # Let the native library report the unknown member
+                    return fallback(value)
+                if item is None:
+                    parts.append(fragment + "null")
+                    continue
+                try:
+                    parts.append(fragment + encode(item))
+                except (TypeError, ValueError):
+                    parts.append(fragment + fallback(item))
+            return "{" + ",".join(parts) + "}"
+
+        namespace = {"encode_members": encode_members}
+        fragments = []
+        arguments = []
+        for index, (name, (fragment, encode)) in enumerate(members.items()):
+            namespace["name{0}".format(index)] = name
+            namespace["encode{0}".format(index)] = encode
+            fragments.append(fragment.replace("%", "%%") + "%s")
+            arguments.append("encode{0}(value[name{0}]), ".format(index))
+        namespace["template"] = "{" + ",".join(fragments) + "}"
+        source = _STRUCT_ENCODER_SOURCE.format(
+            count=len(members), arguments="".join(arguments))
+        exec(source, namespace) # pylint: disable=exec-used
+        return namespace["encode_struct"]
+
+class CompiledEncoder:
+    """Converts dictionaries into JSON strings for an Output
+
+    Created by :meth:`Output.compile_encoder`.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        # Unlike json.dumps(), this doesn't set up the encoder in every call.
+        # It checks for circular references.
+        self._encode_generic = json.JSONEncoder(separators=(",", ":")).encode
+        try:
+            type_info = output.type_info
+        except Error:
+            type_info = None
+        if type_info is None:
+            self._encode = self._encode_generic
+        else:
+            self._encode = _TypeEncoderCompiler(self._encode_generic).compile(type_info)
+
+    def encode(self, dictionary):
+        """Returns the UTF-8 encoded JSON representation of a sample
+
+        :param dict dictionary: The values of the sample, as in :meth:`Instance.set_dictionary`
+        :return: The JSON string
+        :rtype: bytes
+        """
+        try:
+            # The JSON string only contains ASCII characters
+            return self._encode(dictionary).encode("ascii")
+        except (TypeError, ValueError):
+            # Let the JSON codec handle other values, or raise the error
+            return _json_codec.encode(dictionary)
+
+    __call__ = encode
+
 class Output:
     """Allows writting data for a DDS Topic
 
@@ -1137,6 +3850,40 @@ class Output:
         self.native = connector_binding.get_writer(self.connector.native, tocstring(self.name))
         _check_entity_creation(self.native, "Output")
         self.instance = Instance(self)
+        self._encoder = None
+        self._type_info = None
+
+    def _encode_sample(self, sample):
+        if self._encoder is None:
+            return _json_codec.encode(sample)
+        return self._encoder.encode(sample)
+
+    def compile_encoder(self):
+        """Uses a dedicated encoder to convert dictionaries into JSON for this Output
+
+        By default, dictionaries (for example, in
+        :meth:`Instance.set_dictionary`, :meth:`write_many` or
+        :meth:`AsyncOutput.write`) are converted into JSON by the JSON codec
+        (see :func:`set_json_codec`), which doesn't know the type of the data.
+        This method creates a :class:`CompiledEncoder` specialized for the
+        type of this Output (see :attr:`type_info`): the member names are
+        encoded in advance and a dictionary with all the members of a struct
+        is converted with a single string formatting. Unions, members with
+        values of other types and members that aren't in the type are
+        converted by the ``json`` module. The values that ``json`` doesn't
+        support either are passed to the JSON codec, so they raise the same
+        errors as without this method.
+
+        After calling this method, this Output uses the new encoder. ::
+
+            output.compile_encoder()
+            output.instance.set_dictionary({"x": 1, "y": 2, "color": "BLUE"})
+
+        :return: The encoder, which can also be used directly to obtain the JSON representation of a sample, as accepted by :meth:`Instance.set_json_bytes`.
+        :rtype: :class:`CompiledEncoder`
+        """
+        self._encoder = CompiledEncoder(self)
+        return self._encoder
 
     def write(self, **kwargs):
         """Publishes the values of the current ``instance``
@@ -1173,7 +3920,7 @@ class Output:
         """
 
         if kwargs:
-            json_str = tocstring(json.dumps(kwargs))
+            json_str = _json_codec.encode(kwargs)
         else:
             json_str = None
 
@@ -1183,6 +3930,144 @@ class Output:
             json_str)
         _check_retcode(retcode)
 
+    def write_many(self, samples, clear=True, params=None): # pylint: disable=too-many-branches
+        """Publishes a sequence of samples
+
+        Each element of ``samples`` can be a dictionary (as in
+        :meth:`Instance.set_dictionary`) or a UTF-8 encoded JSON string (as in
+        :meth:`Instance.set_json_bytes`). Alternatively, ``samples`` can be a
+        dictionary of columns, where each key is a field name and each value
+        is a list or array with the values of that field for every sample (for
+        example, the :class:`Columns` returned by :meth:`Input.take_columns`).
+
+        For each sample, this method sets the ``instance`` and writes it. It's
+        equivalent to calling :meth:`write()` once per sample, but the names and
+        parameters are encoded only once.
+
+        For example::
+
+            output.write_many([{"x": 1, "y": 2}, {"x": 3, "y": 4}])
+            output.write_many({"x": [1, 3], "y": [2, 4]})
+
+        If the write of a sample times out, this method raises a
+        :class:`TimeoutError` whose ``samples_written`` attribute indicates how
+        many samples were written, so the application can resume from that one.
+
+        :param samples: An iterable of dictionaries or JSON strings, or a dictionary of columns
+        :param bool clear: Whether to call :meth:`clear_members()` before setting each sample, so that the members not set by the sample have their default value. By default, ``True``.
+        :param params: (Optional) The parameters for each write (see :meth:`write()`). It can be a dictionary, used for all samples, or an iterable with one dictionary per sample.
+        :return: A :class:`WriteSummary`
+        :raises ValueError: If ``params`` has fewer elements than ``samples``. The samples before the first one without parameters are written.
+        """
+
+        connector = self.connector.native
+        output_name = tocstring(self.name)
+        if params is None or isinstance(params, dict):
+            shared_params = _json_codec.encode(params) if params else None
+            params_iter = None
+        else:
+            params_iter = iter(params)
+
+        if isinstance(samples, Mapping):
+            samples, set_sample = self._get_column_setter(samples)
+        else:
+            def set_sample(sample):
+                if not isinstance(sample, bytes):
+                    if isinstance(sample, (bytearray, memoryview)):
+                        sample = bytes(sample)
+                    else:
+                        sample = self._encode_sample(sample)
+                _check_retcode(connector_binding.set_json_instance(
+                    connector, output_name, sample))
+
+        count = 0
+        start_time = _perf_counter()
+        try:
+            for sample in samples:
+                if params_iter is None:
+                    write_params = shared_params
+                else:
+                    try:
+                        sample_params = next(params_iter)
+                    except StopIteration:
+                        raise ValueError("params has fewer elements than samples")
+                    write_params = _json_codec.encode(sample_params) if sample_params else None
+
+                if clear:
+                    _check_retcode(connector_binding.clear(connector, output_name))
+                set_sample(sample)
+                _check_retcode(connector_binding.write(connector, output_name, write_params))
+                count += 1
+        except TimeoutError as error:
+            error.samples_written = count
+            raise
+
+        return WriteSummary(count, _perf_counter() - start_time)
+
+    def _get_column_setter(self, columns):
+        """Returns the row indexes of a dictionary of columns and a function
+        that sets the instance from a row"""
+
+        accessors = []
+        length = None
+        for field_name, column in columns.items():
+            values = column.tolist() if hasattr(column, "tolist") else list(column)
+            if length is None:
+                length = len(values)
+            elif len(values) != length:
+                raise ValueError("all the columns must have the same length")
+            accessors.append((self.instance.accessor(field_name), values))
+
+        def set_row(index):
+            for accessor, values in accessors:
+                accessor.set(values[index])
+
+        return range(length or 0), set_row
+
+    @property
+    def type_info(self):
+        """The description of the type of this Output
+
+        The description is obtained from the native type of :attr:`instance`
+        or, if the native libraries don't provide it, from the ``<types>`` in
+        the XML configuration. It is obtained once and shared by all the
+        Inputs and Outputs of the same :class:`Connector` with the same type.
+
+        :rtype: :class:`TypeInfo`
+        """
+
+        if self._type_info is None:
+            self._type_info = _get_type_info(
+                self.connector, self.instance.native, self._get_topic_description)
+        return self._type_info
+
+    def _get_topic_description(self):
+        get_topic = connector_binding.get_dynamic_data_function(
+            "DDS_DataWriter_get_topic", ctypes.c_void_p, [ctypes.c_void_p])
+        as_topic_description = connector_binding.get_dynamic_data_function(
+            "DDS_Topic_as_topicdescription", ctypes.c_void_p, [ctypes.c_void_p])
+        return as_topic_description(get_topic(self.native))
+
+    def start_background_writer(self, maxsize=1000, policy="block", clear=True):
+        """Creates an :class:`AsyncOutput` that writes samples from a background thread
+
+        :param int maxsize: The maximum number of samples waiting to be written
+        :param str policy: What to do when a sample is written and the queue is full: ``"block"`` (default), ``"drop_oldest"``, ``"drop_newest"`` or ``"raise"``. See :class:`AsyncOutput`.
+        :param bool clear: Whether to call :meth:`clear_members()` before setting each sample
+        :rtype: :class:`AsyncOutput`
+        """
+
+        return AsyncOutput(self, maxsize, policy, clear)
+
+    def conflating(self, interval_ms=None):
+        """Creates a :class:`ConflatingOutput` that writes only the latest value of each instance
+
+        :param number interval_ms: How often, in milliseconds, the instances updated are written. If ``None``, they are written only when :meth:`ConflatingOutput.flush` is called.
+        :rtype: :class:`ConflatingOutput`
+        """
+
+        return ConflatingOutput(self, interval_ms)
+
     def wait(self, timeout=None):
         """Waits until all matching reliable subscriptions have acknowledged all
         the samples that have been currently written.
@@ -1199,6 +4084,18 @@ class Output:
         retcode = connector_binding.wait_for_acknowledgments(self.native, timeout)
         _check_retcode(retcode)
 
+    def wait_async(self, timeout=None):
+        """Returns an awaitable that waits for acknowledgments
+
+        This is the ``asyncio`` version of :meth:`wait()`. See
+        :mod:`rticonnextdds_connector.aio`. Requires Python 3.6 or newer.
+
+        :param number timeout: The maximum time to wait in milliseconds. By default, infinite.
+        """
+
+        from . import aio # pylint: disable=import-outside-toplevel
+        return aio.wait(self, timeout)
+
     def wait_for_subscriptions(self, timeout=None):
         """Waits until the number of matched DDS subscription changes
 
@@ -1236,7 +4133,7 @@ class Output:
         native_json_str = ctypes.c_char_p()
         retcode = connector_binding.get_matched_subscriptions(self.native, byref(native_json_str))
         _check_retcode(retcode)
-        return json.loads(_move_native_string(native_json_str))
+        return _json_codec.decode(_move_native_bytes(native_json_str))
 
     def clear_members(self):
         """Resets the values of the members of this ``Output.instance``
@@ -1253,6 +4150,825 @@ class Output:
         retcode = connector_binding.clear(self.connector.native, tocstring(self.name))
         _check_retcode(retcode)
 
+class AsyncOutput:
+    """Writes the samples of an :class:`Output` from a background thread
+
+    :meth:`Output.write` can block (for example, when a reliable *DataWriter*
+    has its send window full). An ``AsyncOutput``, created with
+    :meth:`Output.start_background_writer`, makes :meth:`write()` return
+    immediately by putting the samples in a bounded queue; a dedicated thread
+    takes them from the queue and writes them.
+
+    When the queue is full, :meth:`write()` applies one of these policies:
+
+    * ``"block"``: wait until there is room in the queue
+    * ``"drop_oldest"``: discard the oldest sample in the queue
+    * ``"drop_newest"``: discard the sample being written
+    * ``"raise"``: raise ``queue.Full``
+
+    Because :class:`Output` operations are not thread-safe, the background
+    thread holds :attr:`lock` during every call on the ``Output``. Applications
+    that use the ``Output`` directly while the ``AsyncOutput`` is running must
+    hold the same lock.
+
+    An ``AsyncOutput`` must be closed with :meth:`close()`, which writes any
+    queued samples. It can also be used as a context manager.
+
+    Attributes:
+        * ``output`` (:class:`Output`): The ``Output`` that writes the samples
+        * ``lock``: The lock that protects the calls on the ``Output``
+        * ``last_error`` (:class:`Error`): The last error raised when writing a sample, or ``None``
+    """
+
+    _POLICIES = ("block", "drop_oldest", "drop_newest", "raise")
+
+    def __init__(self, output, maxsize=1000, policy="block", clear=True):
+        if policy not in AsyncOutput._POLICIES:
+            raise ValueError("policy must be one of " + ", ".join(AsyncOutput._POLICIES))
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.output = output
+        self.maxsize = maxsize
+        self.policy = policy
+        self.clear = clear
+        self.lock = threading.RLock()
+        self.last_error = None
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._writing = False
+        self._closed = False
+        self._written = 0
+        self._dropped = 0
+        self._errors = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._thread = threading.Thread(
+            target=self._run,
+            name="AsyncOutput(" + output.name + ")")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def write(self, sample=None, **kwargs):
+        """Puts a sample in the queue to be written
+
+        :param sample: A dictionary or a UTF-8 encoded JSON string with the values of the sample (see :meth:`Output.write_many`). If ``None``, the current values of ``output.instance`` are written.
+        :param kwargs: The parameters for the write, as in :meth:`Output.write`.
+        :return: ``True`` if the sample was queued, ``False`` if it was dropped
+        """
+
+        if sample is not None and not isinstance(sample, bytes):
+            if isinstance(sample, (bytearray, memoryview)):
+                sample = bytes(sample)
+            else:
+                sample = self.output._encode_sample(sample) # pylint: disable=protected-access
+        params = _json_codec.encode(kwargs) if kwargs else None
+        item = (sample, params, _perf_counter())
+
+        with self._condition:
+            if self._closed:
+                raise Error("AsyncOutput is closed")
+            if len(self._queue) >= self.maxsize:
+                if self.policy == "block":
+                    while len(self._queue) >= self.maxsize and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        raise Error("AsyncOutput is closed")
+                elif self.policy == "drop_oldest":
+                    self._queue.popleft()
+                    self._dropped += 1
+                elif self.policy == "drop_newest":
+                    self._dropped += 1
+                    return False
+                else:
+                    raise QueueFull()
+            self._queue.append(item)
+            self._condition.notify_all()
+        return True
+
+    def flush(self, timeout=None):
+        """Waits until all the queued samples have been written
+
+        :param number timeout: The maximum time to wait in milliseconds. By default, infinite.
+        :return: ``True`` if the queue was emptied, ``False`` if the timeout elapsed
+        """
+
+        deadline = None if timeout is None else _perf_counter() + timeout / 1000.0
+        with self._condition:
+            while self._queue or self._writing:
+                if deadline is None:
+                    self._condition.wait()
+                else:
+                    remaining = deadline - _perf_counter()
+                    if remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        """Writes the queued samples and stops the background thread
+
+        :param number timeout: The maximum time to wait in milliseconds for the queued samples to be written. By default, infinite.
+        """
+
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(None if timeout is None else timeout / 1000.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def queue_depth(self):
+        """The number of samples waiting to be written"""
+        return len(self._queue)
+
+    @property
+    def stats(self):
+        """Returns a dictionary with the statistics of this ``AsyncOutput``
+
+        * ``"queue_depth"``: the number of samples waiting to be written
+        * ``"written"``: the number of samples written
+        * ``"dropped"``: the number of samples dropped by the ``"drop_oldest"`` and ``"drop_newest"`` policies
+        * ``"errors"``: the number of samples that failed to be written (see ``last_error``)
+        * ``"average_latency"`` and ``"max_latency"``: the time, in seconds, since a sample is passed to :meth:`write()` until it's written
+        """
+
+        with self._condition:
+            return {
+                "queue_depth": len(self._queue),
+                "written": self._written,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "average_latency": self._total_latency / self._written if self._written else 0.0,
+                "max_latency": self._max_latency
+            }
+
+    def _run(self):
+        output = self.output
+        output_name = tocstring(output.name)
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                sample, params, queued_time = self._queue.popleft()
+                self._writing = True
+                self._condition.notify_all()
+
+            error = None
+            try:
+                with self.lock:
+                    connector = output.connector.native
+                    if sample is not None:
+                        if self.clear:
+                            _check_retcode(connector_binding.clear(connector, output_name))
+                        _check_retcode(connector_binding.set_json_instance(
+                            connector, output_name, sample))
+                    _check_retcode(connector_binding.write(connector, output_name, params))
+            except Error as write_error:
+                error = write_error
+
+            latency = _perf_counter() - queued_time
+            with self._condition:
+                self._writing = False
+                if error is None:
+                    self._written += 1
+                    self._total_latency += latency
+                    self._max_latency = max(self._max_latency, latency)
+                else:
+                    self._errors += 1
+                    self.last_error = error
+                self._condition.notify_all()
+
+class ConflatingOutput:
+    """Writes only the latest value of each instance of an :class:`Output`
+
+    When an application updates the same instances faster than they can be
+    delivered, :meth:`Output.write` blocks (for example, when a reliable
+    *DataWriter* has its send window full) and the subscribers receive values
+    that are already outdated. A ``ConflatingOutput``, created with
+    :meth:`Output.conflating`, keeps the latest value written for each instance
+    and writes the instances that were updated once every interval::
+
+        with output.conflating(interval_ms=100) as conflating_output:
+            for update in updates:
+                conflating_output.write(update) # never blocks
+            ...
+
+    Each instance is identified by the values of the key fields of the type
+    (see :attr:`TypeInfo.key_fields`), as in :class:`InstanceCache`. A new
+    value for an instance replaces the value not written yet, so each flush
+    writes at most one sample per instance. Only the instances updated since
+    the previous flush are written.
+
+    Each value is a complete sample: the members not present in the
+    dictionary are set to their default value. A dispose or unregister
+    (``write(sample, action="dispose")``) replaces the values of the instance
+    that haven't been written and removes the instance once written.
+
+    Because :class:`Output` operations are not thread-safe, the background
+    thread holds :attr:`lock` during every call on the ``Output``. Applications
+    that use the ``Output`` directly while the ``ConflatingOutput`` is running
+    must hold the same lock.
+
+    A ``ConflatingOutput`` must be closed with :meth:`close()`, which writes
+    the pending updates. It can also be used as a context manager.
+
+    Attributes:
+        * ``output`` (:class:`Output`): The ``Output`` that writes the samples
+        * ``key_fields`` (tuple): The names of the key fields that identify the instances
+        * ``lock``: The lock that protects the calls on the ``Output``
+        * ``last_error`` (:class:`Error`): The last error raised when writing a sample, or ``None``
+    """
+
+    def __init__(self, output, interval_ms=None):
+        if interval_ms is not None and interval_ms <= 0:
+            raise ValueError("interval_ms must be positive")
+        self.output = output
+        self.interval_ms = interval_ms
+        self.key_fields = output.type_info.key_fields
+        self._key_paths = _get_key_paths(output.type_info)
+        self.lock = threading.RLock()
+        self.last_error = None
+        # The latest value (JSON bytes and write params) of each instance, and
+        # the keys of the instances updated since the last flush
+        self._latest = {}
+        self._dirty = OrderedDict()
+        self._values_lock = threading.Lock()
+        self._updates = 0
+        self._conflated = 0
+        self._written = 0
+        self._errors = 0
+        self._closed = threading.Event()
+        self._thread = None
+        if interval_ms is not None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name="ConflatingOutput(" + output.name + ")")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def write(self, sample, **kwargs):
+        """Sets the latest value of an instance, to be written in the next flush
+
+        This method doesn't call the ``Output`` and never blocks.
+
+        :param sample: A dictionary or a UTF-8 encoded JSON string with the values of the sample
+        :param kwargs: The parameters for the write, as in :meth:`Output.write`. For example, ``action="dispose"``.
+        """
+
+        if isinstance(sample, (bytes, bytearray, memoryview)):
+            data = bytes(sample)
+            dictionary = _json_codec.decode(data)
+        else:
+            dictionary = sample
+            data = self.output._encode_sample(sample) # pylint: disable=protected-access
+        key = _get_instance_key(self._key_paths, dictionary)
+        params = _json_codec.encode(kwargs) if kwargs else None
+        unregistered = kwargs.get("action", "write") != "write"
+
+        with self._values_lock:
+            if self._closed.is_set():
+                raise Error("ConflatingOutput is closed")
+            self._updates += 1
+            if key in self._dirty:
+                self._conflated += 1
+            else:
+                self._dirty[key] = True
+            self._latest[key] = (data, params, unregistered)
+
+    def get(self, key, default=None):
+        """Returns the latest value written for an instance
+
+        :param key: The key of the instance, as in :class:`InstanceCache`
+        :param default: The value to return if there is no such instance
+        :return: A dictionary with the latest value, or ``default`` if the instance hasn't been written or has been disposed or unregistered
+        """
+
+        value = self._latest.get(key)
+        if value is None or value[2]:
+            return default
+        return _json_codec.decode(value[0])
+
+    def flush(self):
+        """Writes the latest value of every instance updated since the previous flush
+
+        This method is called every ``interval_ms`` by the background thread,
+        but it can also be called directly.
+
+        :return: The number of samples written
+        """
+
+        output = self.output
+        output_name = tocstring(output.name)
+        written = 0
+        errors = 0
+        # Holding the lock while the dirty keys are collected ensures that
+        # concurrent flushes write the values of an instance in order
+        with self.lock:
+            with self._values_lock:
+                dirty = self._dirty
+                self._dirty = OrderedDict()
+                items = []
+                for key in dirty:
+                    value = self._latest[key]
+                    if value[2]:
+                        del self._latest[key]
+                    items.append(value)
+
+            connector = output.connector.native
+            for data, params, _ in items:
+                try:
+                    _check_retcode(connector_binding.clear(connector, output_name))
+                    _check_retcode(connector_binding.set_json_instance(
+                        connector, output_name, data))
+                    _check_retcode(connector_binding.write(connector, output_name, params))
+                    written += 1
+                except Error as write_error:
+                    errors += 1
+                    self.last_error = write_error
+
+        with self._values_lock:
+            self._written += written
+            self._errors += errors
+        return written
+
+    def close(self, timeout=None):
+        """Stops the background thread and writes the pending updates
+
+        :param number timeout: The maximum time to wait in milliseconds for the thread to finish. By default, infinite.
+        """
+
+        with self._values_lock:
+            self._closed.set()
+        if self._thread is not None:
+            self._thread.join(None if timeout is None else timeout / 1000.0)
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def stats(self):
+        """Returns a dictionary with the statistics of this ``ConflatingOutput``
+
+        * ``"pending"``: the number of instances updated and not written yet
+        * ``"updates"``: the number of calls to :meth:`write()`
+        * ``"conflated"``: the number of updates replaced by a later update of the same instance
+        * ``"written"``: the number of samples written
+        * ``"errors"``: the number of samples that failed to be written (see ``last_error``)
+        """
+
+        with self._values_lock:
+            return {
+                "pending": len(self._dirty),
+                "updates": self._updates,
+                "conflated": self._conflated,
+                "written": self._written,
+                "errors": self._errors
+            }
+
+    def _run(self):
+        interval = self.interval_ms / 1000.0
+        while not self._closed.wait(interval):
+            self.flush()
+
+class _DispatcherHandler:
+    def __init__(self, input, function, max_samples): # pylint: disable=redefined-builtin
+        self.input = input
+        self.function = function
+        self.max_samples = max_samples
+        self.pending = deque()
+        self.busy = False
+
+class Dispatcher:
+    """Waits for data on the Inputs of a :class:`Connector` and calls their handlers
+
+    A ``Dispatcher`` replaces the loop that calls :meth:`Connector.wait` and then
+    :meth:`Input.take` on every ``Input``. It takes the samples only from the
+    inputs that have a handler (see :meth:`add_handler()`) and calls the handler
+    with the data of the valid samples, as dictionaries.
+
+    The handlers run in the thread that calls :meth:`dispatch()` (inline) or, if
+    an ``executor`` is provided, in the executor's threads. For example::
+
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            dispatcher = rti.Dispatcher(connector, executor)
+            dispatcher.add_handler(square_input, process_squares, max_samples=100)
+            dispatcher.add_handler(circle_input, process_circles)
+            dispatcher.start()
+            ...
+            dispatcher.stop()
+
+    The samples of an ``Input`` are dispatched in order and the handler of an
+    ``Input`` is never called again until its previous call has returned.
+    ``max_samples`` limits the number of samples passed to a handler in each
+    round, so an ``Input`` receiving a large amount of data cannot delay the
+    rest; the remaining samples are dispatched in the next rounds.
+
+    In each round, the ``Dispatcher`` only takes the samples of the inputs
+    that have new data (see :meth:`Input.wait`) or that the application has
+    read (see :meth:`Input.read`). Inputs without a handler are never
+    taken. While one of them has data, :meth:`Connector.wait` doesn't
+    block, so the ``Dispatcher`` checks the inputs with a handler
+    periodically instead.
+
+    The ``Dispatcher`` holds :attr:`lock` while it calls operations on the
+    inputs. Applications that use the same ``Connector`` in other threads must
+    hold the same lock (see :ref:`Threading model`).
+
+    :param connector: The :class:`Connector` whose inputs are dispatched
+    :param executor: (Optional) An object with a ``submit(function, *args)`` method, such as a ``concurrent.futures.ThreadPoolExecutor``, to run the handlers. By default, the handlers are called inline.
+
+    Attributes:
+        * ``lock``: The lock that protects the calls on the inputs
+        * ``last_error`` (``Exception``): The last exception raised by a handler, or ``None``
+    """
+
+    # How long to wait, in seconds, for a handler to finish when all the inputs
+    # with data are busy
+    _BUSY_WAIT_INTERVAL = 0.05
+
+    # How often, in seconds, the inputs with a handler are checked for data
+    # while an Input without a handler has data
+    _POLL_INTERVAL = 0.05
+
+    # How long each wait of the background thread lasts, in milliseconds
+    _WAIT_INTERVAL = 200
+
+    def __init__(self, connector, executor=None):
+        self.connector = connector
+        self.executor = executor
+        self.lock = threading.RLock()
+        self.last_error = None
+        self._handlers = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def add_handler(self, input, handler, max_samples=None): # pylint: disable=redefined-builtin
+        """Registers a function to process the data received by an :class:`Input`
+
+        :param input: The :class:`Input`, or its name, as in :meth:`Connector.get_input`
+        :param handler: A function that receives a list of dictionaries with the data of the valid samples
+        :param int max_samples: (Optional) The maximum number of samples passed to ``handler`` in each call. By default, all the available samples.
+        """
+
+        if max_samples is not None and max_samples < 1:
+            raise ValueError("max_samples must be positive")
+        if not isinstance(input, Input):
+            with self.lock:
+                input = self.connector.get_input(input)
+        with self._condition:
+            self._handlers[input.name] = _DispatcherHandler(input, handler, max_samples)
+
+    def remove_handler(self, input): # pylint: disable=redefined-builtin
+        """Unregisters the handler of an :class:`Input`
+
+        Any samples taken and not dispatched yet are discarded.
+
+        :param input: The :class:`Input` or its name
+        """
+
+        name = input.name if isinstance(input, Input) else input
+        with self._condition:
+            if self._handlers.pop(name, None) is None:
+                raise ValueError("No handler for input " + name)
+
+    def dispatch(self, timeout=None):
+        """Waits for data and dispatches one round of samples to the handlers
+
+        This method is called repeatedly by the thread created with :meth:`start()`,
+        but it can also be called directly.
+
+        :param number timeout: The maximum time to wait for data in milliseconds. By default, infinite.
+        :return: The number of samples dispatched, 0 if the timeout elapsed.
+        """
+
+        count = self._dispatch_round()
+        if count == 0:
+            self._wait(timeout)
+            count = self._dispatch_round()
+        return count
+
+    def start(self):
+        """Starts a thread that calls :meth:`dispatch()` until :meth:`stop()` is called"""
+
+        if self._thread is not None:
+            raise Error("Dispatcher already started")
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name="Dispatcher")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stops the thread created with :meth:`start()`
+
+        :param number timeout: The maximum time to wait in milliseconds for the thread to finish. By default, infinite.
+        """
+
+        self._stopped = True
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(None if timeout is None else timeout / 1000.0)
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _run(self):
+        while not self._stopped:
+            self.dispatch(Dispatcher._WAIT_INTERVAL)
+
+    def _wait(self, timeout):
+        with self._condition:
+            inputs = [handler.input for handler in self._handlers.values()]
+            busy = any(handler.busy for handler in self._handlers.values())
+            if busy:
+                # The inputs whose handlers are running may be the ones with
+                # data, so Connector.wait() could return immediately
+                interval = Dispatcher._BUSY_WAIT_INTERVAL
+                if timeout is not None:
+                    interval = min(interval, timeout / 1000.0)
+                self._condition.wait(interval)
+                return
+
+        deadline = None if timeout is None else time.time() + timeout / 1000.0
+        try:
+            self.connector.wait(timeout)
+        except TimeoutError:
+            return
+
+        # Connector.wait() also returns when an Input without a handler has
+        # data, and keeps returning immediately until that data is taken; in
+        # that case, poll the inputs with a handler until the timeout
+        while not self._has_data(inputs):
+            interval = Dispatcher._POLL_INTERVAL
+            if deadline is not None:
+                interval = min(interval, deadline - time.time())
+                if interval <= 0:
+                    return
+            with self._condition:
+                if self._stopped:
+                    return
+                self._condition.wait(interval)
+                inputs = [handler.input for handler in self._handlers.values()]
+
+    @staticmethod
+    def _has_data(inputs):
+        for input in inputs: # pylint: disable=redefined-builtin
+            try:
+                input.wait(0)
+                return True
+            except TimeoutError:
+                pass
+        return False
+
+    def _dispatch_round(self):
+        with self._condition:
+            handlers = list(self._handlers.values())
+
+        dispatched = 0
+        for handler in handlers:
+            if handler.busy:
+                continue
+            if not handler.pending:
+                handler.pending.extend(self._take(handler.input))
+            if not handler.pending:
+                continue
+            count = len(handler.pending)
+            if handler.max_samples is not None:
+                count = min(count, handler.max_samples)
+            batch = [handler.pending.popleft() for _ in range(count)]
+            dispatched += count
+            handler.busy = True
+            if self.executor is None:
+                self._call(handler, batch)
+            else:
+                self.executor.submit(self._call, handler, batch)
+        return dispatched
+
+    def _take(self, input): # pylint: disable=redefined-builtin
+        # Probing the Input is much cheaper than taking and returning an empty
+        # loan. The probe doesn't detect samples that have already been read,
+        # which can only remain if the application called Input.read().
+        if not input._read_state.may_have_read_samples and \
+                not self._has_data([input]): # pylint: disable=protected-access
+            return []
+        # Copy the data out of the loaned samples so that they can be returned
+        # and the handlers can run without holding the lock
+        with self.lock:
+            input.take()
+            try:
+                return [sample.get_json_bytes() for sample in input.samples.valid_data_iter]
+            finally:
+                input.return_samples()
+
+    def _call(self, handler, batch):
+        try:
+            handler.function([_json_codec.decode(data) for data in batch])
+        except Exception as error: # pylint: disable=broad-except
+            self.last_error = error
+        finally:
+            with self._condition:
+                handler.busy = False
+                self._condition.notify_all()
+
+class Prefetcher:
+    """Takes and decodes the data of an :class:`Input` in a background thread
+
+    An application that waits for data, calls :meth:`Input.take` and then
+    processes the samples does nothing else while it waits and while it copies
+    the data out of the native samples. A ``Prefetcher``, created with
+    :meth:`Input.prefetch`, does that work in a dedicated thread: it waits for
+    data, takes the samples, decodes them, returns the samples (see
+    :meth:`Input.return_samples`) and puts the decoded batch in a bounded queue.
+    The application gets the batches with :meth:`get()` or by iterating over
+    the ``Prefetcher``, so while it processes one batch the next one is prepared::
+
+        with input.prefetch(depth=2) as prefetcher:
+            for batch in prefetcher:
+                for data in batch:
+                    print(data["x"])
+
+    Each batch is decoded in one of these formats:
+
+    * ``"dict"``: a list with the data of each valid sample as a dictionary
+    * ``"json"``: a list with the data of each valid sample as a UTF-8 encoded JSON string (``bytes``)
+    * ``"columns"``: a :class:`Columns` object with the values of ``fields`` and ``info``, as in :meth:`Input.take_columns`
+
+    The batches don't reference any native sample, so they can be kept after
+    the next batch is obtained. Batches without any valid sample are
+    skipped, except in the ``"columns"`` format. When the queue has ``depth``
+    batches, the background thread stops taking samples until the application
+    gets the next batch.
+
+    Because :class:`Input` operations are not thread-safe, the background
+    thread holds :attr:`lock` during every call on the ``Input`` except
+    :meth:`Input.wait`. Applications that use the ``Input`` directly while the
+    ``Prefetcher`` is running must hold the same lock.
+
+    A ``Prefetcher`` must be closed with :meth:`close()`, which discards any
+    batches not obtained yet. It can also be used as a context manager.
+
+    Attributes:
+        * ``input`` (:class:`Input`): The ``Input`` whose samples are taken
+        * ``lock``: The lock that protects the calls on the ``Input``
+        * ``last_error`` (``Exception``): The error that stopped the background thread, or ``None``
+    """
+
+    _DECODE_FORMATS = ("dict", "json", "columns")
+
+    # How long each wait of the background thread lasts, in milliseconds
+    _WAIT_INTERVAL = 200
+
+    def __init__(self, input, depth=2, decode="dict", fields=None, info=None): # pylint: disable=redefined-builtin, too-many-arguments
+        if decode not in Prefetcher._DECODE_FORMATS:
+            raise ValueError("decode must be one of " + ", ".join(Prefetcher._DECODE_FORMATS))
+        if depth < 1:
+            raise ValueError("depth must be positive")
+        if decode == "columns" and not fields:
+            raise ValueError("fields are required to decode the samples as columns")
+        self.input = input
+        self.depth = depth
+        self.decode = decode
+        self.fields = list(fields or [])
+        self.info = list(info or [])
+        self.lock = threading.RLock()
+        self.last_error = None
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name="Prefetcher(" + input.name + ")")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def get(self, timeout=None):
+        """Returns the next batch, waiting until one is available
+
+        If the operation times out, it raises :class:`TimeoutError`. If the
+        background thread stopped because of an error, it raises that error
+        once the batches prepared before the error have been obtained.
+
+        :param number timeout: The maximum time to wait in milliseconds. By default, infinite.
+        :return: The decoded batch, in the format chosen in :meth:`Input.prefetch`
+        """
+
+        batch = self._next_batch(timeout)
+        if batch is None:
+            raise Error("Prefetcher is closed")
+        return batch
+
+    def __iter__(self):
+        """Iterates over the batches until the ``Prefetcher`` is closed"""
+
+        batch = self._next_batch(None)
+        while batch is not None:
+            yield batch
+            batch = self._next_batch(None)
+
+    def _next_batch(self, timeout):
+        deadline = None if timeout is None else _perf_counter() + timeout / 1000.0
+        with self._condition:
+            while not self._queue:
+                if self.last_error is not None:
+                    raise self.last_error
+                if self._closed:
+                    return None
+                if deadline is None:
+                    self._condition.wait()
+                else:
+                    remaining = deadline - _perf_counter()
+                    if remaining <= 0:
+                        raise TimeoutError()
+                    self._condition.wait(remaining)
+            batch = self._queue.popleft()
+            self._condition.notify_all()
+        return batch
+
+    def close(self, timeout=None):
+        """Stops the background thread and discards the batches not obtained yet
+
+        :param number timeout: The maximum time to wait in milliseconds for the thread to finish. By default, infinite.
+        """
+
+        with self._condition:
+            self._closed = True
+            self._queue.clear()
+            self._condition.notify_all()
+        self._thread.join(None if timeout is None else timeout / 1000.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def queue_depth(self):
+        """The number of batches ready to be obtained"""
+        return len(self._queue)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while len(self._queue) >= self.depth and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+
+            try:
+                self.input.wait(Prefetcher._WAIT_INTERVAL)
+                batch = self._take()
+            except TimeoutError:
+                continue
+            except Exception as error: # pylint: disable=broad-except
+                with self._condition:
+                    self.last_error = error
+                    self._condition.notify_all()
+                return
+
+            if self.decode != "columns" and not batch:
+                continue
+            with self._condition:
+                if self._closed:
+                    return
+                self._queue.append(batch)
+                self._condition.notify_all()
+
+    def _take(self):
+        # Copy the data out of the loaned samples while holding the lock and
+        # decode the dictionaries after releasing it
+        input = self.input # pylint: disable=redefined-builtin
+        with self.lock:
+            input.take()
+            try:
+                if self.decode == "columns":
+                    return input._extract_columns(self.fields, self.info) # pylint: disable=protected-access
+                batch = [sample.get_json_bytes() for sample in input.samples.valid_data_iter]
+            finally:
+                input.return_samples()
+        if self.decode == "dict":
+            batch = [_json_codec.decode(data) for data in batch]
+        return batch
+
 class Connector:
     """Loads a configuration and creates its Inputs and Outputs
 
@@ -1283,16 +4999,53 @@ class Connector:
             tocstring(url),
             ctypes.byref(options))
         _check_entity_creation(self.native, "Connector")
+        self._url = url
+        self._inputs = {}
+        self._outputs = {}
+        # The _ReadState of each Input, by name
+        self._read_states = {}
+        # The TypeInfo of each type, by name, and the XML configuration
+        # parsed to obtain them if the TypeCode is not available
+        self._type_infos = {}
+        self._xml_types = None
 
     def close(self):
-        """Frees all the resources created by this Connector instance"""
+        """Frees all the resources created by this Connector instance
+
+        The :class:`Input` and :class:`Output` objects obtained from this
+        ``Connector`` can't be used after calling this method.
+        """
         connector_binding.delete(self.native)
         self.native = 0
+        self._inputs.clear()
+        self._outputs.clear()
+        self._read_states.clear()
 
     # Deprecated: use close()
     # pylint: disable=missing-docstring
     def delete(self):
         connector_binding.delete(self.native)
+        self._inputs.clear()
+        self._outputs.clear()
+        self._read_states.clear()
+
+    @property
+    def inputs(self):
+        """The Inputs obtained so far with :meth:`get_input()`
+
+        :return: A new dictionary where the keys are the Input names and the values are the :class:`Input` objects.
+        :rtype: dict
+        """
+        return dict(self._inputs)
+
+    @property
+    def outputs(self):
+        """The Outputs obtained so far with :meth:`get_output()`
+
+        :return: A new dictionary where the keys are the Output names and the values are the :class:`Output` objects.
+        :rtype: dict
+        """
+        return dict(self._outputs)
 
     def get_output(self, output_name):
         """Returns the :class:`Output` named ``output_name``
@@ -1317,13 +5070,20 @@ class Connector:
               ...
             <domain_participant_library>
 
+        The ``Output`` is created the first time this method is called with
+        a given name; subsequent calls return the same object.
+
         :param str output_name: The name of a the ``data_writer`` to load, with the format ``"PublisherName::DataWriterName"``.
         :return: The Output if it exists, or else it raises ``ValueError``.
         :rtype: :class:`Output`
 
         """
 
-        return Output(self, output_name)
+        output = self._outputs.get(output_name)
+        if output is None:
+            output = Output(self, output_name)
+            self._outputs[output_name] = output
+        return output
 
     # Deprecated: use get_output
     def getOutput(self, output_name):
@@ -1353,13 +5113,22 @@ class Connector:
               ...
             <domain_participant_library>
 
+        The ``Input`` is created the first time this method is called with
+        a given name; subsequent calls return the same object, which shares
+        the samples obtained by the last :meth:`Input.read()` or
+        :meth:`Input.take()`.
+
         :param str input_name: The name of a the ``data_reader`` to load, with the format ``"SubscriberName::DataReaderName"``.
         :return: The Input if it exists, or else it raises ``ValueError``.
         :rtype: :class:`Input`
 
         """
 
-        return Input(self, input_name)
+        input = self._inputs.get(input_name) # pylint: disable=redefined-builtin
+        if input is None:
+            input = Input(self, input_name)
+            self._inputs[input_name] = input
+        return input
 
     # Deprecated: use get_input()
     def getInput(self, input_name):
@@ -1379,6 +5148,18 @@ class Connector:
         retcode = connector_binding.wait(self.native, timeout)
         _check_retcode(retcode)
 
+    def wait_async(self, timeout=None):
+        """Returns an awaitable that waits for data to be received on any input
+
+        This is the ``asyncio`` version of :meth:`wait()`. See
+        :mod:`rticonnextdds_connector.aio`. Requires Python 3.6 or newer.
+
+        :param number timeout: The maximum to wait in milliseconds. By default, infinite.
+        """
+
+        from . import aio # pylint: disable=import-outside-toplevel
+        return aio.wait(self, timeout)
+
     @staticmethod
     def set_max_objects_per_thread(value):
         """Allows increasing the number of Connector instances that can be created
@@ -1415,12 +5196,12 @@ class Connector:
         # First, try to get the version of the Connector API from setup.py
         # If Connector was git cloned (as opposed to installed via pip) this
         # will fail and we will print "unknown" for the version
-        try:
-            setup_py_version = pkg_resources.require("rticonnextdds-connector")[0].version
+        setup_py_version = _get_distribution_version("rticonnextdds-connector")
+        if setup_py_version is not None:
             # The version contained in setup.py contains 3 ints, e.g. 1.1.0
             version_ints = setup_py_version.split(".")
             api_version = str(version_ints[0]) + "." + str(version_ints[1]) + "." + str(version_ints[2])
-        except pkg_resources.DistributionNotFound:
+        else:
             api_version = "unknown"
 
         # Now get the build IDs of the native libraries
@@ -1439,6 +5220,33 @@ class Connector:
 
         return version_string
 
+def _get_distribution_version(name):
+    """Returns the version of an installed distribution, or None
+
+    The modules that provide this information are imported on demand because
+    they are slow to import.
+    """
+    # pylint: disable=import-outside-toplevel
+    try:
+        from importlib import metadata
+    except ImportError:
+        metadata = None
+    if metadata is not None:
+        try:
+            return metadata.version(name)
+        except metadata.PackageNotFoundError:
+            return None
+
+    # Python < 3.8
+    try:
+        import pkg_resources
+    except ImportError:
+        return None
+    try:
+        return pkg_resources.require(name)[0].version
+    except pkg_resources.DistributionNotFound:
+        return None
+
 @contextmanager
 def open_connector(config_name, url):
     """A resource manager that creates and deletes a Connector
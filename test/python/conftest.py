@@ -11,6 +11,11 @@ import sys, os, pytest, threading, time
 sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
 import rticonnextdds_connector as rti
 
+# The asyncio tests use syntax that requires Python 3.6
+collect_ignore = []
+if sys.version_info < (3, 6):
+  collect_ignore.append("test_rticonnextdds_aio.py")
+
 """
 This module contains pytest fixtures used for testing connector code.
 """
@@ -0,0 +1,144 @@
+###############################################################################
+# (c) 2020 Copyright, Real-Time Innovations.  All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+import pytest,sys,os
+sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
+import rticonnextdds_connector as rti
+
+asyncio = pytest.importorskip("asyncio")
+from rticonnextdds_connector import aio
+
+def run(coroutine):
+  loop = asyncio.new_event_loop()
+  try:
+    return loop.run_until_complete(coroutine)
+  finally:
+    loop.close()
+
+class TestAio:
+  """
+  This class tests the asyncio integration in rticonnextdds_connector.aio
+  """
+
+  def test_wait_async(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+
+    async def write_later():
+      await asyncio.sleep(0.2)
+      output.instance["x"] = 3
+      output.write()
+
+    async def main():
+      await asyncio.gather(input.wait_async(10000), write_later())
+      input.take()
+      return input.samples[0]["x"]
+
+    assert run(main()) == 3
+
+  def test_wait_async_timeout(self, one_use_connector):
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    with pytest.raises(rti.TimeoutError):
+      run(input.wait_async(100))
+    with pytest.raises(rti.TimeoutError):
+      run(one_use_connector.wait_async(0))
+
+  def test_wait_async_long_timeout(self, one_use_connector):
+    # The wait is split into several intervals
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    with pytest.raises(rti.TimeoutError):
+      run(input.wait_async(aio._WAIT_INTERVAL + 200))
+
+  def test_wait_async_does_not_block_loop(self, one_use_connector):
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    ticks = []
+
+    async def tick():
+      for i in range(0, 5):
+        ticks.append(i)
+        await asyncio.sleep(0.01)
+
+    async def main():
+      wait_task = asyncio.ensure_future(input.wait_async(500))
+      await tick()
+      with pytest.raises(rti.TimeoutError):
+        await wait_task
+
+    run(main())
+    assert ticks == [0, 1, 2, 3, 4]
+
+  def test_stream(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+
+    async def main():
+      received = []
+      output.instance["x"] = 1
+      output.write()
+      async for samples in input.stream():
+        received.extend(s["x"] for s in samples.valid_data_iter)
+        if len(received) == 3:
+          break
+        output.instance["x"] = received[-1] + 1
+        output.write()
+      return received
+
+    assert run(main()) == [1, 2, 3]
+
+  def test_output_wait_async(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+
+    async def main():
+      await aio.wait_for_subscriptions(output, 5000)
+      output.write()
+      await output.wait_async(5000)
+      await input.wait_async(5000)
+
+    run(main())
+
+  def test_set_executor(self, one_use_connector):
+    concurrent_futures = pytest.importorskip("concurrent.futures")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    executor = concurrent_futures.ThreadPoolExecutor(max_workers=1)
+    aio.set_executor(executor)
+    try:
+      assert aio.get_executor() is executor
+      with pytest.raises(rti.TimeoutError):
+        run(input.wait_async(10))
+    finally:
+      aio.set_executor(None)
+      executor.shutdown()
+    assert aio.get_executor() is not executor
+
+  def test_more_waits_than_threads(self, one_use_connector, monkeypatch):
+    concurrent_futures = pytest.importorskip("concurrent.futures")
+    monkeypatch.setattr(aio, "_WAIT_INTERVAL", 50)
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    other_input = one_use_connector.get_input("MySubscriber::MyUnkeyedSquareReader")
+    executor = concurrent_futures.ThreadPoolExecutor(max_workers=1)
+    aio.set_executor(executor)
+
+    async def write_later():
+      await asyncio.sleep(0.2)
+      output.write()
+
+    async def main():
+      # The first wait holds the only thread; the second one takes turns
+      other_wait = asyncio.ensure_future(other_input.wait_async(10000))
+      await asyncio.gather(input.wait_async(5000), write_later())
+      other_wait.cancel()
+      with pytest.raises(asyncio.CancelledError):
+        await other_wait
+
+    try:
+      run(main())
+    finally:
+      aio.set_executor(None)
+      executor.shutdown()
@@ -0,0 +1,80 @@
+###############################################################################
+# (c) 2020 Copyright, Real-Time Innovations.  All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+import pytest,sys,os,json
+sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
+import rticonnextdds_connector as rti
+from rticonnextdds_connector import bench
+
+class TestBench:
+  """
+  This class tests the benchmarks in rticonnextdds_connector.bench
+  """
+
+  def test_run_benchmarks(self):
+    report = bench.run_benchmarks(iterations=3, warmup=1, import_runs=2)
+    assert report["iterations"] == 3
+    assert report["warmup"] == 1
+    assert sorted(report["results"].keys()) == sorted(bench.benchmark_names())
+    assert report["results"]["import"]["count"] == 2
+    for name, result in report["results"].items():
+      assert result["count"] == (2 if name == "import" else 3)
+      assert result["min_ns"] <= result["p50_ns"] <= result["p99_ns"] <= result["max_ns"]
+
+  def test_filter(self):
+    report = bench.run_benchmarks(iterations=2, warmup=0, patterns=["take*", "write"])
+    assert sorted(report["results"].keys()) == ["take[100]", "take[1]", "write"]
+
+  def test_invalid_iterations(self):
+    with pytest.raises(ValueError):
+      bench.run_benchmarks(iterations=0)
+    with pytest.raises(ValueError):
+      bench.run_benchmarks(warmup=-1)
+
+  def test_wait_for_samples_timeout(self, one_use_connector):
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    with pytest.raises(rti.TimeoutError) as excinfo:
+      bench.wait_for_samples(input, 1, timeout=10)
+    assert excinfo.value.samples_written is None
+    assert str(excinfo.value) == "DDS Timeout Error"
+
+  def test_summarize(self):
+    summary = bench.summarize(list(range(100, 0, -1)))
+    assert summary["count"] == 100
+    assert summary["min_ns"] == 1
+    assert summary["max_ns"] == 100
+    assert summary["p50_ns"] == 50
+    assert summary["p90_ns"] == 90
+    assert summary["p99_ns"] == 99
+    assert summary["mean_ns"] == 50.5
+    with pytest.raises(ValueError):
+      bench.summarize([])
+
+  def test_compare(self):
+    baseline = {"results": {
+      "a": {"p50_ns": 100}, "b": {"p50_ns": 100}, "c": {"p50_ns": 100}}}
+    report = {"results": {
+      "a": {"p50_ns": 105}, "b": {"p50_ns": 120}, "d": {"p50_ns": 1000}}}
+    assert bench.compare(report, baseline) == [("b", 100, 120)]
+    assert bench.compare(report, baseline, threshold=0.25) == []
+    assert bench.compare(report, baseline, threshold=0.01) == [
+      ("a", 100, 105), ("b", 100, 120)]
+
+  def test_main(self, tmpdir):
+    output = str(tmpdir.join("results.json"))
+    assert bench.main(["-n", "2", "-w", "0", "-k", "write", "-o", output]) == 0
+    with open(output) as output_file:
+      report = json.load(output_file)
+    assert list(report["results"].keys()) == ["write"]
+
+    # A baseline that every run regresses from
+    report["results"]["write"]["p50_ns"] = 0
+    baseline = str(tmpdir.join("baseline.json"))
+    with open(baseline, "w") as baseline_file:
+      json.dump(report, baseline_file)
+    assert bench.main(["-n", "2", "-w", "0", "-k", "write", "-b", baseline]) == 1
@@ -130,6 +130,61 @@ class TestConnector:
         assert bool(re.match(".*NDDSC_BUILD_" + version_regex, version_string, re.DOTALL)) == True
         assert bool(re.match(".*RTICONNECTOR_BUILD_" + version_regex, version_string, re.DOTALL)) == True
 
+    def test_import_is_lazy(self):
+        """
+        Importing the package doesn't load the native libraries or slow
+        modules; they're loaded the first time they're needed
+        """
+        import subprocess
+        script = "\n".join([
+            "import sys",
+            "import rticonnextdds_connector as rti",
+            "module = sys.modules['rticonnextdds_connector.rticonnextdds_connector']",
+            "assert module._loaded_connector_binding is None",
+            "assert 'pkg_resources' not in sys.modules",
+            "assert rti.stats() == {}",
+            "rti.Connector.get_version()",
+            "assert module._loaded_connector_binding is not None",
+            "assert module.connector_binding is module._loaded_connector_binding",
+            "assert rti.connector_binding is module._loaded_connector_binding"])
+        package_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "../..")
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [package_path] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+        subprocess.check_call([sys.executable, "-c", script], env=env)
+
+    def test_inputs_and_outputs_are_cached(self):
+        """
+        get_input and get_output return the same object for the same name,
+        and the Connector keeps them until it's closed
+        """
+        xml_path = os.path.join(os.path.dirname(
+                os.path.realpath(__file__)),
+                "../xml/TestConnector.xml")
+        with rti.open_connector(
+                config_name="MyParticipantLibrary::SingleUseParticipant",
+                url=xml_path) as connector:
+            assert connector.inputs == {}
+            assert connector.outputs == {}
+            input = connector.get_input("MySubscriber::MySquareReader")
+            output = connector.get_output("MyPublisher::MySquareWriter")
+            assert connector.get_input("MySubscriber::MySquareReader") is input
+            assert connector.get_output("MyPublisher::MySquareWriter") is output
+            assert connector.inputs == {"MySubscriber::MySquareReader": input}
+            assert connector.outputs == {"MyPublisher::MySquareWriter": output}
+
+            # The registries can't be modified
+            connector.inputs.clear()
+            assert len(connector.inputs) == 1
+
+            with pytest.raises(rti.Error):
+                connector.get_input("MySubscriber::NonExistentReader")
+            assert len(connector.inputs) == 1
+
+            connector.close()
+            assert connector.inputs == {}
+            assert connector.outputs == {}
+
     def test_setting_max_objects_per_thread(self):
         """
         It should be possible to modify max_objects_per_thread
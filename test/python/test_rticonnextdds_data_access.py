@@ -6,7 +6,7 @@
 # This code contains trade secrets of Real-Time Innovations, Inc.             #
 ###############################################################################
 
-import pytest,time,sys,os,ctypes,json
+import pytest,time,sys,os,ctypes,json,array
 sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../../")
 import rticonnextdds_connector as rti
 from test_utils import send_data, wait_for_data, open_test_connector
@@ -249,6 +249,20 @@ class TestDataAccess:
     test_input.return_samples()
     assert test_input.samples.length == 0
 
+  def test_take_columns_int64(self, test_output, test_input):
+    test_output.instance.set_dictionary({
+      "my_long": -7,
+      "my_int64": -18014398509481984,
+      "my_uint64": 18014398509481984})
+    test_output.write(source_timestamp=4294967296000)
+    wait_for_data(test_input, do_take=False)
+    columns = test_input.take_columns(
+      ["my_long", "my_int64", "my_uint64"], info=["source_timestamp"])
+    assert list(columns["my_long"]) == [-7]
+    assert list(columns["my_int64"]) == [-18014398509481984]
+    assert list(columns["my_uint64"]) == [18014398509481984]
+    assert list(columns.info["source_timestamp"]) == [4294967296000]
+
   def test_return_samples_in_wait(self, test_output, test_input):
     test_output.instance.set_number("my_long", 33)
 
@@ -527,6 +541,238 @@ class TestDataAccess:
     count = get_member_count(test_output.instance.native)
     assert count > 0
 
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_set_array(self, test_output, test_input):
+    test_output.instance.set_array("my_int_sequence", array.array("i", [1, 2, 3]))
+    sample = send_data(test_output, test_input)
+    assert sample["my_int_sequence"] == [1, 2, 3]
+
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_set_array_resizes_sequence(self, test_output, test_input):
+    test_output.instance["my_int_sequence"] = [1, 2, 3, 4]
+    data = array.array("i", [5])
+    if sys.version_info[0] >= 3:
+      # Python 2's array doesn't support the buffer protocol used by memoryview
+      data = memoryview(data)
+    test_output.instance.set_array("my_int_sequence", data)
+    sample = send_data(test_output, test_input)
+    assert sample["my_int_sequence"] == [5]
+
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_set_empty_array(self, test_output, test_input):
+    test_output.instance["my_int_sequence"] = [1, 2]
+    test_output.instance.set_array("my_int_sequence", array.array("i"))
+    sample = send_data(test_output, test_input)
+    assert sample["my_int_sequence"] == []
+
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_set_array_wrong_element_type(self, test_output):
+    with pytest.raises(rti.Error, match=r".*DDS_DynamicData_set_double_array.*"):
+      test_output.instance.set_array("my_int_sequence", array.array("d", [1.0]))
+
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_get_array(self, populated_input):
+    values = populated_input.samples[0].get_array("my_int_sequence")
+    assert values == array.array("i", [1, 2, 3])
+
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_get_array_with_dtype(self, populated_input):
+    values = populated_input.samples[0].get_array("my_int_sequence", dtype="i")
+    assert values.tolist() == [1, 2, 3]
+
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_get_array_into_buffer(self, populated_input):
+    out = array.array("i", [0] * 10)
+    count = populated_input.samples[0].get_array("my_int_sequence", out=out)
+    assert count == 3
+    assert out[:count].tolist() == [1, 2, 3]
+
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_get_array_into_small_buffer(self, populated_input):
+    with pytest.raises(rti.Error):
+      populated_input.samples[0].get_array("my_int_sequence", out=array.array("i", [0]))
+
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_get_array_bad_arguments(self, populated_input):
+    sample = populated_input.samples[0]
+    with pytest.raises(ValueError):
+      sample.get_array("my_int_sequence", out=b"0000")
+    with pytest.raises(TypeError):
+      sample.get_array("my_point_sequence")
+    with pytest.raises(rti.Error):
+      sample.get_array("my_nonexistent_sequence")
+
+  @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+  def test_set_and_get_array(self, test_output, test_input):
+    values = array.array("i", range(10))
+    test_output.instance.set_array("my_int_sequence", values)
+    sample = send_data(test_output, test_input)
+    assert sample.get_array("my_int_sequence") == values
+
+  def test_set_array_bad_arguments(self, test_output):
+    with pytest.raises(TypeError):
+      test_output.instance.set_array("my_int_sequence", [1, 2, 3])
+    with pytest.raises(TypeError):
+      test_output.instance.set_array("my_int_sequence", array.array("u", u"abc"))
+    with pytest.raises(AttributeError):
+      test_output.instance.set_array(None, array.array("i", [1]))
+
+  def test_sample_accessor(self, populated_input):
+    sample = populated_input.samples[0]
+    assert populated_input.accessor("my_long").get(sample) == 10
+    assert populated_input.accessor("my_double").get(sample) == 3.3
+    assert populated_input.accessor("my_string").get(sample) == "hello"
+    assert populated_input.accessor("my_optional_bool").get(sample) == True
+    assert populated_input.accessor("my_point.y").get(sample) == 4
+    assert populated_input.accessor("my_int_sequence[1]").get(sample) == 2
+    assert populated_input.accessor("my_point").get(sample) == {"x": 3, "y": 4}
+    assert populated_input.accessor("my_int64").get(sample) == -18014398509481984
+
+  def test_sample_accessor_reuse(self, populated_input):
+    accessor = populated_input.accessor("my_long")
+    for sample in populated_input.samples.valid_data_iter:
+      assert accessor.get(sample) == 10
+      assert accessor.get(sample) == 10
+
+  def test_sample_accessor_unset_optional(self, populated_input):
+    accessor = populated_input.accessor("my_optional_long")
+    assert accessor.get(populated_input.samples[0]) is None
+
+  @pytest.fixture
+  def unresolved_member_kind(self, monkeypatch):
+    """Makes the first lookup of a member kind fail, as it does in the native
+    library when the field is inside an unset optional member"""
+    module = sys.modules[rti.Input.__module__]
+    get_member_kind = module._get_member_kind
+    calls = []
+    def first_call_fails(native, field_name):
+      calls.append(field_name)
+      return None if len(calls) == 1 else get_member_kind(native, field_name)
+    monkeypatch.setattr(module, "_get_member_kind", first_call_fails)
+    return calls
+
+  def test_sample_accessor_resolved_later(self, populated_input, unresolved_member_kind):
+    sample = populated_input.samples[0]
+    accessor = populated_input.accessor("my_long")
+    assert accessor.get(sample) == 10
+    assert "get" not in accessor.__dict__
+    # The next call determines the type and selects the native getter
+    assert accessor.get(sample) == 10
+    assert accessor.get == accessor._get_number
+    assert len(unresolved_member_kind) == 2
+
+  def test_instance_accessor_resolved_later(self, test_output, test_input, unresolved_member_kind):
+    accessor = test_output.instance.accessor("my_long")
+    accessor.set(1)
+    assert "set" not in accessor.__dict__
+    accessor.set(2)
+    assert accessor.set == accessor._set_number
+    assert len(unresolved_member_kind) == 2
+    sample = send_data(test_output, test_input)
+    assert sample["my_long"] == 2
+
+  def test_instance_accessor(self, test_output, test_input):
+    test_output.instance.accessor("my_long").set(20)
+    test_output.instance.accessor("my_double").set(2.5)
+    test_output.instance.accessor("my_string").set("world")
+    test_output.instance.accessor("my_boolean").set(True)
+    test_output.instance.accessor("my_point.x").set(7)
+    test_output.instance.accessor("my_int_sequence").set([4, 5])
+    test_output.instance.accessor("my_uint64").set(2**60)
+    sample = send_data(test_output, test_input)
+    assert sample["my_long"] == 20
+    assert sample["my_double"] == 2.5
+    assert sample["my_string"] == "world"
+    assert sample["my_boolean"] == True
+    assert sample["my_point.x"] == 7
+    assert sample["my_int_sequence"] == [4, 5]
+    assert sample["my_uint64"] == 2**60
+
+  def test_instance_accessor_unset_optional(self, test_output, test_input):
+    accessor = test_output.instance.accessor("my_optional_long")
+    accessor.set(5)
+    accessor.set(None)
+    sample = send_data(test_output, test_input)
+    assert sample["my_optional_long"] is None
+
+  def test_instance_accessor_bad_type(self, test_output):
+    accessor = test_output.instance.accessor("my_long")
+    accessor.set(1)
+    with pytest.raises(TypeError):
+      accessor.set("not a number")
+    with pytest.raises(AttributeError):
+      test_output.instance.accessor(None)
+
+  def test_get_json_bytes(self, populated_input, test_dictionary):
+    sample = populated_input.samples[0]
+    json_bytes = sample.get_json_bytes()
+    assert isinstance(json_bytes, bytes)
+    assert json.loads(json_bytes.decode("utf8")) == sample.get_dictionary()
+    assert json.loads(sample.get_json_bytes("my_point").decode("utf8")) == {"x": 3, "y": 4}
+
+  def test_json_buffer(self, populated_input):
+    sample = populated_input.samples[0]
+    with sample.json_buffer() as json_buffer:
+      assert json_buffer.tobytes() == sample.get_json_bytes()
+    if sys.version_info[0] >= 3:
+      with pytest.raises(ValueError):
+        json_buffer.tobytes() # released after the with block
+
+  def test_set_json_bytes(self, test_output, test_input, populated_input, test_dictionary):
+    test_output.instance.set_json_bytes(populated_input.samples[0].get_json_bytes())
+    sample = send_data(test_output, test_input)
+    assert sample.get_dictionary() == populated_input.samples[0].get_dictionary()
+
+  def test_set_json_bytes_from_buffer(self, test_output, test_input):
+    test_output.instance.set_json_bytes(bytearray(b'{"my_long": 7}'))
+    test_output.instance.set_json_bytes(memoryview(b'{"my_double": 1.5}'))
+    sample = send_data(test_output, test_input)
+    assert sample["my_long"] == 7
+    assert sample["my_double"] == 1.5
+
+  def test_set_bad_json_bytes(self, test_output):
+    with pytest.raises(rti.Error):
+      test_output.instance.set_json_bytes(b'{"my_long": ')
+    with pytest.raises(TypeError):
+      test_output.instance.set_json_bytes(u'{"my_long": 1}')
+
+  @pytest.fixture
+  def restore_json_codec(self):
+    codec = rti.get_json_codec()
+    yield
+    rti.set_json_codec(codec)
+
+  def test_custom_json_codec(self, test_output, test_input, restore_json_codec):
+    calls = {"encode": 0, "decode": 0}
+    def encode(value):
+      calls["encode"] += 1
+      return json.dumps(value).encode("utf8")
+    def decode(value):
+      calls["decode"] += 1
+      return json.loads(value.decode("utf8"))
+
+    rti.set_json_codec(rti.JsonCodec("counting", encode, decode))
+    assert rti.get_json_codec().name == "counting"
+    test_output.instance.set_dictionary({"my_point": {"x": 1, "y": 2}})
+    sample = send_data(test_output, test_input)
+    assert sample.get_dictionary("my_point") == {"x": 1, "y": 2}
+    assert sample["my_string"] == ""
+    assert calls["encode"] == 1
+    assert calls["decode"] >= 1
+
+  def test_orjson_codec(self, test_output, test_input, test_dictionary, restore_json_codec):
+    pytest.importorskip("orjson")
+    rti.set_json_codec("orjson")
+    test_output.instance.set_dictionary(test_dictionary)
+    sample = send_data(test_output, test_input)
+    assert sample.get_dictionary() == test_output.instance.get_dictionary()
+    assert sample["my_point"] == {"x": 3, "y": 4}
+
+  def test_unknown_json_codec(self, restore_json_codec):
+    with pytest.raises(ValueError):
+      rti.set_json_codec("unknown")
+    assert rti.get_json_codec().name == "json"
+
   def test_input_performance(self, populated_input):
     num_iter = 1000
     sample = populated_input.samples[0]
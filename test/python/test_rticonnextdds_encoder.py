@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+# (c) 2020 Copyright, Real-Time Innovations.  All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+import pytest,sys,os,json,array
+from collections import OrderedDict
+sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
+import rticonnextdds_connector as rti
+from test_utils import wait_for_data, open_test_connector
+
+class TestCompiledEncoder:
+  """
+  This class tests Output.compile_encoder
+  """
+
+  @pytest.fixture(scope="class")
+  def test_connector(self):
+    with open_test_connector("MyParticipantLibrary::DataAccessTest") as connector:
+      yield connector
+
+  @pytest.fixture
+  def test_output(self, test_connector):
+    output = test_connector.get_output("TestPublisher::TestWriter")
+    output.clear_members()
+    yield output
+    output._encoder = None
+
+  @pytest.fixture
+  def test_input(self, test_connector):
+    input = test_connector.get_input("TestSubscriber::TestReader")
+    input.take()
+    return input
+
+  @pytest.fixture
+  def test_dictionary(self):
+    return {
+      'my_long': 10,
+      'my_double': 3.3,
+      'my_optional_bool': True,
+      'my_enum': 1,
+      'my_string': u'hello \"world\" é',
+      'my_point': {'x': 3, 'y': 4},
+      'my_point_alias': {'x': 30, 'y': 40},
+      'my_union': {'my_int_sequence': [10, 20, 30]},
+      'my_int_union': {'my_long': 222},
+      'my_point_sequence': [{'x': 10, 'y': 20}, {'x': 11, 'y': 21}],
+      'my_int_sequence': [1, 2, 3],
+      'my_boolean': False,
+      'my_int64': -18014398509481984,
+      'my_uint64': 18014398509481984}
+
+  def test_encode(self, test_output, test_dictionary):
+    encoder = test_output.compile_encoder()
+    encoded = encoder.encode(test_dictionary)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded.decode("utf-8")) == test_dictionary
+    assert encoder(test_dictionary) == encoded
+
+  def test_encode_partial(self, test_output):
+    encoder = test_output.compile_encoder()
+    assert encoder.encode({}) == b"{}"
+    assert encoder.encode({"my_point": {"y": 2}}) == b'{"my_point":{"y":2}}'
+
+  def test_encode_buffers(self, test_output):
+    # Like the JSON codec, the encoder doesn't accept buffers
+    encoder = test_output.compile_encoder()
+    values = {"my_int_sequence": array.array("i", [1, 2, 3])}
+    with pytest.raises(TypeError):
+      encoder.encode(values)
+    test_output._encoder = None
+    with pytest.raises(TypeError):
+      test_output.instance.set_dictionary(values)
+
+  def test_encode_circular(self, test_output):
+    encoder = test_output.compile_encoder()
+    values = {"my_long": 1}
+    values["my_point"] = values
+    with pytest.raises(ValueError):
+      encoder.encode(values)
+    sequence = []
+    sequence.append(sequence)
+    with pytest.raises(ValueError):
+      encoder.encode({"my_int_sequence": sequence})
+
+  def test_encode_by_type(self, test_output):
+    encoder = test_output.compile_encoder()
+    # A partial sample keeps the order of the dictionary
+    assert encoder.encode(OrderedDict([("my_long", 1), ("my_double", 2)])) == b'{"my_long":1,"my_double":2}'
+    assert encoder.encode(OrderedDict([("my_double", 2.5), ("my_long", 1)])) == b'{"my_double":2.5,"my_long":1}'
+    assert encoder.encode(OrderedDict([("my_int_sequence", (1, 2)), ("my_string", None)])) \
+      == b'{"my_int_sequence":[1,2],"my_string":null}'
+    assert encoder.encode({"my_long": True}) == b'{"my_long":1}'
+    assert encoder.encode({"my_double": float("inf")}) == b'{"my_double":Infinity}'
+
+  def test_encode_complete_struct(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    encoder = output.compile_encoder()
+    # A complete sample is encoded in the order of declaration
+    encoded = encoder.encode({"z": True, "shapesize": 30, "y": 2, "x": 1, "color": "RED"})
+    assert encoded == b'{"color":"RED","x":1,"y":2,"shapesize":30,"z":true}'
+    encoded = encoder.encode({"color": "RED", "x": 1, "y": "2", "shapesize": 30, "z": True})
+    assert json.loads(encoded.decode("utf-8"))["y"] == "2"
+
+  def test_encode_fallback(self, test_output):
+    encoder = test_output.compile_encoder()
+    with pytest.raises(TypeError):
+      encoder.encode({"my_long": set()})
+    with pytest.raises(TypeError):
+      encoder.encode({"my_point": {"x": object()}})
+
+  def test_set_dictionary(self, test_output, test_input, test_dictionary):
+    test_output.compile_encoder()
+    test_output.instance.set_dictionary(test_dictionary)
+    test_output.write()
+    wait_for_data(test_input)
+    received = test_input.samples[0].get_dictionary()
+    for name, value in test_dictionary.items():
+      if name == "my_double":
+        assert received[name] == pytest.approx(value)
+      else:
+        assert received[name] == value
+
+  def test_write_many(self, test_output, test_input):
+    test_output.compile_encoder()
+    test_output.write_many([{"my_long": 1}, {"my_long": 2, "my_string": "two"}])
+    wait_for_data(test_input, count=2)
+    assert test_input.samples[0]["my_long"] == 1
+    assert test_input.samples[1]["my_long"] == 2
+    assert test_input.samples[1]["my_string"] == "two"
+
+  def test_shape_type(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    output.compile_encoder()
+    output.instance.set_dictionary({"color": "RED", "x": 1, "y": 2, "shapesize": 30})
+    output.write()
+    wait_for_data(input)
+    assert input.samples[0].get_dictionary() == {
+      "color": "RED", "x": 1, "y": 2, "shapesize": 30, "z": 0}
@@ -90,3 +90,176 @@ class TestInput:
 
       assert sample["my_sequence"] == [44] * 200
       assert sample["my_string"] == "A" * 200
+
+  def test_read_cache_invalidated(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    output.instance["x"] = 1
+    output.write()
+    wait_for_data(input, count=1, do_take=False)
+    assert input.samples.length == 1
+
+    output.instance["x"] = 2
+    output.write()
+    wait_for_data(input, count=2, do_take=True)
+    assert input.samples.length == 2
+    assert input.samples[1]["x"] == 2
+
+    input.return_samples()
+    assert input.samples.length == 0
+
+  def test_valid_data_cache(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    for i in range(0, 10):
+      output.instance["x"] = i
+      output.write()
+    output.write(action="dispose")
+    wait_for_data(input, count=11, do_take=True)
+
+    # The valid_data flags are the same on the first and later accesses
+    for _ in range(0, 2):
+      valid = [sample.valid_data for sample in input.samples]
+      assert valid == [1] * 10 + [0]
+    assert [s["x"] for s in input.samples.valid_data_iter] == list(range(0, 10))
+
+  def test_info_cache(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    output.write(source_timestamp=1000)
+    wait_for_data(input, count=1, do_take=True)
+    assert input.samples[0].info["source_timestamp"] == 1000
+    assert input.samples[0].info["source_timestamp"] == 1000
+
+    output.write(source_timestamp=2000)
+    wait_for_data(input, count=1, do_take=True)
+    assert input.samples[0].info["source_timestamp"] == 2000
+
+  def test_read_cache_shared_by_handles(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    other_input = rti.Input(one_use_connector, "MySubscriber::MySquareReader")
+    output.instance["x"] = 1
+    output.write(source_timestamp=1000)
+    wait_for_data(input, count=1, do_take=True)
+    assert input.samples.length == 1
+    assert input.samples[0].info["source_timestamp"] == 1000
+    assert input.samples[0].valid_data
+
+    # A take on another handle for the same reader invalidates the cached
+    # values of this one
+    output.instance["x"] = 2
+    output.write(source_timestamp=2000)
+    output.instance["x"] = 3
+    output.write(source_timestamp=3000)
+    wait_for_data(other_input, count=2, do_take=True)
+    assert input.samples.length == 2
+    assert input.samples[1].info["source_timestamp"] == 3000
+    assert [s["x"] for s in input.samples] == [2, 3]
+
+    other_input.return_samples()
+    assert input.samples.length == 0
+
+  def test_take_columns(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    for i in range(0, 5):
+      output.instance.set_dictionary({"color": "BLUE", "x": i, "y": 2 * i, "z": i % 2 == 0})
+      output.write(source_timestamp=1000 * (i + 1))
+    output.write(action="dispose")
+    wait_for_data(input, count=6, do_take=False)
+
+    columns = input.take_columns(["x", "y", "z", "color"], info=["source_timestamp"])
+    assert columns.length == 6
+    assert list(columns.valid_data) == [True] * 5 + [False]
+    assert list(columns["x"])[:5] == [0, 1, 2, 3, 4]
+    assert list(columns["y"])[:5] == [0, 2, 4, 6, 8]
+    assert list(columns["z"])[:5] == [True, False, True, False, True]
+    assert columns["color"][:5] == ["BLUE"] * 5
+    assert list(columns.info["source_timestamp"])[:5] == [1000, 2000, 3000, 4000, 5000]
+    # The samples are returned after extracting the columns
+    assert input.samples.length == 0
+
+  def test_take_columns_no_data(self, one_use_connector):
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    columns = input.take_columns(["x"])
+    assert columns.length == 0
+    assert len(columns["x"]) == 0
+
+  def test_take_batches(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    for i in range(0, 5):
+      output.instance["x"] = i
+      output.write(source_timestamp=1000 + i)
+    wait_for_data(input, count=5, do_take=False)
+
+    input.take(batch_size=2)
+    assert input.samples.length == 2
+    assert [s["x"] for s in input.samples] == [0, 1]
+    # The remaining samples are made accessible by the next calls
+    input.take(batch_size=2)
+    assert [s["x"] for s in input.samples] == [2, 3]
+    assert input.samples[1].info["source_timestamp"] == 1003
+    assert input.samples[1].get_dictionary()["x"] == 3
+    assert input.accessor("x").get(input.samples[0]) == 2
+    assert list(input.take_columns(["x"], info=["source_timestamp"])["x"]) == [4]
+    assert input.samples.length == 0
+
+    input.take(batch_size=2)
+    assert input.samples.length == 0
+
+  def test_read_batches(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    for i in range(0, 3):
+      output.instance["x"] = i
+      output.write()
+    wait_for_data(input, count=3, do_take=False)
+
+    input.read(batch_size=2)
+    assert [s["x"] for s in input.samples] == [0, 1]
+    # The samples that weren't accessible remain in the Input
+    input.read()
+    assert [s["x"] for s in input.samples] == [0, 1, 2]
+
+    # The batches taken and not accessed yet can't be read
+    input.take(batch_size=2)
+    with pytest.raises(rti.Error):
+      input.read()
+    assert [s["x"] for s in input.samples] == [0, 1]
+    input.take()
+    assert [s["x"] for s in input.samples] == [2]
+    input.read()
+    assert input.samples.length == 0
+
+    with pytest.raises(ValueError):
+      input.read(batch_size=0)
+    with pytest.raises(ValueError):
+      input.take(batch_size=-1)
+
+  def test_taken(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    for i in range(0, 3):
+      output.instance["x"] = i
+      output.write()
+    wait_for_data(input, count=3, do_take=False)
+
+    with input.taken(batch_size=2) as samples:
+      assert [s["x"] for s in samples] == [0, 1]
+    assert input.samples.length == 0
+
+    # The pending sample is available without waiting
+    input.wait(100)
+    with pytest.raises(ValueError):
+      with input.taken() as samples:
+        assert [s["x"] for s in samples] == [2]
+        raise ValueError("processing error")
+    assert input.samples.length == 0
+
+    output.instance["x"] = 3
+    output.write()
+    wait_for_data(input, count=1, do_take=False)
+    with input.taken() as samples:
+      assert [s["x"] for s in samples] == [3]
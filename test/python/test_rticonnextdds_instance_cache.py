@@ -0,0 +1,123 @@
+###############################################################################
+# (c) 2020 Copyright, Real-Time Innovations.  All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+import pytest,sys,os
+sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
+import rticonnextdds_connector as rti
+from test_utils import wait_for_data
+
+def write_shapes(output, shapes, action="write"):
+  for shape in shapes:
+    output.instance.set_dictionary(shape)
+    output.write(action=action)
+
+class TestInstanceCache:
+  """
+  This class tests Input.instance_cache
+  """
+
+  def test_last_value_per_key(self, one_use_output, one_use_input):
+    cache = one_use_input.instance_cache()
+    assert one_use_input.instance_cache() is cache
+    assert cache.key_fields == ("color",)
+    assert len(cache) == 0
+
+    write_shapes(one_use_output, [
+      {"color": "BLUE", "x": 1},
+      {"color": "RED", "x": 2},
+      {"color": "BLUE", "x": 3}])
+    wait_for_data(one_use_input, 3)
+
+    assert len(cache) == 2
+    assert "BLUE" in cache
+    assert cache["BLUE"]["x"] == 3
+    assert cache.get("RED") == one_use_input.samples[1].get_dictionary()
+    assert cache.get("GREEN") is None
+    with pytest.raises(KeyError):
+      cache["GREEN"]
+    assert sorted(cache.keys()) == ["BLUE", "RED"]
+
+    # The cache is updated incrementally
+    write_shapes(one_use_output, [{"color": "RED", "x": 4}])
+    wait_for_data(one_use_input, 1)
+    assert cache["RED"]["x"] == 4
+    assert cache["BLUE"]["x"] == 3
+
+  def test_eviction(self, one_use_output, one_use_input):
+    cache = one_use_input.instance_cache()
+    write_shapes(one_use_output, [
+      {"color": "BLUE", "x": 1},
+      {"color": "RED", "x": 2},
+      {"color": "GREEN", "x": 3}])
+    wait_for_data(one_use_input, 3)
+    assert len(cache) == 3
+
+    write_shapes(one_use_output, [{"color": "BLUE"}], action="dispose")
+    wait_for_data(one_use_input, 1)
+    assert "BLUE" not in cache
+
+    write_shapes(one_use_output, [{"color": "RED"}], action="unregister")
+    wait_for_data(one_use_input, 1)
+    assert sorted(cache.keys()) == ["GREEN"]
+
+  def test_read_does_not_apply_samples_twice(self, one_use_output, one_use_input):
+    cache = one_use_input.instance_cache()
+    write_shapes(one_use_output, [{"color": "BLUE", "x": 1}])
+    wait_for_data(one_use_input, 1, do_take=False)
+    cache.clear()
+    one_use_input.read()
+    assert len(cache) == 0
+    one_use_input.take()
+    assert len(cache) == 0
+
+  def test_snapshot(self, one_use_output, one_use_input):
+    cache = one_use_input.instance_cache()
+    write_shapes(one_use_output, [
+      {"color": "BLUE", "x": 1},
+      {"color": "RED", "x": 2}])
+    wait_for_data(one_use_input, 2)
+    snapshot = cache.snapshot()
+    assert sorted(snapshot) == ["BLUE", "RED"]
+    assert snapshot["RED"]["x"] == 2
+    snapshot["RED"]["x"] = 10
+    assert cache["RED"]["x"] == 2
+
+  def test_multiple_keys(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MyMultipleKeyedSquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MyMultipleKeyedSquareReader")
+    cache = input.instance_cache()
+    write_shapes(output, [
+      {"color": "BLUE", "other_color": "RED", "y": 1, "z": True, "x": 1},
+      {"color": "BLUE", "other_color": "RED", "y": 2, "z": True, "x": 2},
+      {"color": "BLUE", "other_color": "RED", "y": 1, "z": True, "x": 3}])
+    wait_for_data(input, 3)
+    assert len(cache) == 2
+    assert cache[("BLUE", "RED", 1, True)]["x"] == 3
+    assert cache[("BLUE", "RED", 2, True)]["x"] == 2
+
+  def test_nested_keys(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MyNestedKeyedSquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MyNestedKeyedSquareReader")
+    cache = input.instance_cache()
+    write_shapes(output, [{
+      "keyed_shape": {"color": "BLUE", "x": 1, "y": 2, "shapesize": 3, "z": False},
+      "keyed_nested_member": {"color": "RED"},
+      "keyed_toplevel_member": 7,
+      "unkeyed_toplevel_member": 8}])
+    wait_for_data(input, 1)
+    assert list(cache) == [(("BLUE", 1, 2, 3, False), "RED", 7)]
+    assert cache[(("BLUE", 1, 2, 3, False), "RED", 7)]["unkeyed_toplevel_member"] == 8
+
+  def test_unkeyed(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MyUnkeyedSquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MyUnkeyedSquareReader")
+    cache = input.instance_cache()
+    write_shapes(output, [{"color": "BLUE", "x": 1}, {"color": "RED", "x": 2}])
+    wait_for_data(input, 2)
+    assert cache.keys() == [()]
+    assert cache[()]["color"] == "RED"
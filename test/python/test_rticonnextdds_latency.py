@@ -0,0 +1,156 @@
+###############################################################################
+# (c) 2020 Copyright, Real-Time Innovations.  All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+import pytest,sys,os
+sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
+import rticonnextdds_connector as rti
+from test_utils import *
+
+class TestLatencyHistogram:
+  """
+  This class tests rticonnextdds_connector.LatencyHistogram
+  """
+
+  def test_empty(self):
+    histogram = rti.LatencyHistogram()
+    assert histogram.count == 0
+    assert histogram.max is None
+    assert histogram.percentile(50) is None
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 0
+    assert snapshot["p99_ns"] is None
+
+  def test_invalid_buckets(self):
+    with pytest.raises(ValueError):
+      rti.LatencyHistogram(buckets=0)
+    with pytest.raises(ValueError):
+      rti.LatencyHistogram(buckets=48)
+
+  def test_exact_values(self):
+    histogram = rti.LatencyHistogram(buckets=64)
+    histogram.record_many(range(1, 64))
+    assert histogram.percentile(50) == 32
+    assert histogram.percentile(100) == 63
+    assert histogram.percentile(0) == 1
+
+  def test_precision(self):
+    histogram = rti.LatencyHistogram(buckets=64)
+    values = [1000 * i for i in range(1, 10001)]
+    histogram.record_many(values)
+    for percentile in [50, 90, 99, 99.9]:
+      expected = values[int(len(values) * percentile / 100) - 1]
+      reported = histogram.percentile(percentile)
+      assert reported >= expected
+      assert (reported - expected) / float(expected) <= 2.0 / 64
+    assert histogram.max == 10000000
+    assert histogram.percentile(100) == 10000000
+
+  def test_large_values(self):
+    histogram = rti.LatencyHistogram()
+    histogram.record(2**62)
+    histogram.record(-5)
+    assert histogram.snapshot()["min_ns"] == 0
+    assert histogram.percentile(100) == 2**62
+
+  def test_snapshot_and_reset(self):
+    histogram = rti.LatencyHistogram()
+    histogram.record_many([10, 20, 30])
+    snapshot = histogram.snapshot(reset=True)
+    assert snapshot["count"] == 3
+    assert snapshot["min_ns"] == 10
+    assert snapshot["max_ns"] == 30
+    assert snapshot["mean_ns"] == 20
+    assert snapshot["p50_ns"] == 20
+    assert snapshot["p999_ns"] == 30
+    assert histogram.count == 0
+
+class TestLatencyTracking:
+  """
+  This class tests Input.enable_latency_tracking
+  """
+
+  def test_disabled_by_default(self, one_use_connector):
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    assert input.latency_histogram is None
+
+  def test_take(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    histogram = input.enable_latency_tracking()
+    assert input.latency_histogram is histogram
+    assert input.enable_latency_tracking() is histogram
+
+    for i in range(0, 3):
+      output.instance["x"] = i
+      output.write()
+    wait_for_data(input, count=3)
+
+    assert histogram.count == 3
+    assert histogram.percentile(99) >= 0
+
+  def test_source_timestamp(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    histogram = input.enable_latency_tracking()
+    output.write(source_timestamp=0)
+    input.wait(5000)
+    input.take()
+    assert histogram.count == 1
+    # The reception timestamp is the current time
+    assert histogram.max == input.samples[0].info["reception_timestamp"]
+
+  def test_read_counts_samples_once(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    histogram = input.enable_latency_tracking()
+    output.instance["x"] = 1
+    output.write()
+    input.wait(5000)
+    input.read()
+    assert histogram.count == 1
+    input.read()
+    assert histogram.count == 1
+    output.instance["x"] = 2
+    output.write()
+    input.wait(5000)
+    input.take()
+    assert histogram.count == 2
+
+  def test_info_cached(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    input.enable_latency_tracking()
+    output.write(source_timestamp=1000)
+    input.wait(5000)
+    rti.reset_stats()
+    rti.enable_stats()
+    try:
+      input.read()
+      assert rti.stats()["get_any_from_info"]["calls"] == 2
+      # The timestamps obtained to record the latency are reused
+      assert input.samples[0].info["source_timestamp"] == 1000
+      assert input.samples[0].info["reception_timestamp"] > 1000
+      assert rti.stats()["get_any_from_info"]["calls"] == 2
+
+      input.read()
+      assert input.samples[0].info["sample_state"] == "READ"
+      assert rti.stats()["get_any_from_info"]["calls"] == 3
+    finally:
+      rti.disable_stats()
+      rti.reset_stats()
+
+  def test_disable(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    histogram = input.enable_latency_tracking()
+    input.disable_latency_tracking()
+    assert input.latency_histogram is None
+    output.write()
+    input.wait(5000)
+    input.take()
+    assert histogram.count == 0
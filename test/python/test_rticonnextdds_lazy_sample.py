@@ -0,0 +1,118 @@
+###############################################################################
+# (c) 2020 Copyright, Real-Time Innovations.  All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+import pytest,sys,os
+sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
+import rticonnextdds_connector as rti
+from test_utils import wait_for_data, open_test_connector
+
+try:
+  from collections.abc import Mapping
+except ImportError:
+  from collections import Mapping
+
+class TestLazySample:
+  """
+  This class tests SampleIterator.view
+  """
+
+  @pytest.fixture(scope="class")
+  def test_connector(self):
+    with open_test_connector("MyParticipantLibrary::DataAccessTest") as connector:
+      yield connector
+
+  @pytest.fixture(scope="class")
+  def test_dictionary(self):
+    return {
+      'my_long': 10,
+      'my_double': 3.5,
+      'my_optional_bool': True,
+      'my_enum': 1,
+      'my_string': 'hello',
+      'my_point': {'x': 3, 'y': 4},
+      'my_union': {'my_int_sequence': [10, 20, 30]},
+      'my_int_sequence': [1, 2, 3],
+      'my_boolean': False,
+      'my_int64': -18014398509481984}
+
+  @pytest.fixture
+  def populated_input(self, test_connector, test_dictionary):
+    output = test_connector.get_output("TestPublisher::TestWriter")
+    input = test_connector.get_input("TestSubscriber::TestReader")
+    input.take()
+    output.clear_members()
+    output.instance.set_dictionary(test_dictionary)
+    output.write()
+    wait_for_data(input, do_take=False)
+    return input
+
+  def test_view_is_a_mapping(self, populated_input):
+    view = populated_input.samples[0].view()
+    assert isinstance(view, Mapping)
+    assert isinstance(view, rti.LazySample)
+
+  def test_lazy_values(self, populated_input, test_dictionary):
+    sample = populated_input.samples[0]
+    # A large threshold keeps the view from obtaining the whole sample
+    view = sample.view(threshold=100)
+    for name, value in test_dictionary.items():
+      assert view[name] == value
+      assert type(view[name]) == type(sample.get_dictionary()[name])
+    assert view._dictionary is None
+    assert view["my_point.y"] == 4
+    assert view["my_optional_long"] is None
+
+  def test_threshold(self, populated_input, test_dictionary):
+    view = populated_input.samples[0].view(threshold=3)
+    assert view["my_long"] == 10
+    assert view["my_string"] == "hello"
+    assert view._dictionary is None
+    assert view["my_point"] == {"x": 3, "y": 4}
+    assert view._dictionary is not None
+    assert view["my_double"] == 3.5
+    assert view["my_point.x"] == 3
+
+  def test_iteration(self, populated_input):
+    sample = populated_input.samples[0]
+    view = sample.view()
+    assert dict(view) == sample.get_dictionary()
+    assert len(view) == len(sample.get_dictionary())
+    assert set(view.keys()) == set(sample.get_dictionary().keys())
+
+  def test_unknown_member(self, populated_input):
+    view = populated_input.samples[0].view()
+    with pytest.raises(KeyError):
+      view["nonexistent_member"]
+    assert "nonexistent_member" not in view
+    assert view.get("nonexistent_member", 5) == 5
+    assert "my_long" in view
+
+  def test_invalidated_by_read(self, populated_input):
+    view = populated_input.samples[0].view()
+    assert view["my_long"] == 10
+    populated_input.read()
+    with pytest.raises(rti.Error):
+      view["my_long"]
+    with pytest.raises(rti.Error):
+      len(view)
+
+  @pytest.mark.parametrize("value", ["123", "-1.5", "true", "null", ""])
+  def test_string_values(self, test_connector, value):
+    output = test_connector.get_output("TestPublisher::TestWriter")
+    input = test_connector.get_input("TestSubscriber::TestReader")
+    input.take()
+    output.clear_members()
+    output.instance.set_dictionary({"my_string": value})
+    output.write()
+    wait_for_data(input, do_take=False)
+    sample = input.samples[0]
+    # Strings that look like other JSON values are still strings
+    view = sample.view(threshold=100)
+    assert view["my_string"] == value
+    assert view["my_string"] == sample.get_dictionary()["my_string"]
+    assert view._dictionary is None
@@ -9,6 +9,7 @@
 import pytest,sys,os
 sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
 import rticonnextdds_connector as rti
+from test_utils import wait_for_data
 
 class TestOutput:
   """
@@ -318,3 +319,151 @@ class TestInstance:
       one_use_output.write(identity="invalid")
     with pytest.raises(rti.Error, match=r".*error parsing source_timestamp.*") as execinfo:
       one_use_output.write(source_timestamp=3.4)
+
+  def test_write_many(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    summary = output.write_many(
+      [{"color": "BLUE", "x": 1}, b'{"color": "BLUE", "x": 2}', bytearray(b'{"color": "BLUE", "y": 3}')],
+      params={"source_timestamp": 1000})
+    assert summary.count == 3
+    assert summary.duration >= 0
+
+    wait_for_data(input, count=3)
+    assert [s.get_dictionary() for s in input.samples] == [
+      {"color": "BLUE", "x": 1, "y": 0, "shapesize": 0, "z": False},
+      {"color": "BLUE", "x": 2, "y": 0, "shapesize": 0, "z": False},
+      {"color": "BLUE", "x": 0, "y": 3, "shapesize": 0, "z": False}]
+    assert [s.info["source_timestamp"] for s in input.samples] == [1000] * 3
+
+  def test_write_many_without_clear(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    output.write_many([{"color": "BLUE", "x": 1}, {"y": 2}], clear=False)
+    wait_for_data(input, count=2)
+    assert input.samples[1]["x"] == 1
+    assert input.samples[1]["y"] == 2
+
+  def test_write_many_per_sample_params(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    output.write_many(
+      [{"color": "RED"}, {"color": "RED"}, {"color": "RED"}],
+      params=[{"source_timestamp": 10}, None, {"source_timestamp": 30}])
+    wait_for_data(input, count=3)
+    timestamps = [s.info["source_timestamp"] for s in input.samples]
+    assert timestamps[0] == 10
+    assert timestamps[2] == 30
+
+  def test_write_many_short_params(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    params = ({"source_timestamp": t} for t in (10, 20))
+    with pytest.raises(ValueError) as excinfo:
+      output.write_many([{"color": "RED", "x": i} for i in range(1, 4)], params=params)
+    assert "params" in str(excinfo.value)
+    # The instance isn't set with the sample that has no parameters
+    assert output.instance.get_dictionary()["x"] == 2
+    wait_for_data(input, count=2)
+    assert [s.info["source_timestamp"] for s in input.samples] == [10, 20]
+
+  def test_write_many_columns(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    summary = output.write_many({"color": ["GREEN"] * 4, "x": [1, 2, 3, 4], "z": [True, False, True, False]})
+    assert summary.count == 4
+    wait_for_data(input, count=4)
+    assert [s["x"] for s in input.samples] == [1, 2, 3, 4]
+    assert [s["z"] for s in input.samples] == [True, False, True, False]
+
+    with pytest.raises(ValueError):
+      output.write_many({"x": [1, 2], "y": [1]})
+
+  def test_write_many_error(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    with pytest.raises(rti.Error):
+      output.write_many([{"color": "BLUE"}, {"nonexistent_field": 1}])
+
+  def test_conflating(self, one_use_output, one_use_input):
+    with one_use_output.conflating() as conflating_output:
+      assert conflating_output.key_fields == ("color",)
+      for i in range(0, 10):
+        conflating_output.write({"color": "BLUE", "x": i})
+        conflating_output.write({"color": "RED", "x": 2 * i})
+      assert conflating_output.stats["pending"] == 2
+      assert conflating_output.get("BLUE")["x"] == 9
+
+      assert conflating_output.flush() == 2
+      wait_for_data(one_use_input, count=2, do_take=False)
+      assert sorted((s["color"], s["x"]) for s in one_use_input.samples) == \
+        [("BLUE", 9), ("RED", 18)]
+      one_use_input.take()
+
+      # Only the instances updated since the last flush are written
+      conflating_output.write({"color": "RED", "x": 100}, source_timestamp=1000)
+      assert conflating_output.flush() == 1
+      assert conflating_output.flush() == 0
+      wait_for_data(one_use_input, count=1, do_take=False)
+      assert one_use_input.samples[0]["x"] == 100
+      assert one_use_input.samples[0].info["source_timestamp"] == 1000
+
+      stats = conflating_output.stats
+      assert stats["updates"] == 21
+      assert stats["conflated"] == 18
+      assert stats["written"] == 3
+      assert stats["pending"] == 0
+
+  def test_conflating_dispose(self, one_use_output, one_use_input):
+    with one_use_output.conflating() as conflating_output:
+      conflating_output.write({"color": "BLUE", "x": 1})
+      conflating_output.write({"color": "BLUE"}, action="dispose")
+      conflating_output.write(b'{"color": "RED", "x": 2}')
+    # close() writes the pending updates
+    wait_for_data(one_use_input, count=2, do_take=False)
+    states = dict((s["color"], s.info["instance_state"]) for s in one_use_input.samples)
+    assert states == {"BLUE": "NOT_ALIVE_DISPOSED", "RED": "ALIVE"}
+    assert conflating_output.get("BLUE") is None
+    assert conflating_output.get("RED")["x"] == 2
+    with pytest.raises(rti.Error):
+      conflating_output.write({"color": "RED"})
+
+  def test_conflating_interval(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MyMultipleKeyedSquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MyMultipleKeyedSquareReader")
+    with output.conflating(interval_ms=50) as conflating_output:
+      for i in range(0, 100):
+        conflating_output.write({"color": "BLUE", "other_color": "RED", "y": i % 2, "z": True, "x": i})
+      wait_for_data(input, count=2, do_take=False)
+    assert sorted((s["y"], s["x"]) for s in input.samples) == [(0, 98), (1, 99)]
+    assert conflating_output.get(("BLUE", "RED", 1, True))["x"] == 99
+
+    with pytest.raises(ValueError):
+      output.conflating(interval_ms=0)
+
+  def test_conflating_nested_key(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MyNestedKeyedSquareWriter")
+    shape = {"color": "BLUE", "x": 1, "y": 2, "shapesize": 3, "z": False}
+    reordered_shape = {"z": False, "shapesize": 3, "y": 2, "x": 1, "color": "BLUE"}
+    with output.conflating() as conflating_output:
+      conflating_output.write({
+        "keyed_shape": shape,
+        "keyed_nested_member": {"color": "RED"},
+        "keyed_toplevel_member": 7,
+        "unkeyed_toplevel_member": 1})
+      # The members of a key are compared in the order of the type
+      conflating_output.write({
+        "keyed_toplevel_member": 7,
+        "keyed_nested_member": {"color": "RED"},
+        "keyed_shape": reordered_shape,
+        "unkeyed_toplevel_member": 2})
+      assert conflating_output.stats["pending"] == 1
+      key = (("BLUE", 1, 2, 3, False), "RED", 7)
+      assert conflating_output.get(key)["unkeyed_toplevel_member"] == 2
+
+  def test_conflating_errors(self, one_use_output):
+    with one_use_output.conflating() as conflating_output:
+      conflating_output.write({"color": "BLUE", "nonexistent_field": 1})
+      conflating_output.write({"color": "RED"})
+      assert conflating_output.flush() == 1
+      assert conflating_output.stats["errors"] == 1
+      assert isinstance(conflating_output.last_error, rti.Error)
@@ -19,6 +19,8 @@ import ctypes
 # They were added to help verify performance of another product, connextdds-py.
 # If you want to run them, remove this decorator.
 # Maybe once CON-42 is implemented we can run them by default.
+# To measure the performance of Connector, use the benchmarks in
+# rticonnextdds_connector.bench (python -m rticonnextdds_connector.bench).
 @pytest.mark.skip(reason="Takes too long to run these tests, remove this line and run manually")
 class TestPerformance:
     """
@@ -76,6 +78,29 @@ class TestPerformance:
         print("Average time setting entire list in one go: " + str(average_time))
         # Note to self Average time: 6.60276771068573
 
+    # Here we time how long it takes to set a sequence from a buffer,
+    # i.e., output.instance.set_array('myOctSeq', bytearray(600000))
+    @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+    def test_set_sequence_from_buffer(self, one_use_connector, iterations):
+        # Get the input and output which communicate using the performance test type
+        the_input = one_use_connector.get_input("MySubscriber::PerformanceTestReader")
+        the_output = one_use_connector.get_output("MyPublisher::PerformanceTestWriter")
+
+        # Wait for discovery between the entities
+        the_input.wait_for_publications(5000)
+        the_output.wait_for_subscriptions(5000)
+
+        myOctSeq = bytearray(range(256)) * 2343 + bytearray(192)
+        assert len(myOctSeq) == 600000
+
+        total_time = 0
+        for i in range (0, iterations):
+            start_time = time.time()
+            the_output.instance.set_array('myOctSeq', myOctSeq)
+            total_time += (time.time() - start_time)
+        average_time = total_time / iterations
+        print("Average time setting entire buffer in one go: " + str(average_time))
+
     # The use-case of obtaining a dictionary containing a sequence in Connector
     # is slow, and likely will be until we implement CON-42.
     # Here we have a sequence with 600000 elements. We time how long it takes to
@@ -105,6 +130,29 @@ class TestPerformance:
         print("Average time to get sequence as a list: " + str(average_time))
         # Note to self Average time: 0.20733366489410401
 
+    # Here we time how long it takes to obtain the sequence into a preallocated
+    # buffer with SampleIterator.get_array
+    @pytest.mark.xfail(sys.platform.startswith("win"), reason="symbols not exported")
+    def test_get_sequence_into_buffer(self, one_use_connector, iterations):
+        # Get the input and output which communicate using the performance test type
+        the_input = one_use_connector.get_input("MySubscriber::PerformanceTestReader")
+        the_output = one_use_connector.get_output("MyPublisher::PerformanceTestWriter")
+
+        # Wait for discovery between the entities
+        the_input.wait_for_publications(5000)
+        the_output.wait_for_subscriptions(5000)
+        the_output.instance['myOctSeq[599999]'] = 2
+        sample = send_data(the_output, the_input)
+
+        myOctSeq = bytearray(600000)
+        total_time = 0
+        for i in range (0, iterations):
+            start_time = time.time()
+            sample.get_array('myOctSeq', out=myOctSeq)
+            total_time += (time.time() - start_time)
+        average_time = total_time / iterations
+        print("Average time to get sequence into a buffer: " + str(average_time))
+
     # Use the workaround of calling into the native DynamicData APIs directly.
     # We do not run this test on Windows as we would need an entire Connext
     # DDS Pro installation due to the symbols not being exported
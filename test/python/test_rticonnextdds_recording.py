@@ -0,0 +1,115 @@
+###############################################################################
+# (c) 2020 Copyright, Real-Time Innovations.  All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+import pytest,sys,os,json,time
+sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
+import rticonnextdds_connector as rti
+from rticonnextdds_connector.recording import Recorder, Replayer
+from test_utils import wait_for_data
+
+def write_squares(output, count, first_timestamp=1000):
+  for i in range(count):
+    output.instance.set_dictionary({"color": "BLUE", "x": i})
+    output.write(source_timestamp=first_timestamp + i)
+
+class TestRecording:
+  """
+  This class tests the Recorder and Replayer in rticonnextdds_connector.recording
+  """
+
+  @pytest.fixture
+  def path(self, tmpdir):
+    return str(tmpdir.join("squares.rec"))
+
+  def record(self, input, output, path, count, **kwargs):
+    with Recorder(input, path, **kwargs) as recorder:
+      write_squares(output, count)
+      wait_for_data(input, count)
+      assert recorder.record() == count
+      assert recorder.count == count
+
+  def test_record(self, one_use_output, one_use_input, path):
+    self.record(one_use_input, one_use_output, path, 3)
+    with Replayer(one_use_output, path) as replayer:
+      records = list(replayer.records())
+    assert len(records) == 3
+    for i, (action, source_timestamp, reception_timestamp, identity, data) in enumerate(records):
+      assert action == "write"
+      assert source_timestamp == 1000 + i
+      assert reception_timestamp > 0
+      assert json.loads(data.decode("utf-8"))["x"] == i
+      assert json.loads(identity.decode("utf-8"))["sequence_number"] > 0
+
+  def test_replay(self, one_use_output, one_use_input, path):
+    self.record(one_use_input, one_use_output, path, 5)
+    with Replayer(one_use_output, path, speed=None) as replayer:
+      summary = replayer.replay()
+    assert summary.count == 5
+    wait_for_data(one_use_input, 5, do_take=False)
+    for i, sample in enumerate(one_use_input.samples):
+      assert sample["x"] == i
+      assert sample.info["source_timestamp"] == 1000 + i
+
+  def test_replay_dispose(self, one_use_output, one_use_input, path):
+    with Recorder(one_use_input, path) as recorder:
+      write_squares(one_use_output, 1)
+      one_use_output.write(action="dispose")
+      wait_for_data(one_use_input, 2)
+      assert recorder.record() == 2
+
+    with Replayer(one_use_output, path, speed=None) as replayer:
+      assert [record[0] for record in replayer.records()] == ["write", "dispose"]
+      replayer.replay()
+    wait_for_data(one_use_input, 2, do_take=False)
+    assert one_use_input.samples[1].info["instance_state"] == "NOT_ALIVE_DISPOSED"
+
+  def test_segments_and_index(self, one_use_output, one_use_input, path):
+    # Small segments and index interval force the file to grow several times
+    self.record(one_use_input, one_use_output, path, 50, segment_size=256, index_interval=4)
+    assert os.path.getsize(path + ".index") > 0
+    with Replayer(one_use_output, path) as replayer:
+      records = list(replayer.records())
+      assert [json.loads(record[4].decode("utf-8"))["x"] for record in records] == list(range(50))
+      start_time = records[30][2]
+      end_time = records[40][2]
+      selected = list(replayer.records(start_time=start_time, end_time=end_time))
+      assert selected[0][2] == start_time
+      assert selected[-1][2] == end_time
+      assert all(start_time <= record[2] <= end_time for record in selected)
+
+  def test_record_new_only(self, one_use_output, one_use_input, path):
+    with Recorder(one_use_input, path) as recorder:
+      write_squares(one_use_output, 2)
+      wait_for_data(one_use_input, 2, do_take=False)
+      one_use_input.read()
+      assert recorder.record(new_only=True) == 0
+      assert recorder.record() == 2
+      write_squares(one_use_output, 1)
+      one_use_input.read()
+      assert recorder.record(new_only=True) == 1
+
+  def test_replay_speed(self, one_use_output, one_use_input, path):
+    with Recorder(one_use_input, path) as recorder:
+      write_squares(one_use_output, 1)
+      time.sleep(0.2)
+      write_squares(one_use_output, 1)
+      wait_for_data(one_use_input, 2)
+      recorder.record()
+
+    with Replayer(one_use_output, path, speed=2.0) as replayer:
+      start = time.time()
+      replayer.replay()
+      assert time.time() - start >= 0.09
+
+  def test_invalid_file(self, one_use_output, path):
+    with open(path, "wb") as invalid_file:
+      invalid_file.write(b"not a recording")
+    with pytest.raises(ValueError):
+      Replayer(one_use_output, path)
+    with pytest.raises(ValueError):
+      Replayer(one_use_output, path, speed=0)
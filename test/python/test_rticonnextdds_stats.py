@@ -0,0 +1,89 @@
+###############################################################################
+# (c) 2020 Copyright, Real-Time Innovations.  All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+import pytest,sys,os,json
+sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
+import rticonnextdds_connector as rti
+from rticonnextdds_connector.rticonnextdds_connector import connector_binding
+
+@pytest.fixture
+def enabled_stats():
+  rti.reset_stats()
+  rti.enable_stats()
+  yield
+  rti.disable_stats()
+  rti.reset_stats()
+
+class TestStats:
+  """
+  This class tests the statistics of the calls to the native library
+  """
+
+  @pytest.mark.skipif(
+    os.environ.get("RTI_CONNECTOR_STATS") is not None,
+    reason="RTI_CONNECTOR_STATS enables the statistics")
+  def test_disabled_by_default(self):
+    assert rti.stats() == {}
+    assert connector_binding.write is connector_binding.library.RTI_Connector_write
+
+  def test_write_and_take(self, one_use_connector, enabled_stats):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    sample = {"x": 1, "y": 2, "color": "RED"}
+    output.instance.set_dictionary(sample)
+    output.write()
+    input.wait(5000)
+    input.take()
+    assert input.samples[0].get_dictionary()["color"] == "RED"
+
+    stats = rti.stats()
+    assert stats["write"]["calls"] == 1
+    assert stats["take"]["calls"] == 1
+    assert stats["write"]["json_bytes"] == 0
+    assert stats["set_json_instance"]["calls"] == 1
+    assert stats["set_json_instance"]["json_bytes"] == len(json.dumps(sample))
+    assert stats["get_json_sample"]["json_bytes"] > 0
+    for name, function_stats in stats.items():
+      assert function_stats["calls"] > 0
+      assert function_stats["total_ns"] >= function_stats["max_ns"] >= 0
+
+  def test_get_any(self, one_use_connector, enabled_stats):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    output.instance["color"] = "BLUE"
+    output.write()
+    input.wait(5000)
+    input.take()
+    assert input.samples[0]["color"] == "BLUE"
+    assert rti.stats()["get_any_from_samples"]["json_bytes"] == len("BLUE")
+
+  def test_dynamic_data_functions(self, one_use_connector, enabled_stats):
+    output = one_use_connector.get_output("MyPublisher::PerformanceTestWriter")
+    output.instance.set_array("myOctSeq", bytearray(10))
+    assert rti.stats()["DDS_DynamicData_set_octet_array"]["calls"] == 1
+
+  def test_reset(self, one_use_connector, enabled_stats):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    output.write()
+    assert rti.stats()["write"]["calls"] == 1
+    rti.reset_stats()
+    assert "write" not in rti.stats()
+    output.write()
+    assert rti.stats()["write"]["calls"] == 1
+
+  def test_disable(self, one_use_connector, enabled_stats):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    output.write()
+    rti.disable_stats()
+    assert connector_binding.write is connector_binding.library.RTI_Connector_write
+    output.write()
+    assert rti.stats()["write"]["calls"] == 1
+    rti.enable_stats()
+    rti.enable_stats() # no effect
+    output.write()
+    assert rti.stats()["write"]["calls"] == 2
@@ -70,3 +70,264 @@ class TestThreading:
     output_thread.start()
     input_thread.join(5000)
     output_thread.join(5000)
+
+  def test_background_writer(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    with output.start_background_writer(maxsize=10) as async_output:
+      for i in range(0, 5):
+        assert async_output.write({"color": "BLUE", "x": i}, source_timestamp=1000 + i)
+      assert async_output.flush(5000)
+      stats = async_output.stats
+      assert stats["written"] == 5
+      assert stats["queue_depth"] == 0
+      assert stats["dropped"] == 0
+      assert stats["max_latency"] >= stats["average_latency"]
+
+    wait_for_data(input, count=5)
+    assert [s["x"] for s in input.samples] == [0, 1, 2, 3, 4]
+    assert [s.info["source_timestamp"] for s in input.samples] == [1000, 1001, 1002, 1003, 1004]
+    with pytest.raises(rti.Error):
+      async_output.write({"x": 1})
+
+  def test_background_writer_overflow_policies(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    # Hold the lock so that the background thread can't write
+    for policy in ["drop_newest", "drop_oldest", "raise"]:
+      async_output = output.start_background_writer(maxsize=1, policy=policy)
+      with async_output.lock:
+        async_output.write({"color": "RED", "x": 1})
+        # Wait for the background thread to take the first sample
+        while async_output.queue_depth > 0:
+          time.sleep(0.01)
+        async_output.write({"color": "RED", "x": 2})
+        if policy == "raise":
+          with pytest.raises(Exception) as excinfo:
+            async_output.write({"color": "RED", "x": 3})
+          assert excinfo.type.__name__ == "Full"
+        else:
+          assert async_output.write({"color": "RED", "x": 3}) == (policy == "drop_oldest")
+          assert async_output.stats["dropped"] == 1
+      async_output.close()
+      assert async_output.stats["written"] == 2
+
+  def test_background_writer_errors(self, one_use_connector):
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    with output.start_background_writer() as async_output:
+      async_output.write({"nonexistent_field": 1})
+      async_output.write({"color": "BLUE"})
+      async_output.flush()
+      assert async_output.stats["errors"] == 1
+      assert async_output.stats["written"] == 1
+      assert isinstance(async_output.last_error, rti.Error)
+
+    with pytest.raises(ValueError):
+      output.start_background_writer(policy="invalid")
+
+  def test_dispatcher_inline(self, one_use_connector):
+    square_output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    unkeyed_output = one_use_connector.get_output("MyPublisher::MyUnkeyedSquareWriter")
+    square_input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    received = {"square": [], "unkeyed": []}
+
+    dispatcher = rti.Dispatcher(one_use_connector)
+    dispatcher.add_handler(
+      square_input,
+      lambda samples: received["square"].append([s["x"] for s in samples]),
+      max_samples=2)
+    dispatcher.add_handler(
+      "MySubscriber::MyUnkeyedSquareReader",
+      lambda samples: received["unkeyed"].append([s["x"] for s in samples]))
+
+    for i in range(0, 5):
+      square_output.instance.set_dictionary({"color": "BLUE", "x": i})
+      square_output.write()
+    square_output.write(action="dispose")
+    unkeyed_output.instance["x"] = 10
+    unkeyed_output.write()
+    # Read (but don't take) the samples to make sure they have all been received
+    wait_for_data(square_input, count=6, do_take=False)
+    wait_for_data(
+      one_use_connector.get_input("MySubscriber::MyUnkeyedSquareReader"),
+      count=1,
+      do_take=False)
+
+    count = 0
+    for _ in range(0, 20):
+      count += dispatcher.dispatch(1000)
+      if count == 6:
+        break
+
+    assert count == 6
+    # At most two square samples are dispatched in each round
+    assert received["square"] == [[0, 1], [2, 3], [4]]
+    assert received["unkeyed"] == [[10]]
+
+  def test_dispatcher_thread_pool(self, one_use_connector):
+    futures = pytest.importorskip("concurrent.futures")
+    output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    received = []
+    done = threading.Event()
+
+    def handler(samples):
+      received.extend(s["x"] for s in samples)
+      if len(received) == 10:
+        done.set()
+      raise ValueError("handler error")
+
+    with futures.ThreadPoolExecutor(2) as executor:
+      with rti.Dispatcher(one_use_connector, executor) as dispatcher:
+        dispatcher.add_handler("MySubscriber::MySquareReader", handler, max_samples=3)
+        dispatcher.start()
+        with dispatcher.lock:
+          for i in range(0, 10):
+            output.instance.set_dictionary({"color": "BLUE", "x": i})
+            output.write()
+        assert done.wait(10)
+        assert isinstance(dispatcher.last_error, ValueError)
+
+    # The samples of the same input are dispatched in order
+    assert received == list(range(0, 10))
+
+  def test_dispatcher_unhandled_input(self, one_use_connector):
+    square_output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    unkeyed_output = one_use_connector.get_output("MyPublisher::MyUnkeyedSquareWriter")
+    square_input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    unkeyed_input = one_use_connector.get_input("MySubscriber::MyUnkeyedSquareReader")
+    received = []
+
+    dispatcher = rti.Dispatcher(one_use_connector)
+    dispatcher.add_handler(square_input, lambda samples: received.extend(s["x"] for s in samples))
+
+    # The input without a handler has data, so Connector.wait() doesn't block
+    unkeyed_output.write()
+    wait_for_data(unkeyed_input, count=1, do_take=False)
+    wait_calls = []
+    connector_wait = one_use_connector.wait
+    one_use_connector.wait = lambda timeout=None: (wait_calls.append(timeout), connector_wait(timeout))
+
+    start = time.time()
+    assert dispatcher.dispatch(300) == 0
+    assert time.time() - start >= 0.25
+    assert len(wait_calls) == 1
+
+    # The data of the inputs with a handler is still dispatched
+    def write_later():
+      time.sleep(0.1)
+      with dispatcher.lock:
+        square_output.instance.set_dictionary({"color": "BLUE", "x": 7})
+        square_output.write()
+    writer = threading.Thread(target=write_later)
+    writer.start()
+    assert dispatcher.dispatch(5000) == 1
+    writer.join()
+    assert received == [7]
+    # The input without a handler keeps its data
+    unkeyed_input.read()
+    assert unkeyed_input.samples.length == 1
+
+  def test_dispatcher_takes_ready_inputs(self, one_use_connector):
+    square_output = one_use_connector.get_output("MyPublisher::MySquareWriter")
+    square_input = one_use_connector.get_input("MySubscriber::MySquareReader")
+    unkeyed_input = one_use_connector.get_input("MySubscriber::MyUnkeyedSquareReader")
+    received = []
+    takes = []
+
+    dispatcher = rti.Dispatcher(one_use_connector)
+    dispatcher.add_handler(square_input, lambda samples: received.extend(s["x"] for s in samples))
+    dispatcher.add_handler(unkeyed_input, lambda samples: None)
+    for input in (square_input, unkeyed_input):
+      input.take = (lambda take, name: lambda *args: (takes.append(name), take(*args)))(
+        input.take, input.name)
+
+    # An idle input is not taken
+    assert dispatcher.dispatch(0) == 0
+    assert takes == []
+
+    square_output.instance.set_dictionary({"color": "BLUE", "x": 1})
+    square_output.write()
+    assert dispatcher.dispatch(5000) == 1
+    assert received == [1]
+    assert takes == [square_input.name]
+
+  def test_dispatcher_remove_handler(self, one_use_connector):
+    dispatcher = rti.Dispatcher(one_use_connector)
+    dispatcher.add_handler("MySubscriber::MySquareReader", lambda samples: None)
+    dispatcher.remove_handler("MySubscriber::MySquareReader")
+    assert dispatcher.dispatch(100) == 0
+    with pytest.raises(ValueError):
+      dispatcher.remove_handler("MySubscriber::MySquareReader")
+    with pytest.raises(ValueError):
+      dispatcher.add_handler("MySubscriber::MySquareReader", lambda samples: None, max_samples=0)
+
+  def test_prefetch(self, one_use_output, one_use_input):
+    with one_use_input.prefetch(depth=2) as prefetcher:
+      with prefetcher.lock:
+        for i in range(0, 5):
+          one_use_output.instance.set_dictionary({"color": "BLUE", "x": i})
+          one_use_output.write()
+      received = []
+      while len(received) < 5:
+        batch = prefetcher.get(5000)
+        assert all(isinstance(data, dict) for data in batch)
+        received.extend(data["x"] for data in batch)
+      assert received == [0, 1, 2, 3, 4]
+      with pytest.raises(rti.TimeoutError):
+        prefetcher.get(100)
+    with pytest.raises(rti.Error):
+      prefetcher.get()
+    # Closing the prefetcher ends the iteration
+    assert list(prefetcher) == []
+
+  def test_prefetch_formats(self, one_use_output, one_use_input):
+    with one_use_input.prefetch(decode="json") as prefetcher:
+      with prefetcher.lock:
+        one_use_output.instance.set_dictionary({"color": "RED", "x": 3})
+        one_use_output.write()
+      batch = prefetcher.get(5000)
+      assert isinstance(batch[0], bytes)
+      assert json.loads(batch[0].decode("utf-8"))["x"] == 3
+
+    with one_use_input.prefetch(decode="columns", fields=["x"], info=["source_timestamp"]) as prefetcher:
+      with prefetcher.lock:
+        one_use_output.instance["x"] = 7
+        one_use_output.write(source_timestamp=1000)
+      columns = prefetcher.get(5000)
+      assert columns.length == 1
+      assert list(columns["x"]) == [7]
+      assert list(columns.info["source_timestamp"]) == [1000]
+
+    with pytest.raises(ValueError):
+      one_use_input.prefetch(decode="xml")
+    with pytest.raises(ValueError):
+      one_use_input.prefetch(depth=0)
+    with pytest.raises(ValueError):
+      one_use_input.prefetch(decode="columns")
+
+  def test_prefetch_depth(self, one_use_output, one_use_input):
+    with one_use_input.prefetch(depth=1) as prefetcher:
+      with prefetcher.lock:
+        one_use_output.instance["x"] = 1
+        one_use_output.write()
+      while prefetcher.queue_depth == 0:
+        time.sleep(0.01)
+      # The queue is full, so the next sample stays in the Input
+      with prefetcher.lock:
+        one_use_output.instance["x"] = 2
+        one_use_output.write()
+      time.sleep(0.3)
+      assert prefetcher.queue_depth == 1
+      assert [data["x"] for data in prefetcher.get(5000)] == [1]
+      assert [data["x"] for data in prefetcher.get(5000)] == [2]
+
+  def test_prefetch_error(self, one_use_output, one_use_input, monkeypatch):
+    with one_use_input.prefetch() as prefetcher:
+      def take():
+        raise rti.Error("take failed")
+      with prefetcher.lock:
+        monkeypatch.setattr(one_use_input, "take", take)
+        one_use_output.write()
+      with pytest.raises(rti.Error) as excinfo:
+        prefetcher.get(5000)
+      assert "take failed" in str(excinfo.value)
+      assert prefetcher.last_error is excinfo.value
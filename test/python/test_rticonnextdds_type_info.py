@@ -0,0 +1,196 @@
+###############################################################################
+# (c) 2020 Copyright, Real-Time Innovations.  All rights reserved.            #
+# No duplications, whole or partial, manual or electronic, may be made        #
+# without express written permission.  Any such copies, or revisions thereof, #
+# must display this notice unaltered.                                         #
+# This code contains trade secrets of Real-Time Innovations, Inc.             #
+###############################################################################
+
+import pytest,sys,os
+sys.path.append(os.path.dirname(os.path.realpath(__file__))+ "/../../")
+import rticonnextdds_connector as rti
+from test_utils import wait_for_data, open_test_connector
+
+MODULE_XML = """str://"<dds>
+  <types>
+    <module name="Sensors">
+      <enum name="Unit">
+        <enumerator name="CELSIUS" value="10"/>
+        <enumerator name="KELVIN"/>
+      </enum>
+      <typedef name="Name" type="string" stringMaxLength="16"/>
+      <struct name="Reading">
+        <member name="id" type="nonBasic" nonBasicTypeName="Name" key="true"/>
+        <member name="unit" type="nonBasic" nonBasicTypeName="Unit"/>
+        <member name="matrix" type="float64" arrayDimensions="2,3"/>
+        <member name="history" type="int16" sequenceMaxLength="-1"/>
+      </struct>
+    </module>
+  </types>
+  <domain_participant_library name="ParticipantLibrary">
+    <domain_participant name="Participant">
+      <register_type name="SensorReading" type_ref="Sensors::Reading"/>
+      <topic name="Readings" register_type_ref="SensorReading"/>
+      <publisher name="Publisher">
+        <data_writer name="Writer" topic_ref="Readings"/>
+      </publisher>
+      <subscriber name="Subscriber">
+        <data_reader name="Reader" topic_ref="Readings"/>
+      </subscriber>
+    </domain_participant>
+  </domain_participant_library>
+</dds>"
+"""
+
+class TestTypeInfo:
+  """
+  This class tests Input.type_info and Output.type_info
+  """
+
+  @pytest.fixture(scope="class")
+  def test_connector(self):
+    with open_test_connector("MyParticipantLibrary::DataAccessTest") as connector:
+      yield connector
+
+  @pytest.fixture(scope="class")
+  def type_info(self, test_connector):
+    return test_connector.get_output("TestPublisher::TestWriter").type_info
+
+  def test_struct(self, type_info):
+    assert type_info.kind == "struct"
+    assert type_info.name == "MyType"
+    assert list(type_info.members)[:4] == ["my_long", "my_double", "my_enum", "my_boolean"]
+    assert type_info.members["my_long"].type.kind == "long"
+    assert type_info.members["my_double"].type.kind == "double"
+    assert type_info.members["my_int64"].type.kind == "longLong"
+    assert type_info.members["my_uint64"].type.kind == "unsignedLongLong"
+    point = type_info.members["my_point"].type
+    assert point.kind == "struct" and point.name == "Point"
+    assert list(point.members) == ["x", "y"]
+    assert type_info.key_fields == ()
+
+  def test_optional_and_alias(self, type_info):
+    assert type_info.members["my_optional_long"].optional
+    assert not type_info.members["my_long"].optional
+    # Aliases are resolved
+    assert type_info.members["my_point_alias"].type == type_info.members["my_point"].type
+
+  def test_bounds_and_dimensions(self, type_info):
+    assert type_info.members["my_string"].type.kind == "string"
+    assert type_info.members["my_string"].type.bound == 512
+    sequence = type_info.members["my_point_sequence"].type
+    assert sequence.kind == "sequence"
+    assert sequence.bound == 10
+    assert sequence.element.name == "Point"
+    array = type_info.members["my_point_array"].type
+    assert array.kind == "array"
+    assert array.dimensions == (5,)
+    assert array.element.name == "Point"
+
+  def test_enum(self, type_info):
+    color = type_info.members["my_enum"].type
+    assert color.kind == "enum"
+    assert color.name == "Color"
+    assert dict(color.enumerators) == {"RED": 0, "GREEN": 1, "BLUE": 2}
+    assert color.enumerator(2) == "BLUE"
+    assert color.enumerator(3) is None
+    with pytest.raises(rti.Error):
+      type_info.enumerator(0)
+
+  def test_union(self, type_info):
+    union = type_info.members["my_union"].type
+    assert union.kind == "union"
+    assert union.discriminator.name == "Color"
+    assert [(member.name, member.labels) for member in union.members.values()] == \
+      [("point", (0,)), ("my_long", (1,)), ("my_int_sequence", (2,))]
+    int_union = type_info.members["my_int_union"].type
+    assert int_union.discriminator.kind == "long"
+    assert int_union.members["my_long"].labels == (20,)
+
+  def test_immutable(self, type_info):
+    with pytest.raises(AttributeError):
+      type_info.name = "Other"
+    with pytest.raises(AttributeError):
+      type_info.members["my_long"].key = True
+    with pytest.raises(TypeError):
+      type_info.members["my_other_long"] = type_info.members["my_long"]
+
+  def test_construct(self):
+    point = rti.TypeInfo(
+      "struct",
+      name="Point",
+      members=[rti.MemberInfo("x", rti.TypeInfo("long"), key=True)])
+    assert point.members["x"].type == rti.TypeInfo("long")
+    assert point.key_fields == ("x",)
+    assert repr(point) == "TypeInfo(kind='struct', name='Point')"
+    with pytest.raises(AttributeError):
+      point.kind = "union"
+    with pytest.raises(AttributeError):
+      del point.members["x"].key
+
+  def test_cached(self, test_connector, type_info):
+    output = test_connector.get_output("TestPublisher::TestWriter2")
+    input = test_connector.get_input("TestSubscriber::TestReader")
+    assert output.type_info is type_info
+    assert input.type_info is type_info
+
+  def test_input_type_info_from_xml(self, type_info):
+    # Without samples, the Input obtains its type from the XML configuration
+    with open_test_connector("MyParticipantLibrary::DataAccessTest") as connector:
+      input = connector.get_input("TestSubscriber::TestReader")
+      assert input.type_info == type_info
+      assert input.type_info is not type_info
+
+  def test_input_type_info_from_samples(self, type_info):
+    with open_test_connector("MyParticipantLibrary::DataAccessTest") as connector:
+      output = connector.get_output("TestPublisher::TestWriter")
+      input = connector.get_input("TestSubscriber::TestReader")
+      output.write()
+      wait_for_data(input)
+      assert input.type_info == type_info
+
+  def test_output_type_info_from_xml(self, type_info, monkeypatch):
+    def get_type_function():
+      raise rti.Error("DDS_DynamicData_get_type is not available")
+
+    with open_test_connector("MyParticipantLibrary::DataAccessTest") as connector:
+      monkeypatch.setattr(rti.connector_binding, "get_type_function", get_type_function)
+      assert connector.get_output("TestPublisher::TestWriter").type_info == type_info
+
+  def test_unbounded(self):
+    with open_test_connector("MyParticipantLibrary::TestUnbounded") as connector:
+      type_info = connector.get_output("TestPublisher::TestWriter").type_info
+      assert type_info.members["my_string"].type.bound is None
+      assert type_info.members["my_sequence"].type.bound is None
+      assert connector.get_input("TestSubscriber::TestReader").type_info == type_info
+
+  def test_key_fields(self, one_use_connector):
+    def key_fields(input_name):
+      return one_use_connector.get_input("MySubscriber::" + input_name).type_info.key_fields
+
+    assert key_fields("MySquareReader") == ("color",)
+    assert key_fields("MyUnkeyedSquareReader") == ()
+    assert key_fields("MyMultipleKeyedSquareReader") == ("color", "other_color", "y", "z")
+    assert key_fields("MyNestedKeyedSquareReader") == \
+      ("keyed_shape", "keyed_nested_member.color", "keyed_toplevel_member")
+    assert key_fields("MySquareWithoutTopLevelKeyReader") == ("keyed_shape.color",)
+
+  def test_modules_and_registered_types(self):
+    with rti.open_connector("ParticipantLibrary::Participant", MODULE_XML) as connector:
+      type_info = connector.get_output("Publisher::Writer").type_info
+      assert type_info.name == "Sensors::Reading"
+      assert type_info.key_fields == ("id",)
+      assert type_info.members["id"].type.kind == "string"
+      assert type_info.members["id"].type.bound == 16
+      unit = type_info.members["unit"].type
+      assert unit.name == "Sensors::Unit"
+      assert list(unit.enumerators.items()) == [("CELSIUS", 10), ("KELVIN", 11)]
+      matrix = type_info.members["matrix"].type
+      assert matrix.dimensions == (2, 3)
+      assert matrix.element.kind == "double"
+      history = type_info.members["history"].type
+      assert history.element.kind == "short"
+      assert history.bound is None
+
+    with rti.open_connector("ParticipantLibrary::Participant", MODULE_XML) as connector:
+      assert connector.get_input("Subscriber::Reader").type_info == type_info